@@ -4,7 +4,7 @@ Aggregates validation scores into Synthetic Data Quality Score.
 """
 
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class ScoreAggregator:
     def __init__(self):
@@ -16,15 +16,28 @@ class ScoreAggregator:
             'causal_consistency': 0.15
         }
     
-    def calculate_synthetic_data_quality_score(self, validation_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate overall Synthetic Data Quality Score."""
+    def calculate_synthetic_data_quality_score(self, validation_results: Dict[str, Any],
+                                               gate: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Calculate overall Synthetic Data Quality Score.
+        
+        ``gate`` is the gate outcome from ``pipeline_metadata['gate']``. A
+        failed gate (also recognised from validators it skipped) fails the
+        whole candidate: the score is zeroed and the failed checks listed.
+        """
         scores = {}
         weighted_sum = 0.0
         total_weight = 0.0
+        skipped = []
+        failed_checks = list(gate.get('failed_checks', [])) if gate else []
         
         # Extract individual scores
         for validator_name, results in validation_results.items():
-            if validator_name == 'fidelity' and 'fidelity_score' in results:
+            if isinstance(results, dict) and results.get('skipped'):
+                # Not run (e.g. gated out); excluded from the weighted average
+                skipped.append(validator_name)
+                failed_checks.extend(c for c in results.get('failed_checks', []) if c not in failed_checks)
+            
+            elif validator_name == 'fidelity' and 'fidelity_score' in results:
                 scores['fidelity'] = results['fidelity_score']
                 weighted_sum += scores['fidelity'] * self.weights['fidelity']
                 total_weight += self.weights['fidelity']
@@ -55,12 +68,17 @@ class ScoreAggregator:
         
         # Calculate overall score
         overall_score = weighted_sum / total_weight if total_weight > 0 else 0.0
+        if failed_checks:
+            # Skipped expensive stages must not lift a candidate that failed the cheap checks
+            overall_score = 0.0
         
         return {
             'overall_synthetic_data_quality_score': overall_score,
             'individual_scores': scores,
             'weights_used': {k: v for k, v in self.weights.items() if k in scores},
-            'quality_grade': self._get_quality_grade(overall_score)
+            'quality_grade': 'Failed' if failed_checks else self._get_quality_grade(overall_score),
+            'skipped_validators': skipped,
+            'failed_checks': failed_checks
         }
     
     def _get_quality_grade(self, score: float) -> str:
@@ -3,20 +3,27 @@
 Audit logger for storing validation metadata and compliance records.
 """
 
+import os
 import json
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
+from src.audit_store import AuditStore
 
 class AuditLogger:
-    def __init__(self, log_file: str = "validation_audit.log"):
+    def __init__(self, log_file: str = "validation_audit.log",
+                 store: Optional[AuditStore] = None):
         self.log_file = log_file
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger(__name__)
+        self.store = store
+        # A dedicated logger per file, so audit records stay out of the root
+        # logger and other libraries' records stay out of the audit log
+        self.logger = logging.getLogger(f"{__name__}.{os.path.abspath(log_file)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            handler = logging.FileHandler(log_file, delay=True)
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            self.logger.addHandler(handler)
     
     def log_validation_event(self, event_type: str, validation_id: str, 
                            data: Dict[str, Any]) -> None:
@@ -28,22 +35,40 @@ class AuditLogger:
             'data': data
         }
         
-        self.logger.info(json.dumps(audit_record))
+        self.logger.info(json.dumps(audit_record, default=str))
+        
+        if self.store is not None:
+            self.store.record_event(audit_record)
     
-    def log_validation_start(self, validation_id: str, config: Dict[str, Any]) -> None:
+    def log_validation_start(self, validation_id: str, config: Dict[str, Any],
+                             dataset_id: Optional[str] = None) -> None:
         """Log start of validation process."""
         self.log_validation_event('VALIDATION_START', validation_id, {
             'config': config,
+            'dataset_id': dataset_id,
             'status': 'started'
         })
     
-    def log_validation_complete(self, validation_id: str, results: Dict[str, Any]) -> None:
+    def log_validation_complete(self, validation_id: str, results: Dict[str, Any],
+                                quality_score: Optional[Dict[str, Any]] = None,
+                                dataset_id: Optional[str] = None) -> None:
         """Log completion of validation process."""
         self.log_validation_event('VALIDATION_COMPLETE', validation_id, {
             'results': results,
+            'quality_score': quality_score,
+            'dataset_id': dataset_id,
             'status': 'completed'
         })
     
+    def log_validation_failure(self, validation_id: str, error: str,
+                               dataset_id: Optional[str] = None) -> None:
+        """Log a validation that started but did not complete."""
+        self.log_validation_event('VALIDATION_FAILED', validation_id, {
+            'error': error,
+            'dataset_id': dataset_id,
+            'status': 'failed'
+        })
+    
     def log_human_review(self, validation_id: str, reviewer_id: str, 
                         decision: str, notes: str) -> None:
         """Log human review decisions."""
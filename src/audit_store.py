@@ -0,0 +1,213 @@
+"""
+Queryable audit storage backend for validation compliance records.
+"""
+
+import json
+import math
+import sqlite3
+import datetime
+import threading
+from typing import Dict, Any, Optional, List
+from src.serialization import to_jsonable
+
+
+class AuditStore:
+    """SQLite-backed audit store with indexed lookups and retention."""
+
+    def __init__(self, db_path: str = "validation_audit.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create the events table and its lookup indexes."""
+        with self._lock, self._conn:
+            if self.db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS audit_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    validation_id TEXT NOT NULL,
+                    dataset_id TEXT,
+                    privacy_risk_score REAL,
+                    fidelity_score REAL,
+                    quality_score REAL,
+                    data TEXT NOT NULL
+                )
+            """)
+            for name, columns in [
+                ('idx_audit_validation_id', 'validation_id'),
+                ('idx_audit_event_type', 'event_type, timestamp'),
+                ('idx_audit_timestamp', 'timestamp'),
+                ('idx_audit_dataset', 'dataset_id, timestamp'),
+                ('idx_audit_privacy_risk', 'privacy_risk_score'),
+                ('idx_audit_fidelity', 'fidelity_score'),
+                ('idx_audit_quality', 'quality_score'),
+            ]:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON audit_events ({columns})"
+                )
+
+    def _extract_scores(self, data: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        """Pull the indexed key scores out of an event payload."""
+        results = data.get('results') or {}
+        quality = data.get('quality_score') or {}
+
+        def _score(section: Dict[str, Any], key: str) -> Optional[float]:
+            value = section.get(key) if isinstance(section, dict) else None
+            try:
+                value = float(value) if value is not None else None
+                return value if value is None or math.isfinite(value) else None
+            except (TypeError, ValueError):
+                return None
+
+        return {
+            'privacy_risk_score': _score(results.get('privacy_risk', {}), 'privacy_risk_score'),
+            'fidelity_score': _score(results.get('fidelity', {}), 'fidelity_score'),
+            'quality_score': _score(quality, 'overall_synthetic_data_quality_score')
+        }
+
+    def record_event(self, audit_record: Dict[str, Any]) -> int:
+        """Store an audit record and return its row id."""
+        data = to_jsonable(audit_record.get('data', {}))
+        config = data.get('config') or {}
+        dataset_id = data.get('dataset_id') or config.get('dataset_id')
+        scores = self._extract_scores(data)
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO audit_events (timestamp, event_type, validation_id, dataset_id,
+                                          privacy_risk_score, fidelity_score, quality_score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    audit_record['timestamp'],
+                    audit_record['event_type'],
+                    audit_record['validation_id'],
+                    dataset_id,
+                    scores['privacy_risk_score'],
+                    scores['fidelity_score'],
+                    scores['quality_score'],
+                    json.dumps(data, default=str)
+                )
+            )
+            return cursor.lastrowid
+
+    def query(self, validation_id: Optional[str] = None, event_type: Optional[str] = None,
+              dataset_id: Optional[str] = None, start_time: Optional[str] = None,
+              end_time: Optional[str] = None, min_privacy_risk: Optional[float] = None,
+              max_privacy_risk: Optional[float] = None, min_fidelity: Optional[float] = None,
+              max_fidelity: Optional[float] = None, min_quality: Optional[float] = None,
+              max_quality: Optional[float] = None, limit: int = 100,
+              cursor: Optional[int] = None) -> Dict[str, Any]:
+        """Query audit events, newest first, with keyset pagination.
+
+        ``cursor`` is the ``next_cursor`` value of the previous page.
+        """
+        clauses = []
+        params: List[Any] = []
+
+        for column, op, value in [
+            ('validation_id', '=', validation_id),
+            ('event_type', '=', event_type),
+            ('dataset_id', '=', dataset_id),
+            ('timestamp', '>=', start_time),
+            ('timestamp', '<=', end_time),
+            ('privacy_risk_score', '>=', min_privacy_risk),
+            ('privacy_risk_score', '<=', max_privacy_risk),
+            ('fidelity_score', '>=', min_fidelity),
+            ('fidelity_score', '<=', max_fidelity),
+            ('quality_score', '>=', min_quality),
+            ('quality_score', '<=', max_quality),
+            ('id', '<', cursor),
+        ]:
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        limit = max(1, min(int(limit), 1000))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM audit_events {where} ORDER BY id DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit + 1]).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        events = [self._row_to_event(row) for row in rows]
+
+        return {
+            'events': events,
+            'count': len(events),
+            'next_cursor': rows[-1]['id'] if has_more else None
+        }
+
+    def _row_to_event(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a stored row back into an audit record."""
+        return {
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'event_type': row['event_type'],
+            'validation_id': row['validation_id'],
+            'dataset_id': row['dataset_id'],
+            'privacy_risk_score': row['privacy_risk_score'],
+            'fidelity_score': row['fidelity_score'],
+            'quality_score': row['quality_score'],
+            'data': json.loads(row['data'])
+        }
+
+    def apply_retention(self, max_age_days: float) -> int:
+        """Delete events older than ``max_age_days``; returns rows removed."""
+        cutoff = (datetime.datetime.utcnow()
+                  - datetime.timedelta(days=max_age_days)).isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM audit_events WHERE timestamp < ?", (cutoff,)
+            )
+            return cursor.rowcount
+
+    def compact(self) -> None:
+        """Reclaim free pages and refresh query planner statistics."""
+        with self._lock:
+            self._conn.execute("VACUUM")
+            self._conn.execute("ANALYZE")
+
+    def run_retention_job(self, max_age_days: float) -> Dict[str, Any]:
+        """Apply retention and compact the store in one maintenance pass."""
+        deleted = self.apply_retention(max_age_days)
+        self.compact()
+        with self._lock:
+            remaining = self._conn.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0]
+
+        return {
+            'deleted_events': deleted,
+            'remaining_events': remaining,
+            'max_age_days': max_age_days
+        }
+
+    def import_log_file(self, log_file: str) -> int:
+        """Import records from a flat ``AuditLogger`` text log."""
+        imported = 0
+        with open(log_file, 'r') as handle:
+            for line in handle:
+                start = line.find('{')
+                if start < 0:
+                    continue
+                try:
+                    record = json.loads(line[start:])
+                except json.JSONDecodeError:
+                    continue
+                if {'timestamp', 'event_type', 'validation_id'} <= record.keys():
+                    self.record_event(record)
+                    imported += 1
+        return imported
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
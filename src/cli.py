@@ -0,0 +1,176 @@
+"""
+Command-line batch runner for offline validation.
+
+    python -m src.cli validate --real real.csv --synthetic "candidates/*.csv" \
+        --config config.json --output results.jsonl --workers 4
+
+Every synthetic file is validated against one shared reference profile of the
+real dataset and written as one JSON line. Re-running with the same output
+file skips files that already have a successful result.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Set
+from src.loader import DataLoader
+from src.orchestrator import ValidationOrchestrator
+from src.aggregator import ScoreAggregator
+from src.serialization import dumps
+
+DEFAULT_CONFIG = {
+    'validators': ['fidelity', 'privacy_risk'],
+    'target_column': None,
+    'protected_attributes': [],
+    'treatment_column': None,
+    'outcome_column': None,
+    'causal_variables': []
+}
+
+
+def expand_synthetic_paths(pattern: str) -> List[str]:
+    """CSV files in a directory, or the files matching a glob pattern, sorted."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.csv')
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def completed_files(output_path: str) -> Set[str]:
+    """Synthetic files that already have a successful record in ``output_path``."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run; that file is redone
+                continue
+            if record.get('status') == 'success':
+                done.add(record['synthetic_file'])
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _validate_file(orchestrator: ValidationOrchestrator, aggregator: ScoreAggregator,
+                   data_loader: DataLoader, real_data, reference, path: str,
+                   config: Dict[str, Any]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        synthetic_data = data_loader.load_csv(path)
+        results = orchestrator.run_validation_pipeline(real_data, synthetic_data, config,
+                                                       reference=reference)
+        pipeline_metadata = results.pop('pipeline_metadata', {})
+        return {
+            'synthetic_file': path,
+            'status': 'success',
+            'validation_results': results,
+            'synthetic_data_quality_score': aggregator.calculate_synthetic_data_quality_score(
+                results, gate=pipeline_metadata.get('gate')),
+            'pipeline_metadata': pipeline_metadata,
+            'elapsed_seconds': time.perf_counter() - start
+        }
+    except Exception as e:
+        return {
+            'synthetic_file': path,
+            'status': 'error',
+            'error': str(e),
+            'elapsed_seconds': time.perf_counter() - start
+        }
+
+
+def run_batch(real_path: str, synthetic_pattern: str, output_path: str,
+              config: Optional[Dict[str, Any]] = None, workers: int = 4,
+              resume: bool = True, progress=None) -> Dict[str, Any]:
+    """Validate every matching synthetic file and append results to ``output_path``."""
+    config = dict(config or DEFAULT_CONFIG)
+    progress = progress or sys.stderr
+    paths = expand_synthetic_paths(synthetic_pattern)
+    done = completed_files(output_path) if resume else set()
+    pending = [path for path in paths if path not in done]
+
+    data_loader = DataLoader()
+    aggregator = ScoreAggregator()
+    orchestrator = ValidationOrchestrator()
+    real_data = data_loader.load_csv(real_path)
+    reference = orchestrator.get_reference_profile(real_data)
+
+    print(f"Validating {len(pending)} file(s) ({len(paths) - len(pending)} already done) "
+          f"with {workers} worker(s)", file=progress)
+
+    summary = {'total': len(paths), 'skipped': len(paths) - len(pending),
+               'succeeded': 0, 'failed': 0}
+    start = time.perf_counter()
+    with open(output_path, 'a' if resume else 'w') as out, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_validate_file, orchestrator, aggregator, data_loader,
+                                   real_data, reference, path, config) for path in pending]
+        if resume and out.tell() > 0 and not _ends_with_newline(output_path):
+            # Terminate a partial line left by an interrupted run
+            out.write('\n')
+        for i, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            # Written and flushed one line at a time so an interrupted run can resume
+            out.write(dumps(record).decode('utf-8') + '\n')
+            out.flush()
+
+            ok = record['status'] == 'success'
+            summary['succeeded' if ok else 'failed'] += 1
+            if ok:
+                score = record['synthetic_data_quality_score']['overall_synthetic_data_quality_score']
+                status = f"score={score:.3f}"
+            else:
+                status = f"error: {record['error']}"
+            print(f"[{i}/{len(pending)}] {record['synthetic_file']} {status} "
+                  f"({record['elapsed_seconds']:.2f}s)", file=progress)
+
+    orchestrator.shutdown()
+    summary['elapsed_seconds'] = time.perf_counter() - start
+    print(f"Done: {summary['succeeded']} succeeded, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped in {summary['elapsed_seconds']:.1f}s", file=progress)
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                     description="Synthetic data validation batch runner")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    validate = commands.add_parser('validate', help="Validate a directory or glob of synthetic CSV files")
+    validate.add_argument('--real', required=True, help="CSV file with the real dataset")
+    validate.add_argument('--synthetic', required=True,
+                          help="Directory of synthetic CSV files or a glob pattern (quote it)")
+    validate.add_argument('--config', help="JSON file with the validation configuration")
+    validate.add_argument('--output', default='validation_results.jsonl',
+                          help="JSONL file results are appended to")
+    validate.add_argument('--workers', type=int, default=4, help="Files validated in parallel")
+    validate.add_argument('--no-resume', action='store_true',
+                          help="Overwrite the output instead of skipping completed files")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    config = None
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    summary = run_batch(args.real, args.synthetic, args.output, config=config,
+                        workers=args.workers, resume=not args.no_resume)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Zero-copy hand-off of encoded matrices to process-pool validators.
+Arrays are written once to shared memory (or, when they are already
+memory-mapped from the shared reference store, referenced by file) and
+workers receive small picklable handles instead of pickled DataFrames.
+"""
+
+import mmap
+import importlib
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
+from src.encoding import EncodedMatrices
+
+
+class ArrayHandle:
+    """Picklable description of an array in shared memory or a mapped file."""
+
+    def __init__(self, shape: Tuple[int, ...], dtype: str, shm_name: Optional[str] = None,
+                 path: Optional[str] = None, offset: int = 0):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.shm_name = shm_name
+        self.path = path
+        self.offset = offset
+
+    def attach(self) -> Tuple[np.ndarray, Optional[shared_memory.SharedMemory]]:
+        """Map the array; the returned segment (if any) must be closed by the caller."""
+        if self.path is not None:
+            return np.memmap(self.path, dtype=self.dtype, mode='r', offset=self.offset,
+                             shape=self.shape), None
+        segment = shared_memory.SharedMemory(name=self.shm_name)
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=segment.buf), segment
+
+
+class EncodedHandle:
+    def __init__(self, real: ArrayHandle, synthetic: ArrayHandle, feature_names: List[str],
+                 source_columns: List[str], target_column: Optional[str] = None,
+                 real_target: Optional[np.ndarray] = None,
+                 synthetic_target: Optional[np.ndarray] = None,
+                 target_categories: Optional[List[str]] = None):
+        self.real = real
+        self.synthetic = synthetic
+        self.feature_names = feature_names
+        self.source_columns = source_columns
+        # Target vectors are one column each and are pickled with the handle
+        self.target_column = target_column
+        self.real_target = real_target
+        self.synthetic_target = synthetic_target
+        self.target_categories = target_categories
+
+
+class SharedArrayTransport:
+    """Owns the shared memory segments of one pipeline run.
+
+    Use as a context manager: every segment is closed and unlinked on exit,
+    whether or not the run succeeded.
+    """
+
+    def __init__(self):
+        self._segments: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> "SharedArrayTransport":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def put(self, array: np.ndarray) -> ArrayHandle:
+        """Publish ``array`` and return a handle workers can attach to."""
+        if (isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap)
+                and array.filename and array.flags['C_CONTIGUOUS']):
+            # Already backed by a shared file; hand out its location instead of copying
+            return ArrayHandle(array.shape, array.dtype.str, path=array.filename,
+                               offset=array.offset)
+
+        array = np.ascontiguousarray(array)
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(segment)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        return ArrayHandle(array.shape, array.dtype.str, shm_name=segment.name)
+
+    def put_encoded(self, encoded: EncodedMatrices) -> EncodedHandle:
+        return EncodedHandle(self.put(encoded.real), self.put(encoded.synthetic),
+                             encoded.feature_names, encoded.source_columns,
+                             encoded.target_column, encoded.real_target,
+                             encoded.synthetic_target, encoded.target_categories)
+
+    def close(self) -> None:
+        """Release and unlink every segment created by this transport."""
+        while self._segments:
+            segment = self._segments.pop()
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def run_in_worker(target: str, handle: EncodedHandle, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool entry point: attach the encoded matrices and call ``target``.
+
+    ``target`` is a ``"module:function"`` taking ``(encoded, config)``.
+    """
+    real, real_segment = handle.real.attach()
+    synthetic, synthetic_segment = handle.synthetic.attach()
+    encoded = EncodedMatrices(real, synthetic, handle.feature_names, handle.source_columns,
+                              handle.target_column, handle.real_target,
+                              handle.synthetic_target, handle.target_categories)
+    try:
+        module_name, function_name = target.split(':')
+        function = getattr(importlib.import_module(module_name), function_name)
+        return function(encoded, config)
+    finally:
+        # Drop views onto the buffers before closing the segments
+        del real, synthetic, encoded
+        for segment in (real_segment, synthetic_segment):
+            if segment is not None:
+                try:
+                    segment.close()
+                except BufferError:
+                    # A traceback still references the arrays; the mapping is released with it
+                    pass
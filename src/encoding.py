@@ -0,0 +1,161 @@
+"""
+Shared numeric encoding of real and synthetic datasets.
+Produces aligned float design matrices (numeric columns as-is, categorical
+columns one-hot over a shared vocabulary) for model-based validators.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+
+
+class EncodedMatrices:
+    def __init__(self, real: np.ndarray, synthetic: np.ndarray, feature_names: List[str],
+                 source_columns: List[str], target_column: Optional[str] = None,
+                 real_target: Optional[np.ndarray] = None,
+                 synthetic_target: Optional[np.ndarray] = None,
+                 target_categories: Optional[List[str]] = None):
+        self.real = real
+        self.synthetic = synthetic
+        self.feature_names = feature_names
+        self.source_columns = source_columns
+        # Raw (unimputed) target values; see encode_target
+        self.target_column = target_column
+        self.real_target = real_target
+        self.synthetic_target = synthetic_target
+        self.target_categories = target_categories
+
+    def subset(self, real_rows: np.ndarray, synthetic_rows: np.ndarray) -> "EncodedMatrices":
+        """The given rows of each side, targets included."""
+        def _take(values, rows):
+            return values[rows] if values is not None else None
+
+        return EncodedMatrices(self.real[real_rows], self.synthetic[synthetic_rows],
+                               self.feature_names, self.source_columns, self.target_column,
+                               _take(self.real_target, real_rows),
+                               _take(self.synthetic_target, synthetic_rows),
+                               self.target_categories)
+
+    def combined(self) -> np.ndarray:
+        """Real rows stacked on top of synthetic rows."""
+        return np.vstack([self.real, self.synthetic])
+
+    def feature_slices(self) -> Dict[str, List[int]]:
+        """Feature indices produced by each source column."""
+        slices: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.feature_names):
+            slices.setdefault(name.split('=', 1)[0], []).append(i)
+        return slices
+
+
+class ReferenceEncoding:
+    """Encoding fitted on the real dataset that other frames are projected onto."""
+
+    def __init__(self, real: np.ndarray, feature_names: List[str], columns: List[str],
+                 numeric_fill: Dict[str, float], vocabularies: Dict[str, List[str]]):
+        self.real = real
+        self.feature_names = feature_names
+        self.columns = columns
+        self.numeric_fill = numeric_fill
+        self.vocabularies = vocabularies
+
+    def transform(self, data: pd.DataFrame) -> np.ndarray:
+        """Encode ``data`` (which must contain every fitted column) with the real layout."""
+        blocks = []
+        for column in self.columns:
+            if column in self.numeric_fill:
+                values = pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                blocks.append(np.where(np.isnan(values), self.numeric_fill[column], values)[:, None])
+            else:
+                blocks.append(_one_hot(data[column], self.vocabularies[column]))
+        return np.hstack(blocks) if blocks else np.empty((len(data), 0))
+
+
+def _one_hot(values: pd.Series, vocabulary: List[str]) -> np.ndarray:
+    codes = pd.Index(vocabulary).get_indexer(values.astype(str))
+    one_hot = np.zeros((len(values), len(vocabulary)))
+    known = codes >= 0
+    one_hot[np.flatnonzero(known), codes[known]] = 1.0
+    return one_hot
+
+
+def encode_target(real: pd.Series, synthetic: pd.Series
+                  ) -> Tuple[np.ndarray, np.ndarray, Optional[List[str]]]:
+    """Target values of both datasets as floats, keeping missing values as NaN.
+
+    Numeric (and boolean) targets are converted as-is. Other targets become
+    codes into a shared category list (real categories first), which is
+    returned as the third element and is ``None`` for numeric targets.
+    """
+    if pd.api.types.is_numeric_dtype(real):
+        return (real.to_numpy(dtype=float, na_value=np.nan),
+                pd.to_numeric(synthetic, errors='coerce').to_numpy(dtype=float, na_value=np.nan),
+                None)
+
+    categories = pd.Index(pd.unique(pd.concat([real.dropna().astype(str),
+                                                synthetic.dropna().astype(str)])))
+
+    def _codes(values: pd.Series) -> np.ndarray:
+        codes = categories.get_indexer(values.astype(str)).astype(float)
+        codes[values.isna().to_numpy()] = np.nan
+        return codes
+
+    return _codes(real), _codes(synthetic), [str(c) for c in categories]
+
+
+def fit_reference_encoding(real_data: pd.DataFrame, columns: List[str] = None,
+                           max_categories: int = 50) -> ReferenceEncoding:
+    """Encode the real dataset and remember how, so synthetic frames can follow.
+
+    Missing numeric values are filled with the real-data mean. Categorical
+    columns keep their ``max_categories`` most frequent real values; rarer or
+    unseen values map to an all-zero row for that column.
+    """
+    columns = list(real_data.columns) if columns is None else list(columns)
+    numeric_fill: Dict[str, float] = {}
+    vocabularies: Dict[str, List[str]] = {}
+    feature_names: List[str] = []
+    for column in columns:
+        real_col = real_data[column]
+        if pd.api.types.is_numeric_dtype(real_col):
+            real_values = real_col.to_numpy(dtype=float, na_value=np.nan)
+            numeric_fill[column] = float(np.nanmean(real_values)) if np.isfinite(real_values).any() else 0.0
+            feature_names.append(str(column))
+        else:
+            vocabularies[column] = list(real_col.astype(str).value_counts().index[:max_categories])
+            feature_names.extend(f"{column}={category}" for category in vocabularies[column])
+
+    encoding = ReferenceEncoding(None, feature_names, columns, numeric_fill, vocabularies)
+    encoding.real = encoding.transform(real_data)
+    return encoding
+
+
+def encode_datasets(real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                    columns: List[str] = None, max_categories: int = 50,
+                    reference_encoding: Optional[ReferenceEncoding] = None,
+                    target_column: Optional[str] = None) -> EncodedMatrices:
+    """Encode the shared columns of both datasets into aligned float matrices.
+
+    ``reference_encoding`` is an optional precomputed encoding of ``real_data``;
+    it is reused when it covers exactly the shared columns, so only the
+    synthetic side is encoded. With ``target_column`` the raw target values
+    are attached as well (see ``encode_target``).
+    """
+    if columns is None:
+        columns = [c for c in real_data.columns if c in synthetic_data.columns]
+
+    encoding = reference_encoding
+    if encoding is None or list(encoding.columns) != list(columns):
+        encoding = fit_reference_encoding(real_data, columns, max_categories)
+
+    encoded = EncodedMatrices(
+        real=encoding.real,
+        synthetic=encoding.transform(synthetic_data),
+        feature_names=encoding.feature_names,
+        source_columns=list(columns)
+    )
+    if target_column is not None and target_column in columns:
+        encoded.target_column = target_column
+        encoded.real_target, encoded.synthetic_target, encoded.target_categories = encode_target(
+            real_data[target_column], synthetic_data[target_column])
+    return encoded
@@ -0,0 +1,110 @@
+"""
+Generator feedback loop wiring the orchestrator, reward function and RL agent.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+from src.orchestrator import ValidationOrchestrator
+from src.feedback_engine.reward_function import RewardFunction
+from src.feedback_engine.rl_agent import RLAgent
+
+# generator(action, n_candidates) -> list of synthetic DataFrames
+CandidateGenerator = Callable[[int, int], List[pd.DataFrame]]
+
+
+class FeedbackLoopRunner:
+    def __init__(self, generator: CandidateGenerator, real_data: pd.DataFrame,
+                 config: Dict[str, Any], orchestrator: Optional[ValidationOrchestrator] = None,
+                 reward_function: Optional[RewardFunction] = None,
+                 agent: Optional[RLAgent] = None, candidates_per_step: int = 4,
+                 max_workers: Optional[int] = None, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 1):
+        self.generator = generator
+        self.real_data = real_data
+        self.config = config
+        self.orchestrator = orchestrator if orchestrator is not None else ValidationOrchestrator()
+        self.reward_function = reward_function if reward_function is not None else RewardFunction()
+        self.agent = agent if agent is not None else RLAgent()
+        self.candidates_per_step = candidates_per_step
+        self.max_workers = max_workers or candidates_per_step
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+        # Real-side statistics are computed once and shared by every candidate
+        self.reference = self.orchestrator.get_reference_profile(real_data)
+        self.state = np.zeros(len(RewardFunction.SCORE_COLUMNS))
+        self.steps_completed = 0
+        self.candidates_evaluated = 0
+        self.evaluation_seconds = 0.0
+        self.history: List[Dict[str, Any]] = []
+
+    def evaluate_candidates(self, candidates: List[pd.DataFrame]) -> List[Dict[str, Any]]:
+        """Validate candidates concurrently against the cached reference profile."""
+        def _validate(candidate: pd.DataFrame) -> Dict[str, Any]:
+            return self.orchestrator.run_validation_pipeline(
+                self.real_data, candidate, self.config, reference=self.reference
+            )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(_validate, candidates))
+
+    def step(self) -> Dict[str, Any]:
+        """Generate K candidates, score them, update the agent and checkpoint."""
+        step_start = time.perf_counter()
+        action = int(self.agent.select_action(self.state))
+        candidates = self.generator(action, self.candidates_per_step)
+
+        eval_start = time.perf_counter()
+        results = self.evaluate_candidates(candidates)
+        eval_seconds = time.perf_counter() - eval_start
+
+        scores = self.reward_function.score_matrix(results)
+        rewards = self.reward_function.calculate_rewards_batch(scores)
+        next_states = np.nan_to_num(scores, nan=0.0)
+
+        # Every candidate is an outcome of the same (state, action) pair; the agent
+        # averages their TD errors into a single update of that cell
+        n = len(candidates)
+        self.agent.update_policy_batch(np.repeat(self.state[None, :], n, axis=0),
+                                       np.full(n, action), rewards, next_states)
+
+        best = int(np.argmax(rewards)) if n else -1
+        if n:
+            self.state = next_states[best]
+
+        self.steps_completed += 1
+        self.candidates_evaluated += n
+        self.evaluation_seconds += eval_seconds
+
+        if self.checkpoint_path and self.steps_completed % self.checkpoint_every == 0:
+            self.agent.save(self.checkpoint_path)
+
+        summary = {
+            'step': self.steps_completed,
+            'action': action,
+            'rewards': rewards.tolist(),
+            'best_candidate': best,
+            'best_reward': float(rewards[best]) if n else None,
+            'step_seconds': time.perf_counter() - step_start,
+            'candidates_per_minute': n / eval_seconds * 60 if eval_seconds > 0 else None
+        }
+        self.history.append(summary)
+        return summary
+
+    def run(self, n_steps: int) -> Dict[str, Any]:
+        """Run several steps and report overall throughput."""
+        for _ in range(n_steps):
+            self.step()
+
+        best_rewards = [s['best_reward'] for s in self.history if s['best_reward'] is not None]
+        return {
+            'steps_completed': self.steps_completed,
+            'candidates_evaluated': self.candidates_evaluated,
+            'best_reward': max(best_rewards) if best_rewards else None,
+            'candidates_per_minute': (self.candidates_evaluated / self.evaluation_seconds * 60
+                                      if self.evaluation_seconds > 0 else None),
+            'history': self.history
+        }
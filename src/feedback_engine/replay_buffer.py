@@ -0,0 +1,53 @@
+"""
+Fixed-capacity experience replay buffer for the RL feedback engine.
+"""
+
+import numpy as np
+from typing import Tuple, Optional
+
+class ReplayBuffer:
+    def __init__(self, capacity: int, state_dim: int, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.state_dim = state_dim
+        self.states = np.zeros((capacity, state_dim))
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros((capacity, state_dim))
+        self.position = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray) -> None:
+        """Store a single transition, overwriting the oldest when full."""
+        self.add_batch(np.asarray(state)[None, :], np.array([action]),
+                       np.array([reward]), np.asarray(next_state)[None, :])
+
+    def add_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                  next_states: np.ndarray) -> None:
+        """Store many transitions with one ring-buffer write."""
+        n = len(actions)
+        if n > self.capacity:
+            # Only the most recent transitions would survive anyway
+            states, actions = states[-self.capacity:], actions[-self.capacity:]
+            rewards, next_states = rewards[-self.capacity:], next_states[-self.capacity:]
+            n = self.capacity
+
+        slots = (self.position + np.arange(n)) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Sample a uniform random batch of (states, actions, rewards, next_states)."""
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+
+        idx = self.rng.integers(0, self.size, size=batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
@@ -4,9 +4,12 @@ Reward function for RL feedback system.
 """
 
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 
 class RewardFunction:
+    # Column order of the score matrix
+    SCORE_COLUMNS = ('fidelity', 'utility', 'privacy', 'bias')
+    
     def __init__(self):
         self.weights = {
             'fidelity': 0.3,
@@ -15,6 +18,40 @@ class RewardFunction:
             'bias': 0.2
         }
     
+    def score_matrix(self, validation_results_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Turn many validation results into an (n, 4) quality matrix (NaN = missing).
+        
+        Columns follow ``SCORE_COLUMNS``; privacy and bias are converted so
+        that higher is better, as in ``calculate_reward``.
+        """
+        fields = [
+            ('fidelity', 'fidelity_score'),
+            ('task_utility', 'utility_score'),
+            ('privacy_risk', 'privacy_risk_score'),
+            ('bias_check', 'overall_bias_score')
+        ]
+        raw = np.array([
+            [float(scores.get(validator, {}).get(key, np.nan)) for validator, key in fields]
+            for scores in validation_results_list
+        ], dtype=float).reshape(-1, len(fields))
+        
+        matrix = raw.copy()
+        matrix[:, 2] = 1.0 - raw[:, 2]
+        matrix[:, 3] = 1.0 - np.minimum(1.0, raw[:, 3])
+        return matrix
+    
+    def calculate_rewards_batch(self, validation_scores: Union[List[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+        """Calculate rewards for a whole batch in one vectorized computation.
+        
+        Accepts either a list of validation results or a precomputed score matrix.
+        """
+        if not isinstance(validation_scores, np.ndarray):
+            validation_scores = self.score_matrix(validation_scores)
+        
+        weights = np.array([self.weights[name] for name in self.SCORE_COLUMNS])
+        rewards = np.nan_to_num(validation_scores, nan=0.0) @ weights
+        return np.clip(rewards, 0.0, 1.0)
+    
     def calculate_reward(self, validation_scores: Dict[str, Any]) -> float:
         """Calculate reward based on validation scores."""
         reward = 0.0
@@ -3,38 +3,104 @@
 Reinforcement Learning agent for policy updates.
 """
 
+import json
 import numpy as np
 from typing import Dict, Any, List
+from src.feedback_engine.replay_buffer import ReplayBuffer
+from src.feedback_engine.state_encoding import (
+    BinningEncoder, SparseQStore, encoder_from_config
+)
 
 class RLAgent:
-    def __init__(self, action_space_size: int = 10, learning_rate: float = 0.01):
+    def __init__(self, action_space_size: int = 10, learning_rate: float = 0.01,
+                 state_encoder=None, initial_q_value: float = 0.0):
         self.action_space_size = action_space_size
         self.learning_rate = learning_rate
-        self.q_table = np.random.rand(100, action_space_size)  # Simple Q-table
+        # States are validation quality scores in [0, 1] unless an encoder says otherwise
+        self.state_encoder = state_encoder if state_encoder is not None else BinningEncoder()
+        self.q_store = SparseQStore(action_space_size, initial_q_value)
         self.epsilon = 0.1  # Exploration rate
-    
+        self.discount_factor = 0.95
+
+    def q_values(self, state: np.ndarray) -> np.ndarray:
+        """Q-values of every action for a single state."""
+        return self._q_values_batch(np.asarray(state)[None, :])[0]
+
     def select_action(self, state: np.ndarray) -> int:
         """Select action using epsilon-greedy policy."""
-        state_idx = self._state_to_index(state)
-        
         if np.random.random() < self.epsilon:
             return np.random.randint(self.action_space_size)
         else:
-            return np.argmax(self.q_table[state_idx])
-    
+            return int(np.argmax(self.q_values(state)))
+
     def update_policy(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray):
-        """Update Q-table using Q-learning."""
-        state_idx = self._state_to_index(state)
-        next_state_idx = self._state_to_index(next_state)
-        
-        current_q = self.q_table[state_idx, action]
-        max_next_q = np.max(self.q_table[next_state_idx])
-        
-        # Q-learning update
-        new_q = current_q + self.learning_rate * (reward + 0.95 * max_next_q - current_q)
-        self.q_table[state_idx, action] = new_q
-    
-    def _state_to_index(self, state: np.ndarray) -> int:
-        """Convert state to index for Q-table lookup."""
-        # Simple hash function for state indexing
-        return int(np.sum(state) * 1000) % self.q_table.shape[0]
+        """Update Q-values using Q-learning."""
+        self.update_policy_batch(np.asarray(state)[None, :], np.array([action]),
+                                 np.array([reward]), np.asarray(next_state)[None, :])
+
+    def update_policy_batch(self, states: np.ndarray, actions: np.ndarray,
+                            rewards: np.ndarray, next_states: np.ndarray) -> None:
+        """Apply Q-learning updates for a batch of transitions at once.
+
+        TD targets are computed before the batch is applied; TD errors that
+        hit the same (key, action) cell are averaged, so repeated transitions
+        move a cell by one learning-rate step rather than one per copy.
+        """
+        rows = self.q_store.get_or_create(self.state_encoder.encode_batch(states))
+        actions = np.asarray(actions, dtype=np.int64)
+
+        current_q = self.q_store.values[rows, actions[:, None]].mean(axis=1)
+        max_next_q = self._q_values_batch(next_states).max(axis=1)
+        td_error = np.asarray(rewards) + self.discount_factor * max_next_q - current_q
+
+        # Every active key of a state moves by the full step, so their mean does too
+        n_keys = rows.shape[1]
+        cells = rows.ravel() * self.action_space_size + np.repeat(actions, n_keys)
+        cells, inverse = np.unique(cells, return_inverse=True)
+        mean_td = (np.bincount(inverse, weights=np.repeat(td_error, n_keys))
+                   / np.bincount(inverse))
+        self.q_store.values[cells // self.action_space_size, cells % self.action_space_size] += (
+            self.learning_rate * mean_td)
+        np.add.at(self.q_store.visits, rows.ravel(), 1)
+
+    def train_from_replay(self, buffer: ReplayBuffer, batch_size: int = 256,
+                          n_updates: int = 1) -> None:
+        """Run batched Q-updates on transitions sampled from a replay buffer."""
+        for _ in range(n_updates):
+            self.update_policy_batch(*buffer.sample(batch_size))
+
+    def _q_values_batch(self, states: np.ndarray) -> np.ndarray:
+        """Q-values for a batch of states without allocating rows for unseen ones."""
+        return self.q_store.q_values(self.q_store.lookup(self.state_encoder.encode_batch(states)))
+
+    def save(self, path: str) -> None:
+        """Save the Q store, encoder and hyperparameters to an ``.npz`` file."""
+        size = len(self.q_store)
+        meta = {
+            'action_space_size': self.action_space_size,
+            'learning_rate': self.learning_rate,
+            'epsilon': self.epsilon,
+            'discount_factor': self.discount_factor,
+            'initial_q_value': self.q_store.initial_value,
+            'state_encoder': self.state_encoder.get_config()
+        }
+        with open(path, 'wb') as handle:
+            np.savez(handle,
+                     keys=self.q_store.keys_array(),
+                     values=self.q_store.values[:size],
+                     visits=self.q_store.visits[:size],
+                     meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path: str) -> "RLAgent":
+        """Restore an agent written by ``save``."""
+        with np.load(path) as saved:
+            meta = json.loads(str(saved['meta']))
+            agent = cls(action_space_size=meta['action_space_size'],
+                        learning_rate=meta['learning_rate'],
+                        state_encoder=encoder_from_config(meta['state_encoder']),
+                        initial_q_value=meta['initial_q_value'])
+            agent.epsilon = meta['epsilon']
+            agent.discount_factor = meta['discount_factor']
+            agent.q_store.load_arrays(saved['keys'], saved['values'], saved['visits'])
+        return agent
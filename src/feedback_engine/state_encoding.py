@@ -0,0 +1,148 @@
+"""
+State encoders and sparse Q-value storage for the RL agent.
+Encoders map continuous validation-score states to integer keys; the Q store
+grows one array-backed row per key actually visited.
+"""
+
+import numpy as np
+from typing import Dict, Any, Union
+
+ArrayLike = Union[float, np.ndarray, list]
+
+
+class BinningEncoder:
+    """Uniform per-dimension binning; every state maps to exactly one key."""
+
+    __slots__ = ('n_bins', 'low', 'high')
+
+    def __init__(self, n_bins: int = 10, low: ArrayLike = 0.0, high: ArrayLike = 1.0):
+        self.n_bins = n_bins
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+
+    @property
+    def n_keys(self) -> int:
+        return 1
+
+    def encode_batch(self, states: np.ndarray) -> np.ndarray:
+        """Encode (n, d) states into (n, 1) integer keys."""
+        states = np.asarray(states, dtype=float).reshape(len(states), -1)
+        scaled = (states - self.low) / (self.high - self.low)
+        bins = np.clip(np.floor(scaled * self.n_bins), 0, self.n_bins - 1).astype(np.int64)
+        radix = self.n_bins ** np.arange(states.shape[1], dtype=np.int64)
+        return (bins @ radix)[:, None]
+
+    def get_config(self) -> Dict[str, Any]:
+        return {'type': 'binning', 'n_bins': self.n_bins,
+                'low': self.low.tolist(), 'high': self.high.tolist()}
+
+
+class TileCodingEncoder:
+    """Several offset tilings over the state space; each state activates one tile per tiling."""
+
+    __slots__ = ('n_tilings', 'tiles_per_dim', 'low', 'high')
+
+    def __init__(self, n_tilings: int = 8, tiles_per_dim: int = 8,
+                 low: ArrayLike = 0.0, high: ArrayLike = 1.0):
+        self.n_tilings = n_tilings
+        self.tiles_per_dim = tiles_per_dim
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+
+    @property
+    def n_keys(self) -> int:
+        return self.n_tilings
+
+    def encode_batch(self, states: np.ndarray) -> np.ndarray:
+        """Encode (n, d) states into (n, n_tilings) integer keys."""
+        states = np.asarray(states, dtype=float).reshape(len(states), -1)
+        scaled = np.clip((states - self.low) / (self.high - self.low), 0.0, 1.0) * self.tiles_per_dim
+        offsets = np.arange(self.n_tilings) / self.n_tilings
+
+        # (n, tilings, d) tile coordinates; offsets shift each tiling by a fraction of a tile
+        coords = np.floor(scaled[:, None, :] + offsets[None, :, None]).astype(np.int64)
+        base = self.tiles_per_dim + 1
+        radix = base ** np.arange(states.shape[1], dtype=np.int64)
+        tiling_size = base ** states.shape[1]
+        return coords @ radix + np.arange(self.n_tilings, dtype=np.int64) * tiling_size
+
+    def get_config(self) -> Dict[str, Any]:
+        return {'type': 'tile_coding', 'n_tilings': self.n_tilings,
+                'tiles_per_dim': self.tiles_per_dim,
+                'low': self.low.tolist(), 'high': self.high.tolist()}
+
+
+def encoder_from_config(config: Dict[str, Any]):
+    """Rebuild an encoder from ``get_config`` output."""
+    params = {k: v for k, v in config.items() if k != 'type'}
+    if config['type'] == 'binning':
+        return BinningEncoder(**params)
+    if config['type'] == 'tile_coding':
+        return TileCodingEncoder(**params)
+    raise ValueError(f"Unknown state encoder type: {config['type']}")
+
+
+class SparseQStore:
+    """Growable Q-value rows indexed by state key; unseen keys read as ``initial_value``."""
+
+    __slots__ = ('n_actions', 'initial_value', '_index', 'values', 'visits', 'size')
+
+    def __init__(self, n_actions: int, initial_value: float = 0.0, capacity: int = 64):
+        self.n_actions = n_actions
+        self.initial_value = initial_value
+        self._index: Dict[int, int] = {}
+        self.values = np.full((capacity, n_actions), initial_value, dtype=float)
+        self.visits = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Row index per key, -1 where the key has never been stored."""
+        flat = np.asarray(keys).ravel()
+        rows = np.fromiter((self._index.get(int(k), -1) for k in flat), dtype=np.int64, count=len(flat))
+        return rows.reshape(np.shape(keys))
+
+    def get_or_create(self, keys: np.ndarray) -> np.ndarray:
+        """Row index per key, allocating rows for new keys."""
+        new_keys = [int(k) for k in np.unique(keys) if int(k) not in self._index]
+        if new_keys:
+            self._reserve(self.size + len(new_keys))
+            for key in new_keys:
+                self._index[key] = self.size
+                self.size += 1
+        return self.lookup(keys)
+
+    def _reserve(self, required: int) -> None:
+        capacity = len(self.values)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        values = np.full((capacity, self.n_actions), self.initial_value, dtype=float)
+        values[:self.size] = self.values[:self.size]
+        visits = np.zeros(capacity, dtype=np.int64)
+        visits[:self.size] = self.visits[:self.size]
+        self.values, self.visits = values, visits
+
+    def q_values(self, rows: np.ndarray) -> np.ndarray:
+        """Average Q-values over each state's active keys: (n, k) rows -> (n, actions)."""
+        gathered = np.where((rows >= 0)[..., None], self.values[np.maximum(rows, 0)], self.initial_value)
+        return gathered.mean(axis=1)
+
+    def keys_array(self) -> np.ndarray:
+        """Stored keys ordered by row index."""
+        keys = np.empty(self.size, dtype=np.int64)
+        for key, row in self._index.items():
+            keys[row] = key
+        return keys
+
+    def load_arrays(self, keys: np.ndarray, values: np.ndarray, visits: np.ndarray) -> None:
+        """Replace the store contents with saved arrays."""
+        self._index = {int(k): i for i, k in enumerate(keys)}
+        self.size = len(keys)
+        self.values = np.full((max(self.size, 64), self.n_actions), self.initial_value, dtype=float)
+        self.values[:self.size] = values
+        self.visits = np.zeros(len(self.values), dtype=np.int64)
+        self.visits[:self.size] = visits
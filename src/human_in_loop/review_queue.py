@@ -0,0 +1,142 @@
+"""
+Priority queue of validation cases awaiting human review.
+Backed by a local SQLite store; the next case is fetched through an index
+on (status, priority) so retrieval stays O(log n) as the backlog grows.
+"""
+
+import json
+import sqlite3
+import datetime
+import threading
+from typing import Dict, Any, List, Optional
+
+
+class ReviewQueue:
+    def __init__(self, db_path: str = "review_queue.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create the review case table and its priority index."""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS review_cases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    validation_id TEXT NOT NULL,
+                    priority REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    reason TEXT,
+                    context TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    reviewer_id TEXT,
+                    claimed_at TEXT,
+                    decision TEXT,
+                    notes TEXT,
+                    resolved_at TEXT
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_next "
+                "ON review_cases (status, priority DESC, id)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_review_validation_id ON review_cases (validation_id)"
+            )
+
+    def _row(self, context: Dict[str, Any], created_at: str) -> tuple:
+        return (
+            context['validation_id'],
+            float(context.get('uncertainty_score', 0.0)),
+            context.get('review_reason'),
+            json.dumps(context, default=str),
+            created_at
+        )
+
+    def enqueue(self, context: Dict[str, Any]) -> int:
+        """Add one review context (needs ``validation_id``); returns the case id."""
+        created_at = datetime.datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO review_cases (validation_id, priority, reason, context, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._row(context, created_at)
+            )
+            return cursor.lastrowid
+
+    def enqueue_batch(self, contexts: List[Dict[str, Any]]) -> int:
+        """Add many review contexts in a single transaction."""
+        created_at = datetime.datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO review_cases (validation_id, priority, reason, context, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [self._row(context, created_at) for context in contexts]
+            )
+        return len(contexts)
+
+    def next_case(self, reviewer_id: str) -> Optional[Dict[str, Any]]:
+        """Claim the highest-priority pending case for a reviewer."""
+        claimed_at = datetime.datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM review_cases WHERE status = 'pending' "
+                "ORDER BY priority DESC, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE review_cases SET status = 'in_review', reviewer_id = ?, claimed_at = ? "
+                "WHERE id = ?",
+                (reviewer_id, claimed_at, row['id'])
+            )
+        return self.get_case(row['id'])
+
+    def resolve(self, case_id: int, decision: str, notes: str = "",
+                audit_logger=None) -> Optional[Dict[str, Any]]:
+        """Record a reviewer decision, optionally logging it to the audit trail."""
+        resolved_at = datetime.datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE review_cases SET status = 'resolved', decision = ?, notes = ?, "
+                "resolved_at = ? WHERE id = ? AND status != 'resolved'",
+                (decision, notes, resolved_at, case_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+
+        case = self.get_case(case_id)
+        if audit_logger is not None:
+            audit_logger.log_human_review(case['validation_id'], case['reviewer_id'] or '',
+                                          decision, notes)
+        return case
+
+    def get_case(self, case_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch a single case by id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM review_cases WHERE id = ?", (case_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        case = dict(row)
+        case['context'] = json.loads(case['context'])
+        return case
+
+    def stats(self) -> Dict[str, int]:
+        """Number of cases per status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS n FROM review_cases GROUP BY status"
+            ).fetchall()
+        counts = {'pending': 0, 'in_review': 0, 'resolved': 0}
+        counts.update({row['status']: row['n'] for row in rows})
+        return counts
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
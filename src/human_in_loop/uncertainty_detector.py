@@ -4,42 +4,55 @@ Uncertainty detector for routing validation cases to human reviewers.
 """
 
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List, Optional
+from src.human_in_loop.review_queue import ReviewQueue
 
 class UncertaintyDetector:
     def __init__(self, uncertainty_threshold: float = 0.3):
         self.uncertainty_threshold = uncertainty_threshold
     
+    def score_matrix(self, validation_results_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Stack quality scores of many results into an (n, 3) matrix (NaN = missing).
+        
+        Columns are fidelity, task utility and privacy quality (1 - risk).
+        """
+        matrix = np.full((len(validation_results_list), 3), np.nan)
+        
+        for i, validation_results in enumerate(validation_results_list):
+            for validator_name, results in validation_results.items():
+                if validator_name == 'fidelity' and 'fidelity_score' in results:
+                    matrix[i, 0] = results['fidelity_score']
+                elif validator_name == 'task_utility' and 'utility_score' in results:
+                    matrix[i, 1] = results['utility_score']
+                elif validator_name == 'privacy_risk' and 'privacy_risk_score' in results:
+                    matrix[i, 2] = 1.0 - results['privacy_risk_score']  # Convert to quality score
+        
+        return matrix
+    
+    def calculate_uncertainty_batch(self, validation_results_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Calculate H(v) for many validation results in one vectorized pass."""
+        scores = self.score_matrix(validation_results_list)
+        present = ~np.isnan(scores)
+        counts = present.sum(axis=1)
+        
+        # Score variance across validators and spread of conflicting results
+        safe_counts = np.maximum(counts, 1)
+        means = np.where(present, scores, 0.0).sum(axis=1) / safe_counts
+        variances = np.where(present, (scores - means[:, None]) ** 2, 0.0).sum(axis=1) / safe_counts
+        spreads = (np.where(present, scores, -np.inf).max(axis=1)
+                   - np.where(present, scores, np.inf).min(axis=1))
+        
+        return np.where(counts >= 2, (variances + spreads) / 2, 0.0)
+    
     def calculate_uncertainty(self, validation_results: Dict[str, Any]) -> float:
         """Calculate H(v) - uncertainty score for validation results."""
-        uncertainties = []
-        
-        # Check score variance across validators
-        scores = []
-        for validator_name, results in validation_results.items():
-            if validator_name == 'fidelity' and 'fidelity_score' in results:
-                scores.append(results['fidelity_score'])
-            elif validator_name == 'task_utility' and 'utility_score' in results:
-                scores.append(results['utility_score'])
-            elif validator_name == 'privacy_risk' and 'privacy_risk_score' in results:
-                scores.append(1.0 - results['privacy_risk_score'])  # Convert to quality score
-        
-        if len(scores) > 1:
-            score_variance = np.var(scores)
-            uncertainties.append(score_variance)
-        
-        # Check for conflicting results
-        if len(scores) >= 2:
-            max_diff = max(scores) - min(scores)
-            uncertainties.append(max_diff)
-        
-        # Overall uncertainty
-        overall_uncertainty = np.mean(uncertainties) if uncertainties else 0.0
-        return overall_uncertainty
+        return float(self.calculate_uncertainty_batch([validation_results])[0])
     
-    def should_route_to_human(self, validation_results: Dict[str, Any]) -> Tuple[bool, str]:
+    def should_route_to_human(self, validation_results: Dict[str, Any],
+                              uncertainty: Optional[float] = None) -> Tuple[bool, str]:
         """Determine if validation case should be routed to human reviewer."""
-        uncertainty = self.calculate_uncertainty(validation_results)
+        if uncertainty is None:
+            uncertainty = self.calculate_uncertainty(validation_results)
         
         if uncertainty > self.uncertainty_threshold:
             reason = f"High uncertainty detected (H(v)={uncertainty:.3f})"
@@ -54,10 +67,12 @@ class UncertaintyDetector:
         
         return False, "Automatic validation sufficient"
     
-    def generate_human_review_context(self, validation_results: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_human_review_context(self, validation_results: Dict[str, Any],
+                                      uncertainty: Optional[float] = None) -> Dict[str, Any]:
         """Generate context information for human reviewers."""
-        uncertainty = self.calculate_uncertainty(validation_results)
-        should_review, reason = self.should_route_to_human(validation_results)
+        if uncertainty is None:
+            uncertainty = self.calculate_uncertainty(validation_results)
+        should_review, reason = self.should_route_to_human(validation_results, uncertainty)
         
         return {
             'uncertainty_score': uncertainty,
@@ -67,6 +82,35 @@ class UncertaintyDetector:
             'validation_summary': self._create_summary(validation_results)
         }
     
+    def route_batch(self, validation_results_list: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (uncertainties, route mask) for many results at once."""
+        uncertainties = self.calculate_uncertainty_batch(validation_results_list)
+        privacy_risk = 1.0 - self.score_matrix(validation_results_list)[:, 2]
+        borderline = (privacy_risk >= 0.4) & (privacy_risk <= 0.6)
+        
+        return uncertainties, (uncertainties > self.uncertainty_threshold) | borderline
+    
+    def triage_batch(self, validation_results_list: List[Dict[str, Any]],
+                     validation_ids: List[str],
+                     queue: Optional[ReviewQueue] = None) -> List[Dict[str, Any]]:
+        """Score a backlog of results and build review contexts for routed cases.
+        
+        Routed cases are enqueued by uncertainty when a review queue is given.
+        """
+        uncertainties, route_mask = self.route_batch(validation_results_list)
+        
+        routed = []
+        for i in np.flatnonzero(route_mask):
+            context = self.generate_human_review_context(validation_results_list[i],
+                                                         float(uncertainties[i]))
+            context['validation_id'] = validation_ids[i]
+            routed.append(context)
+        
+        if queue is not None and routed:
+            queue.enqueue_batch(routed)
+        
+        return routed
+    
     def _identify_focus_areas(self, validation_results: Dict[str, Any]) -> list:
         """Identify areas that need human attention."""
         focus_areas = []
@@ -89,7 +133,9 @@ class UncertaintyDetector:
         summary_parts = []
         
         for validator_name, results in validation_results.items():
-            if validator_name == 'fidelity':
+            if results.get('skipped'):
+                summary_parts.append(f"{validator_name}: skipped")
+            elif validator_name == 'fidelity':
                 score = results.get('fidelity_score', 0)
                 summary_parts.append(f"Fidelity: {score:.3f}")
             elif validator_name == 'privacy_risk':
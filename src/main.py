@@ -3,21 +3,89 @@ FastAPI application with /validate/ API endpoint.
 """
 
 from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import pandas as pd
 import io
-from typing import Dict, Any
+import os
+import uuid
+import datetime
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
 from src.loader import DataLoader
 from src.orchestrator import ValidationOrchestrator
 from src.aggregator import ScoreAggregator
+from src.audit_logger import AuditLogger
+from src.audit_store import AuditStore
+from src.result_cache import ResultCache, hash_dataframe
+from src.shared_reference import SharedReferenceStore
+from src.human_in_loop.uncertainty_detector import UncertaintyDetector
+from src.human_in_loop.review_queue import ReviewQueue
+from src.warmup import warm_up
+from src.serialization import dumps, iter_json, summarize_results
+
+RESPONSE_MODES = ('full', 'compact', 'stream')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if STARTUP_MODE == 'eager':
+        ensure_warm()
+    yield
+    orchestrator.shutdown()
+
 
 app = FastAPI(title="Full-Proof Synthetic Data Validation Platform",
-              version="1.0.0")
+              version="1.0.0", lifespan=lifespan)
 
 # Initialize components
 data_loader = DataLoader()
-orchestrator = ValidationOrchestrator()
+# Multi-worker mode: set SHARED_REFERENCE_DIR (e.g. under /dev/shm) so all
+# workers memory-map one copy of each reference dataset and profile
+SHARED_REFERENCE_DIR = os.environ.get('SHARED_REFERENCE_DIR')
+orchestrator = ValidationOrchestrator(cache=ResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', '128')),
+    ttl_seconds=float(os.environ.get('RESULT_CACHE_TTL_SECONDS', '3600')),
+    disk_dir=os.environ.get('RESULT_CACHE_DIR'),
+    max_disk_entries=(int(os.environ['RESULT_CACHE_MAX_DISK_ENTRIES'])
+                      if 'RESULT_CACHE_MAX_DISK_ENTRIES' in os.environ else None)),
+    shared_store=SharedReferenceStore(SHARED_REFERENCE_DIR) if SHARED_REFERENCE_DIR else None,
+    process_workers=int(os.environ.get('VALIDATOR_PROCESS_WORKERS', '0')))
 aggregator = ScoreAggregator()
+audit_store = AuditStore(os.environ.get('AUDIT_DB_PATH', 'validation_audit.db'))
+audit_logger = AuditLogger(os.environ.get('AUDIT_LOG_PATH', 'validation_audit.log'), store=audit_store)
+uncertainty_detector = UncertaintyDetector()
+review_queue = ReviewQueue(os.environ.get('REVIEW_QUEUE_DB_PATH', 'review_queue.db'))
+
+# Validator modules are imported on first use. STARTUP_MODE=eager warms them up
+# at start-up; otherwise the first call to /ready does it.
+STARTUP_MODE = os.environ.get('STARTUP_MODE', 'lazy')
+warmup_state: Dict[str, Any] = {'ready': False, 'started': False, 'report': None, 'error': None}
+warmup_lock = threading.Lock()
+
+
+def ensure_warm() -> Dict[str, Any]:
+    """Run the one-time warm-up if it has not happened yet."""
+    with warmup_lock:
+        warmup_state['started'] = True
+        if not warmup_state['ready']:
+            try:
+                warmup_state['report'] = warm_up(orchestrator)
+                warmup_state['ready'] = True
+                warmup_state['error'] = None
+            except Exception as e:
+                warmup_state['error'] = str(e)
+    return warmup_state
+
+
+def start_warm_up() -> Dict[str, Any]:
+    """Start the warm-up in a background thread (once) and return its state."""
+    with warmup_lock:
+        if not warmup_state['started'] or (warmup_state['error'] and not warmup_state['ready']):
+            warmup_state['started'] = True
+            warmup_state['error'] = None
+            threading.Thread(target=ensure_warm, name='warm-up', daemon=True).start()
+    return warmup_state
 
 
 @app.get("/")
@@ -25,10 +93,30 @@ async def root():
     return {"message": "Full-Proof Synthetic Data Validation Platform API"}
 
 
+@app.post("/references/")
+async def register_reference(real_data: UploadFile = File(...)):
+    """
+    Publish a real dataset to the shared reference store.
+    
+    The returned ``reference_id`` can be passed to /validate/ instead of
+    uploading the real data again; any worker can serve it.
+    """
+    if orchestrator.shared_store is None:
+        raise HTTPException(status_code=400,
+                            detail="Shared reference store is not configured (SHARED_REFERENCE_DIR)")
+    real_content = await real_data.read()
+    real_df = pd.read_csv(io.StringIO(real_content.decode('utf-8')))
+    reference_id = hash_dataframe(real_df)
+    profile = orchestrator.get_reference_profile(real_df, key=reference_id)
+    return {'reference_id': reference_id, **profile.summary()}
+
+
 @app.post("/validate/")
-async def validate_synthetic_data(real_data: UploadFile = File(...),
+async def validate_synthetic_data(real_data: Optional[UploadFile] = File(None),
                                   synthetic_data: UploadFile = File(...),
-                                  config: Dict[str, Any] = None):
+                                  config: Dict[str, Any] = None,
+                                  reference_id: Optional[str] = None,
+                                  response_mode: str = 'full'):
     """
     Validate synthetic data against real data.
     
@@ -36,7 +124,26 @@ async def validate_synthetic_data(real_data: UploadFile = File(...),
     - real_data: CSV file containing real dataset
     - synthetic_data: CSV file containing synthetic dataset
     - config: Validation configuration (optional)
+    - reference_id: ID of a real dataset published via /references/, used
+      instead of ``real_data``
+    - response_mode: ``full`` (default), ``compact`` (scalar scores only) or
+      ``stream`` (full report sent in chunks, for very wide tables)
     """
+    if response_mode not in RESPONSE_MODES:
+        raise HTTPException(status_code=400,
+                            detail=f"response_mode must be one of {list(RESPONSE_MODES)}")
+    if real_data is None and reference_id is None:
+        raise HTTPException(status_code=400,
+                            detail="Provide either real_data or reference_id")
+    reference = None
+    if reference_id is not None:
+        reference = orchestrator.get_shared_reference(reference_id)
+        if reference is None:
+            raise HTTPException(status_code=404,
+                                detail=f"Unknown reference_id: {reference_id}")
+
+    validation_id = None
+    dataset_id = None
     try:
         # Default configuration
         if config is None:
@@ -49,9 +156,19 @@ async def validate_synthetic_data(real_data: UploadFile = File(...),
                 'causal_variables': []
             }
 
+        validation_id = uuid.uuid4().hex
+        dataset_id = config.get('dataset_id') or reference_id or real_data.filename
+        audit_logger.log_validation_start(validation_id, config, dataset_id=dataset_id)
+
         # Load real data
-        real_content = await real_data.read()
-        real_df = pd.read_csv(io.StringIO(real_content.decode('utf-8')))
+        if reference is None:
+            real_content = await real_data.read()
+            real_df = pd.read_csv(io.StringIO(real_content.decode('utf-8')))
+            if orchestrator.shared_store is not None:
+                # Validate against the shared copy so the parsed upload can be freed
+                reference = orchestrator.get_reference_profile(real_df)
+        if reference is not None:
+            real_df = reference.real_data
 
         # Load synthetic data
         synthetic_content = await synthetic_data.read()
@@ -60,29 +177,135 @@ async def validate_synthetic_data(real_data: UploadFile = File(...),
 
         # Run validation pipeline
         validation_results = orchestrator.run_validation_pipeline(
-            real_df, synthetic_df, config)
+            real_df, synthetic_df, config, reference=reference)
+        pipeline_metadata = validation_results.pop('pipeline_metadata', {})
 
         # Aggregate scores
         final_scores = aggregator.calculate_synthetic_data_quality_score(
+            validation_results, gate=pipeline_metadata.get('gate'))
+
+        audit_logger.log_validation_complete(validation_id, validation_results,
+                                             quality_score=final_scores,
+                                             dataset_id=dataset_id)
+
+        # Route uncertain cases to the human review queue
+        review_context = uncertainty_detector.generate_human_review_context(
             validation_results)
+        if review_context['requires_human_review']:
+            review_context['validation_id'] = validation_id
+            review_context['case_id'] = review_queue.enqueue(review_context)
 
-        return JSONResponse(
-            content={
-                'status': 'success',
-                'validation_results': validation_results,
-                'synthetic_data_quality_score': final_scores,
-                'data_info': {
-                    'real_data_shape': real_df.shape,
-                    'synthetic_data_shape': synthetic_df.shape,
-                    'columns': list(real_df.columns)
-                }
-            })
+        payload = {
+            'status': 'success',
+            'validation_id': validation_id,
+            'validation_results': (summarize_results(validation_results)
+                                   if response_mode == 'compact' else validation_results),
+            'synthetic_data_quality_score': final_scores,
+            'pipeline_metadata': pipeline_metadata,
+            'human_review': review_context,
+            'data_info': {
+                'real_data_shape': real_df.shape,
+                'synthetic_data_shape': synthetic_df.shape,
+                'columns': list(real_df.columns)
+            }
+        }
+        if response_mode == 'stream':
+            return StreamingResponse(iter_json(payload), media_type='application/json')
+        return Response(content=dumps(payload), media_type='application/json')
 
     except Exception as e:
+        if validation_id is not None:
+            audit_logger.log_validation_failure(validation_id, str(e), dataset_id=dataset_id)
         raise HTTPException(status_code=500,
                             detail=f"Validation error: {str(e)}")
 
 
+@app.get("/audit/events")
+async def query_audit_events(validation_id: Optional[str] = None,
+                             event_type: Optional[str] = None,
+                             dataset_id: Optional[str] = None,
+                             start_time: Optional[str] = None,
+                             end_time: Optional[str] = None,
+                             since_days: Optional[float] = None,
+                             min_privacy_risk: Optional[float] = None,
+                             max_privacy_risk: Optional[float] = None,
+                             min_fidelity: Optional[float] = None,
+                             max_fidelity: Optional[float] = None,
+                             min_quality: Optional[float] = None,
+                             max_quality: Optional[float] = None,
+                             limit: int = 100,
+                             cursor: Optional[int] = None):
+    """
+    Query stored audit events with pagination.
+    
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page.
+    """
+    if since_days is not None and start_time is None:
+        start_time = (datetime.datetime.utcnow()
+                      - datetime.timedelta(days=since_days)).isoformat()
+
+    return audit_store.query(validation_id=validation_id, event_type=event_type,
+                             dataset_id=dataset_id, start_time=start_time,
+                             end_time=end_time, min_privacy_risk=min_privacy_risk,
+                             max_privacy_risk=max_privacy_risk,
+                             min_fidelity=min_fidelity, max_fidelity=max_fidelity,
+                             min_quality=min_quality, max_quality=max_quality,
+                             limit=limit, cursor=cursor)
+
+
+@app.post("/audit/retention")
+async def run_audit_retention(max_age_days: float):
+    """Delete audit events older than ``max_age_days`` and compact the store."""
+    return audit_store.run_retention_job(max_age_days)
+
+
+@app.get("/review/next")
+async def next_review_case(reviewer_id: str):
+    """Claim the highest-priority pending review case."""
+    case = review_queue.next_case(reviewer_id)
+    if case is None:
+        return {'case': None, 'message': 'No pending review cases'}
+    return {'case': case}
+
+
+@app.post("/review/{case_id}/resolve")
+async def resolve_review_case(case_id: int, decision: str, notes: str = ""):
+    """Record a reviewer decision and write it to the audit trail."""
+    case = review_queue.resolve(case_id, decision, notes, audit_logger=audit_logger)
+    if case is None:
+        raise HTTPException(status_code=404,
+                            detail=f"Review case {case_id} not found or already resolved")
+    return {'case': case}
+
+
+@app.get("/review/stats")
+async def review_queue_stats():
+    return review_queue.stats()
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe. The first call starts the warm-up (validator imports plus
+    a tiny validation run) in the background; until it finishes the probe
+    answers 503 with "warming_up" (or "failed" with the error, retried on the
+    next call), so load balancers keep traffic away from the replica.
+    """
+    state = start_warm_up()
+    if state['ready']:
+        status = "ready"
+    elif state['error']:
+        status = "failed"
+    else:
+        status = "warming_up"
+    return JSONResponse(status_code=200 if state['ready'] else 503, content={
+        "status": status,
+        "startup_mode": STARTUP_MODE,
+        "warmup": state['report'],
+        "error": state['error']
+    })
+
+
 @app.get("/health")
 async def health_check():
     return {
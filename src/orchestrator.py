@@ -3,58 +3,423 @@
 Validation orchestrator that routes data through validation pipelines.
 """
 
+import os
+import time
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
-from src.validator_modules.fidelity import FidelityValidator
-from src.validator_modules.task_utility import TaskUtilityValidator
-from src.validator_modules.bias_check import BiasValidator
-from src.validator_modules.privacy_risk import PrivacyRiskValidator
-from src.validator_modules.causal_consistency import CausalConsistencyValidator
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+from src.result_cache import ResultCache, hash_dataframe
+from src.reference_profile import ReferenceProfile
+from src.encoding import encode_datasets
+from src.planner import ValidationPlanner
+from src.shared_reference import SharedReferenceStore
+from src.data_transport import SharedArrayTransport, run_in_worker
+from src.segmentation import SegmentedValidator
+from src.validator_modules.registry import (
+    PREPARATION_STAGES, PipelineContext, get_validator_spec, registered_validators
+)
+
+# Gated mode: cheap checks that decide whether expensive validators run
+GATE_VALIDATORS = ('fidelity', 'exact_copy')
+DEFAULT_GATE_THRESHOLDS = {
+    'min_fidelity_score': 0.3,
+    'max_exact_copy_rate': 0.05
+}
 
 class ValidationOrchestrator:
-    def __init__(self):
-        self.validators = {
-            'fidelity': FidelityValidator(),
-            'task_utility': TaskUtilityValidator(),
-            'bias_check': BiasValidator(),
-            'privacy_risk': PrivacyRiskValidator(),
-            'causal_consistency': CausalConsistencyValidator()
-        }
+    def __init__(self, cache: Optional[ResultCache] = None, max_reference_profiles: int = 8,
+                 max_workers: Optional[int] = None,
+                 shared_store: Optional[SharedReferenceStore] = None,
+                 process_workers: int = 0, planner: Optional[ValidationPlanner] = None):
+        self.cache = cache
+        # In multi-worker deployments reference profiles are memory-mapped from a shared store
+        self.shared_store = shared_store
+        # With process_workers > 0, validators that support it run in a process
+        # pool and read the encoded matrices from shared memory
+        self.process_workers = process_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.max_reference_profiles = max_reference_profiles
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        # Chooses exact/sampled/sketch variants when a latency budget is configured
+        self.planner = planner or ValidationPlanner(max_workers=self.max_workers)
+        self._reference_profiles: "OrderedDict[str, ReferenceProfile]" = OrderedDict()
+        self._profile_lock = threading.Lock()
+        self.incremental_sessions: Dict[str, Any] = {}
+        self.stream_monitors: Dict[str, Any] = {}
+        # Validator instances are created (and their modules imported) on first use
+        self.validators: Dict[str, Any] = {}
+        self._validator_lock = threading.Lock()
+    
+    def get_validator(self, name: str):
+        """Return the validator instance for ``name``, importing it lazily."""
+        with self._validator_lock:
+            if name not in self.validators:
+                spec = get_validator_spec(name)
+                if spec is None:
+                    raise KeyError(f"Unknown validator: {name}")
+                self.validators[name] = spec.load_class()()
+            return self.validators[name]
+    
+    def get_reference_profile(self, real_data: pd.DataFrame,
+                              key: Optional[str] = None) -> ReferenceProfile:
+        """Return the cached ReferenceProfile for ``real_data``, building it if needed.
+        
+        With a shared store the profile (and its ``real_data``) is attached
+        from the store, publishing it first if no worker has done so yet.
+        """
+        key = key or hash_dataframe(real_data)
+        with self._profile_lock:
+            profile = self._reference_profiles.get(key)
+            if profile is None:
+                if self.shared_store is not None:
+                    profile = self.shared_store.get_or_publish(key, real_data)
+                else:
+                    profile = ReferenceProfile(real_data)
+                self._remember_profile(key, profile)
+            else:
+                self._reference_profiles.move_to_end(key)
+            return profile
+    
+    def get_shared_reference(self, key: str) -> Optional[ReferenceProfile]:
+        """Attach a reference already published to the shared store by ``key``."""
+        with self._profile_lock:
+            profile = self._reference_profiles.get(key)
+            if profile is None and self.shared_store is not None:
+                profile = self.shared_store.attach(key)
+                if profile is not None:
+                    self._remember_profile(key, profile)
+            return profile
+    
+    def _remember_profile(self, key: str, profile: ReferenceProfile) -> None:
+        self._reference_profiles[key] = profile
+        while len(self._reference_profiles) > self.max_reference_profiles:
+            self._reference_profiles.popitem(last=False)
     
     def run_validation_pipeline(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
-                               config: Dict[str, Any]) -> Dict[str, Any]:
-        """Run complete validation pipeline."""
-        results = {}
-        
-        # Fidelity validation
-        if 'fidelity' in config.get('validators', []):
-            results['fidelity'] = self.validators['fidelity'].validate(real_data, synthetic_data)
-        
-        # Task utility validation
-        if 'task_utility' in config.get('validators', []) and 'target_column' in config:
-            results['task_utility'] = self.validators['task_utility'].validate(
-                real_data, synthetic_data, config['target_column']
-            )
-        
-        # Bias check validation
-        if 'bias_check' in config.get('validators', []):
-            results['bias_check'] = self.validators['bias_check'].validate(
-                real_data, synthetic_data, 
-                config.get('protected_attributes', []),
-                config.get('target_column', '')
-            )
-        
-        # Privacy risk validation
-        if 'privacy_risk' in config.get('validators', []):
-            results['privacy_risk'] = self.validators['privacy_risk'].validate(real_data, synthetic_data)
-        
-        # Causal consistency validation
-        if 'causal_consistency' in config.get('validators', []):
-            results['causal_consistency'] = self.validators['causal_consistency'].validate(
-                real_data, synthetic_data,
-                config.get('treatment_column', ''),
-                config.get('outcome_column', ''),
-                config.get('causal_variables', [])
-            )
+                               config: Dict[str, Any],
+                               reference: Optional[ReferenceProfile] = None) -> Dict[str, Any]:
+        """Run complete validation pipeline.
+        
+        ``reference`` is an optional precomputed profile of ``real_data`` (see
+        ``get_reference_profile``) shared across runs against the same real data.
+        When a result cache is configured, identical (real, synthetic, config)
+        submissions are answered from the cache and the results carry a
+        ``pipeline_metadata['cache']`` entry describing the lookup.
+        """
+        if self.cache is None or not config.get('use_cache', True):
+            return self._run_validators(real_data, synthetic_data, config, reference)
+        
+        start_time = time.perf_counter()
+        cache_key = self.cache.make_key(real_data, synthetic_data, config)
+        cached = self.cache.get(cache_key)
+        
+        if cached is not None:
+            results, cache_info = cached
+        else:
+            results = self._run_validators(real_data, synthetic_data, config, reference)
+            self.cache.put(cache_key, results)
+            cache_info = {'hit': False, 'tier': None, 'age_seconds': 0.0}
+        
+        cache_info['key'] = cache_key
+        cache_info['elapsed_ms'] = (time.perf_counter() - start_time) * 1000
+        results.setdefault('pipeline_metadata', {})['cache'] = cache_info
+        return results
+    
+    def build_schedule(self, config: Dict[str, Any]) -> Dict[str, Set[str]]:
+        """Dependency graph (node -> prerequisite nodes) for the requested validators.
+        
+        Preparation stages become nodes of their own so that validators
+        sharing an input wait on a single computation of it. In gated mode a
+        ``gate`` node waits on the cheap gate validators and every expensive
+        validator waits on the gate.
+        """
+        requested = self._requested_validators(config)
+        graph: Dict[str, Set[str]] = {}
+        for name in registered_validators():
+            spec = get_validator_spec(name)
+            if name not in requested or not spec.is_configured(config):
+                continue
+            inputs = ('encoded_matrices',) if self._runs_in_process(spec) else spec.inputs
+            graph[name] = set(inputs) | {dep for dep in spec.depends_on if dep in requested}
+            for stage in inputs:
+                graph.setdefault(stage, set())
+        # A requested dependency that is not configured never runs; its dependents
+        # are reported as skipped instead of waiting on it forever
+        for name in [n for n in graph if get_validator_spec(n) is not None]:
+            graph[name] = {dep for dep in graph[name] if dep in graph or dep in PREPARATION_STAGES}
+        
+        if config.get('gated'):
+            graph['gate'] = {name for name in GATE_VALIDATORS if name in graph}
+            expensive = {name for name in graph if name in requested
+                         and get_validator_spec(name).expensive}
+            for name in expensive:
+                graph[name].add('gate')
+            # Defer the encoding when only gated validators consume it
+            consumers = {name for name, deps in graph.items() if 'encoded_matrices' in deps}
+            if consumers and consumers <= expensive:
+                graph['encoded_matrices'].add('gate')
+        if config.get('segment_by'):
+            # Per-segment metrics run alongside the whole-dataset validators
+            graph['segments'] = set()
+        return graph
+    
+    @staticmethod
+    def _requested_validators(config: Dict[str, Any]) -> List[str]:
+        requested = list(config.get('validators', []))
+        if config.get('gated'):
+            requested += [name for name in GATE_VALIDATORS if name not in requested]
+        return requested
+    
+    def _dependency_skip_reason(self, node: str, context: PipelineContext) -> Optional[str]:
+        """Why ``node`` cannot run because of a requested dependency, if it cannot."""
+        requested = self._requested_validators(context.config)
+        for dep in get_validator_spec(node).depends_on:
+            if dep not in requested:
+                continue
+            if dep not in context.results:
+                return f"dependency {dep} not configured"
+            if context.results[dep].get('skipped'):
+                return f"dependency {dep} skipped"
+        return None
+    
+    def _evaluate_gate(self, context: PipelineContext) -> Dict[str, Any]:
+        """Compare the cheap validators' results with the gate thresholds."""
+        thresholds = dict(DEFAULT_GATE_THRESHOLDS, **context.config.get('gate_thresholds', {}))
+        checks = {}
+        fidelity = context.results.get('fidelity', {}).get('fidelity_score')
+        if fidelity is not None:
+            checks['fidelity_score'] = {
+                'value': fidelity, 'threshold': thresholds['min_fidelity_score'],
+                'passed': bool(fidelity >= thresholds['min_fidelity_score'])
+            }
+        copy_rate = context.results.get('exact_copy', {}).get('exact_copy_rate')
+        if copy_rate is not None:
+            checks['exact_copy_rate'] = {
+                'value': copy_rate, 'threshold': thresholds['max_exact_copy_rate'],
+                'passed': bool(copy_rate <= thresholds['max_exact_copy_rate'])
+            }
+        failed = [name for name, check in checks.items() if not check['passed']]
+        return {'passed': not failed, 'failed_checks': failed, 'checks': checks}
+    
+    def _runs_in_process(self, spec) -> bool:
+        return self.process_workers > 0 and spec.process_target is not None
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._validator_lock:
+            if self._process_pool is None:
+                # Created from a worker thread: forking here could copy locks held by
+                # other threads into the child, so workers start from a fork server
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context('forkserver'))
+            return self._process_pool
+    
+    def shutdown(self) -> None:
+        """Stop the validator process pool, if one was started."""
+        with self._validator_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+    
+    def _prepare_reference_profile(self, context: PipelineContext,
+                                   reference: Optional[ReferenceProfile]) -> ReferenceProfile:
+        return reference if reference is not None else self.get_reference_profile(context.real_data)
+    
+    def _prepare_encoded_matrices(self, context: PipelineContext,
+                                  reference: Optional[ReferenceProfile]):
+        # A caller-supplied profile carries a reusable encoding of the real data
+        reference_encoding = reference.encoding() if reference is not None else None
+        return encode_datasets(context.real_data, context.synthetic_data,
+                               reference_encoding=reference_encoding,
+                               target_column=context.config.get('target_column'))
+    
+    def _execute_graph(self, graph: Dict[str, Set[str]], tasks: Dict[str, Callable[[], Any]],
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Run graph nodes on a thread pool as soon as their prerequisites finish."""
+        outputs: Dict[str, Any] = {}
+        remaining = {node: set(deps) for node, deps in graph.items()}
+        running = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            while remaining or running:
+                ready = [node for node, deps in remaining.items() if deps <= outputs.keys()]
+                for node in ready:
+                    del remaining[node]
+                    running[executor.submit(tasks[node])] = node
+                if not running:
+                    raise ValueError(f"Cyclic validator dependencies: {sorted(remaining)}")
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    outputs[running.pop(future)] = future.result()
+        
+        return outputs
+    
+    def _run_validators(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                        config: Dict[str, Any],
+                        reference: Optional[ReferenceProfile] = None) -> Dict[str, Any]:
+        """Run the configured validators without consulting the cache.
+        
+        With ``gated`` set in the config, fidelity and exact-copy checks run
+        first and expensive validators are reported as skipped when they fail
+        the ``gate_thresholds``; the gate outcome is in
+        ``pipeline_metadata['gate']``. With ``segment_by`` the fidelity, bias
+        and causal metrics are also reported per segment under ``segments``.
+        With ``latency_budget_seconds`` in the config the planner chooses a
+        variant per validator and the plan, with predicted and measured
+        times, is returned in ``pipeline_metadata['plan']``.
+        """
+        context = PipelineContext(real_data, synthetic_data, config)
+        graph = self.build_schedule(config)
+        plan = (self.planner.plan(real_data, synthetic_data, config)
+                if config.get('latency_budget_seconds') is not None else None)
+        variants = plan['validators'] if plan is not None else {}
+        process_nodes = {node for node in graph
+                         if get_validator_spec(node) is not None
+                         and variants.get(node, {}).get('variant', 'exact') == 'exact'
+                         and self._runs_in_process(get_validator_spec(node))}
         
+        # Shared memory for process-pool validators lives exactly as long as this run
+        with SharedArrayTransport() as transport:
+            def _stage_task(node: str) -> Callable[[], Any]:
+                def _run():
+                    if node == 'reference_profile':
+                        value = self._prepare_reference_profile(context, reference)
+                    elif node == 'gate':
+                        value = self._evaluate_gate(context)
+                    elif node == 'segments':
+                        return SegmentedValidator().validate(context.real_data, context.synthetic_data,
+                                                             context.config)
+                    elif node == 'encoded_matrices':
+                        if 'gate' in graph[node] and not context.inputs['gate']['passed']:
+                            value = None
+                        else:
+                            value = self._prepare_encoded_matrices(context, reference)
+                            if process_nodes:
+                                context.inputs['encoded_handle'] = transport.put_encoded(value)
+                    elif 'gate' in graph[node] and not context.inputs['gate']['passed']:
+                        value = {
+                            'skipped': True,
+                            'skip_reason': ("gate failed: "
+                                            + ", ".join(context.inputs['gate']['failed_checks'])),
+                            'failed_checks': context.inputs['gate']['failed_checks'],
+                            'validator_name': node
+                        }
+                        context.results[node] = value
+                        return value
+                    else:
+                        skip_reason = self._dependency_skip_reason(node, context)
+                        if skip_reason:
+                            value = {'skipped': True, 'skip_reason': skip_reason, 'validator_name': node}
+                            context.results[node] = value
+                            return value
+                        start = time.perf_counter()
+                        value = self._run_validator_node(node, context, variants.get(node),
+                                                         node in process_nodes)
+                        if node in variants:
+                            variants[node]['actual_seconds'] = time.perf_counter() - start
+                        context.results[node] = value
+                        return value
+                    context.inputs[node] = value
+                    return value
+                return _run
+            
+            outputs = self._execute_graph(graph, {node: _stage_task(node) for node in graph},
+                                          max_workers=plan['max_workers'] if plan else None)
+        
+        # Report results in registry order regardless of completion order
+        results = {name: outputs[name] for name in registered_validators() if name in outputs}
+        if 'segments' in outputs:
+            results['segments'] = outputs['segments']
+        if plan is not None:
+            results.setdefault('pipeline_metadata', {})['plan'] = plan
+        if 'gate' in outputs:
+            results.setdefault('pipeline_metadata', {})['gate'] = outputs['gate']
         return results
+    
+    def _run_validator_node(self, node: str, context: PipelineContext,
+                            step: Optional[Dict[str, Any]], in_process: bool) -> Dict[str, Any]:
+        """Run one validator in the variant chosen by the plan (exact by default)."""
+        spec = get_validator_spec(node)
+        variant = step['variant'] if step else 'exact'
+        
+        if variant == 'sampled':
+            value = dict(spec.runner(self.get_validator(node),
+                                     self._sampled_context(context, step['sample_rows'])))
+            value['approximation'] = {'variant': 'sampled', 'sample_rows': step['sample_rows']}
+            return value
+        if variant == 'sketch':
+            value = dict(spec.variants['sketch'](self.get_validator(node), context))
+            value['approximation'] = {'variant': 'sketch'}
+            return value
+        if in_process:
+            future = self._get_process_pool().submit(
+                run_in_worker, spec.process_target, context.inputs['encoded_handle'], context.config)
+            return future.result()
+        return spec.runner(self.get_validator(node), context)
+    
+    @staticmethod
+    def _sampled_context(context: PipelineContext, sample_rows: int) -> PipelineContext:
+        """Copy of ``context`` restricted to a fixed random sample of rows of each dataset."""
+        rng = np.random.default_rng(0)
+        real_rows = np.sort(rng.choice(len(context.real_data),
+                                       min(sample_rows, len(context.real_data)), replace=False))
+        synthetic_rows = np.sort(rng.choice(len(context.synthetic_data),
+                                            min(sample_rows, len(context.synthetic_data)), replace=False))
+        
+        sampled = PipelineContext(context.real_data.iloc[real_rows],
+                                  context.synthetic_data.iloc[synthetic_rows], context.config)
+        sampled.inputs = dict(context.inputs)
+        encoded = context.inputs.get('encoded_matrices')
+        if encoded is not None:
+            sampled.inputs['encoded_matrices'] = encoded.subset(real_rows, synthetic_rows)
+        return sampled
+    
+    def start_incremental_session(self, session_id: str, real_data: pd.DataFrame,
+                                  config: Dict[str, Any]):
+        """Create accumulators for a synthetic dataset that will grow by appends."""
+        from src.incremental import IncrementalValidationSession
+        
+        session = IncrementalValidationSession(self.get_reference_profile(real_data), config)
+        self.incremental_sessions[session_id] = session
+        return session
+    
+    def append_and_validate(self, session_id: str, new_rows: pd.DataFrame) -> Dict[str, Any]:
+        """Fold new synthetic rows into a session and return updated results."""
+        if session_id not in self.incremental_sessions:
+            raise KeyError(f"Unknown incremental session: {session_id}")
+        
+        session = self.incremental_sessions[session_id]
+        session.append(new_rows)
+        return session.validate()
+    
+    def end_incremental_session(self, session_id: str) -> None:
+        """Discard the accumulators of an incremental session."""
+        self.incremental_sessions.pop(session_id, None)
+    
+    def start_stream_monitor(self, stream_id: str, real_data: pd.DataFrame,
+                             config: Dict[str, Any], **options):
+        """Create a windowed drift monitor for a stream of synthetic records.
+        
+        ``options`` are passed to StreamingValidationMonitor (window_rows,
+        slide_rows, alert_thresholds, on_alert).
+        """
+        from src.streaming_monitor import StreamingValidationMonitor
+        
+        monitor = StreamingValidationMonitor(self.get_reference_profile(real_data), config, **options)
+        self.stream_monitors[stream_id] = monitor
+        return monitor
+    
+    def append_to_stream(self, stream_id: str, records) -> List[Dict[str, Any]]:
+        """Feed records to a stream monitor and return the reports of completed windows."""
+        if stream_id not in self.stream_monitors:
+            raise KeyError(f"Unknown stream monitor: {stream_id}")
+        return self.stream_monitors[stream_id].append(records)
+    
+    def end_stream_monitor(self, stream_id: str) -> None:
+        """Discard the sketches of a stream monitor."""
+        self.stream_monitors.pop(stream_id, None)
@@ -0,0 +1,191 @@
+"""
+Cost-model validation planner.
+Predicts each validator's running time from the shape of the data (rows,
+numeric/categorical columns, cardinalities) and, given a latency budget,
+downgrades the most expensive validators to sampled or sketch variants and
+picks the number of worker threads.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from src.validator_modules.registry import get_validator_spec, registered_validators
+
+# Seconds per unit of work, fitted on a 10-column table on a single core
+DEFAULT_COEFFICIENTS = {
+    'random_forest': 1.4e-7,      # per tree x row x log2(rows) x sqrt(features)
+    'sort': 2.8e-8,               # per row x log2(rows) x numeric column
+    'count': 5e-8,                # per row x column for hashing/bincount passes
+    'sketch': 1e-8,               # per row x column x log2(bins) for histogram sketches
+    'fourier': 8e-10,             # per row x random feature x (numeric columns + 1) for MMD
+    'permutation': 1.1e-7,        # per permutation x pooled row of the MMD null distribution
+    'overhead': 0.02              # fixed cost per validator run
+}
+
+# Default planning limits
+MIN_SAMPLE_ROWS = 1000
+RF_TREES = 100
+UTILITY_FOLDS = 5
+ENCODED_MAX_CATEGORIES = 50
+MMD_FEATURES = 256
+MMD_PERMUTATIONS = 200
+MMD_PERMUTATION_ROWS = 20000
+
+
+class DataShape:
+    """Row/column statistics the cost models are evaluated on."""
+
+    def __init__(self, n_real: int, n_synthetic: int, n_numeric: int,
+                 cardinalities: Dict[str, int]):
+        self.n_real = n_real
+        self.n_synthetic = n_synthetic
+        self.n_numeric = n_numeric
+        self.cardinalities = cardinalities
+
+    @classmethod
+    def from_data(cls, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                  cardinality_sample: int = 10000) -> "DataShape":
+        numeric = real_data.select_dtypes(include=[np.number]).columns
+        categorical = [c for c in real_data.columns if c not in numeric]
+        # Cardinalities are estimated on a prefix so planning stays O(sample)
+        head = real_data[categorical].head(cardinality_sample)
+        return cls(len(real_data), len(synthetic_data), len(numeric),
+                   {c: int(head[c].nunique()) for c in categorical})
+
+    @property
+    def n_categorical(self) -> int:
+        return len(self.cardinalities)
+
+    @property
+    def encoded_width(self) -> int:
+        return self.n_numeric + sum(min(c, ENCODED_MAX_CATEGORIES) for c in self.cardinalities.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'n_real': self.n_real,
+            'n_synthetic': self.n_synthetic,
+            'n_numeric': self.n_numeric,
+            'n_categorical': self.n_categorical,
+            'encoded_width': self.encoded_width
+        }
+
+
+class ValidationPlanner:
+    def __init__(self, coefficients: Optional[Dict[str, float]] = None, max_workers: int = 8):
+        self.coefficients = dict(DEFAULT_COEFFICIENTS, **(coefficients or {}))
+        self.max_workers = max_workers
+
+    def _random_forest(self, n_rows: float, n_features: int) -> float:
+        n_rows = max(n_rows, 2)
+        return (self.coefficients['random_forest'] * RF_TREES * n_rows * math.log2(n_rows)
+                * math.sqrt(max(n_features, 1)))
+
+    def estimate(self, name: str, variant: str, shape: DataShape,
+                 sample_rows: Optional[int] = None,
+                 config: Optional[Dict[str, Any]] = None) -> float:
+        """Predicted seconds for one validator variant on ``shape``.
+        
+        ``config`` switches on optional work such as fidelity's MMD test.
+        """
+        c = self.coefficients
+        n_real = min(shape.n_real, sample_rows) if sample_rows else shape.n_real
+        n_synthetic = min(shape.n_synthetic, sample_rows) if sample_rows else shape.n_synthetic
+        n_total = n_real + n_synthetic
+        n_columns = shape.n_numeric + shape.n_categorical
+
+        if name == 'fidelity':
+            if variant == 'sketch':
+                seconds = c['sketch'] * n_synthetic * shape.n_numeric * 8
+            else:
+                seconds = (c['sort'] * n_total * math.log2(max(n_total, 2)) * shape.n_numeric
+                           + c['count'] * n_total * shape.n_categorical)
+                if (config or {}).get('multivariate_test') and shape.n_numeric:
+                    # Real-side features are cached on the reference profile
+                    seconds += (c['fourier'] * n_synthetic * MMD_FEATURES * (shape.n_numeric + 1)
+                                + c['permutation'] * MMD_PERMUTATIONS
+                                * min(n_total, MMD_PERMUTATION_ROWS))
+        elif name == 'privacy_risk':
+            # Membership inference trains on 70% of the stacked encoded rows
+            seconds = (self._random_forest(0.7 * n_total, shape.encoded_width)
+                       + c['count'] * n_total * shape.encoded_width)
+        elif name == 'task_utility':
+            # One TRTR and one TSTR forest per fold
+            seconds = 2 * UTILITY_FOLDS * self._random_forest(0.8 * n_real, n_columns - 1)
+        elif name == 'joint_fidelity':
+            n_pairs = min(n_columns * (n_columns - 1) // 2, 2000)
+            seconds = c['count'] * n_total * (n_columns + n_pairs)
+        elif name == 'attribute_inference':
+            # Tree build over the synthetic rows, then k-neighbour queries per real row
+            seconds = (c['sort'] * n_synthetic * math.log2(max(n_synthetic, 2))
+                       + c['sort'] * n_real * math.log2(max(n_synthetic, 2)) * 5)
+        elif name in ('bias_check', 'causal_consistency'):
+            seconds = c['count'] * n_total * 2
+        else:
+            seconds = c['count'] * n_total * n_columns
+        return seconds + c['overhead']
+
+    @staticmethod
+    def wall_time(costs: List[float], workers: int) -> float:
+        """Rough makespan of independent tasks on ``workers`` threads."""
+        if not costs:
+            return 0.0
+        return max(max(costs), sum(costs) / max(workers, 1))
+
+    def _sample_rows_for(self, name: str, shape: DataShape, target_seconds: float) -> int:
+        """Largest row sample (per dataset) predicted to finish within ``target_seconds``."""
+        low, high = MIN_SAMPLE_ROWS, max(shape.n_real, shape.n_synthetic)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.estimate(name, 'sampled', shape, mid) <= target_seconds:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    def plan(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+             config: Dict[str, Any]) -> Dict[str, Any]:
+        """Choose a variant per requested validator and a degree of parallelism.
+
+        Without ``latency_budget_seconds`` in ``config`` every validator runs
+        exactly. Otherwise the validator with the largest predicted cost is
+        moved to its cheapest allowed variant until the predicted wall time
+        fits the budget or nothing more can be approximated.
+        """
+        shape = DataShape.from_data(real_data, synthetic_data)
+        requested = [name for name in registered_validators()
+                     if name in config.get('validators', [])]
+        workers = max(1, min(self.max_workers, len(requested)))
+        budget = config.get('latency_budget_seconds')
+
+        steps = {name: {'variant': 'exact', 'sample_rows': None,
+                        'predicted_seconds': self.estimate(name, 'exact', shape, config=config)}
+                 for name in requested}
+
+        if budget is not None:
+            remaining = [name for name in requested if get_validator_spec(name).variants]
+            while remaining and self.wall_time([s['predicted_seconds'] for s in steps.values()],
+                                               workers) > budget:
+                name = max(remaining, key=lambda n: steps[n]['predicted_seconds'])
+                remaining.remove(name)
+                variants = get_validator_spec(name).variants
+                if 'sketch' in variants:
+                    steps[name] = {'variant': 'sketch', 'sample_rows': None,
+                                   'predicted_seconds': self.estimate(name, 'sketch', shape)}
+                elif 'sampled' in variants:
+                    # Each worker gets an equal share of the budget
+                    share = budget * workers / max(len(requested), 1)
+                    sample_rows = self._sample_rows_for(name, shape, min(share, budget))
+                    if sample_rows < max(shape.n_real, shape.n_synthetic):
+                        steps[name] = {'variant': 'sampled', 'sample_rows': sample_rows,
+                                       'predicted_seconds': self.estimate(name, 'sampled', shape,
+                                                                          sample_rows)}
+
+        return {
+            'validators': steps,
+            'max_workers': workers,
+            'predicted_seconds': self.wall_time([s['predicted_seconds'] for s in steps.values()],
+                                                workers),
+            'latency_budget_seconds': budget,
+            'data_shape': shape.to_dict()
+        }
@@ -0,0 +1,119 @@
+"""
+Reference profile of a real dataset.
+Holds the real-side statistics validators need so they are computed once
+per real dataset instead of once per validation run.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Callable, List, Tuple, Optional
+from src.validator_modules.sketches import MomentSketch, GroupSumSketch, category_counts, row_hashes
+from src.encoding import ReferenceEncoding, fit_reference_encoding
+
+
+class ReferenceProfile:
+    def __init__(self, real_data: pd.DataFrame, n_bins: int = 256):
+        self.real_data = real_data
+        self.n_rows = len(real_data)
+        self.columns = list(real_data.columns)
+        self.numeric_columns = list(real_data.select_dtypes(include=[np.number]).columns)
+        self.categorical_columns = [c for c in self.columns if c not in self.numeric_columns]
+
+        numeric_values = real_data[self.numeric_columns].to_numpy(dtype=float, na_value=np.nan)
+        self.moments = MomentSketch(len(self.numeric_columns))
+        self.moments.update(numeric_values)
+
+        # Sorted non-missing values per numeric column, plus quantile bin edges
+        # with the exact real CDF at each edge for sketch-based comparisons
+        self.sorted_values: Dict[str, np.ndarray] = {}
+        self.bin_edges: Dict[str, np.ndarray] = {}
+        self.reference_cdf: Dict[str, np.ndarray] = {}
+        for j, column in enumerate(self.numeric_columns):
+            values = numeric_values[:, j]
+            values = np.sort(values[~np.isnan(values)])
+            if len(values) == 0:
+                continue
+            edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+            self.sorted_values[column] = values
+            self.bin_edges[column] = edges
+            self.reference_cdf[column] = np.searchsorted(values, edges, side='right') / len(values)
+
+        self._init_caches()
+
+    @classmethod
+    def from_precomputed(cls, real_data: pd.DataFrame, numeric_columns: List[str],
+                         moments: MomentSketch, sorted_values: Dict[str, np.ndarray],
+                         bin_edges: Dict[str, np.ndarray], reference_cdf: Dict[str, np.ndarray],
+                         encoding: Optional[ReferenceEncoding] = None) -> "ReferenceProfile":
+        """Rebuild a profile from arrays computed elsewhere (e.g. a shared reference store)."""
+        profile = cls.__new__(cls)
+        profile.real_data = real_data
+        profile.n_rows = len(real_data)
+        profile.columns = list(real_data.columns)
+        profile.numeric_columns = list(numeric_columns)
+        profile.categorical_columns = [c for c in profile.columns if c not in profile.numeric_columns]
+        profile.moments = moments
+        profile.sorted_values = sorted_values
+        profile.bin_edges = bin_edges
+        profile.reference_cdf = reference_cdf
+        profile._init_caches()
+        profile._encoding = encoding
+        return profile
+
+    def _init_caches(self) -> None:
+        self._group_sketches: Dict[Tuple[str, str], GroupSumSketch] = {}
+        self._correlation: Optional[pd.DataFrame] = None
+        self._encoding: Optional[ReferenceEncoding] = None
+        self._category_counts: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self._row_hashes: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._cached: Dict[Any, Any] = {}
+
+    def encoding(self) -> ReferenceEncoding:
+        """Numeric encoding of every real column, computed on first use."""
+        if self._encoding is None:
+            self._encoding = fit_reference_encoding(self.real_data)
+        return self._encoding
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Correlation matrix of the real data, computed on first use."""
+        if self._correlation is None:
+            self._correlation = self.real_data.corr(numeric_only=True)
+        return self._correlation
+
+    def category_counts(self, column: str) -> Tuple[pd.Index, np.ndarray]:
+        """Distinct values of a categorical column and their counts (memoized)."""
+        if column not in self._category_counts:
+            self._category_counts[column] = category_counts(self.real_data[column])
+        return self._category_counts[column]
+
+    def row_hashes(self, columns: List[str]) -> np.ndarray:
+        """Sorted row hashes of the real data over ``columns`` (memoized)."""
+        key = tuple(columns)
+        if key not in self._row_hashes:
+            self._row_hashes[key] = np.sort(row_hashes(self.real_data, list(columns)))
+        return self._row_hashes[key]
+
+    def cached(self, key: Any, builder: Callable[[], Any]) -> Any:
+        """Memoize a validator-specific real-side artefact under ``key``."""
+        if key not in self._cached:
+            self._cached[key] = builder()
+        return self._cached[key]
+
+    def group_sketch(self, group_column: str, value_column: str) -> Optional[GroupSumSketch]:
+        """Per-group counts/sums of ``value_column`` in the real data (memoized)."""
+        key = (group_column, value_column)
+        if key not in self._group_sketches:
+            if group_column not in self.real_data.columns or value_column not in self.real_data.columns:
+                return None
+            sketch = GroupSumSketch()
+            sketch.update(self.real_data[group_column], self.real_data[value_column])
+            self._group_sketches[key] = sketch
+        return self._group_sketches[key]
+
+    def summary(self) -> Dict[str, Any]:
+        """Short description of the profiled dataset."""
+        return {
+            'n_rows': self.n_rows,
+            'n_columns': len(self.columns),
+            'numeric_columns': self.numeric_columns
+        }
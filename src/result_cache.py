@@ -0,0 +1,193 @@
+"""
+Result cache for validation runs keyed by dataset content and configuration.
+"""
+
+import os
+import copy
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+# Config keys that do not influence validation results
+NON_RESULT_CONFIG_KEYS = {'dataset_id', 'use_cache'}
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """Content hash of a DataFrame's columns, dtypes and values.
+    
+    Categorical columns hash like their values (as the shared reference store
+    holds text columns as categoricals), so the dtype of the categories is used.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    hasher.update(json.dumps([str(t.categories.dtype) if isinstance(t, pd.CategoricalDtype) else str(t)
+                              for t in df.dtypes]).encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return hasher.hexdigest()
+
+
+def canonicalize_config(config: Dict[str, Any]) -> str:
+    """Stable JSON form of a validation config for cache keys."""
+    canonical = {k: v for k, v in config.items() if k not in NON_RESULT_CONFIG_KEYS}
+    if isinstance(canonical.get('validators'), list):
+        # The orchestrator runs validators in a fixed order regardless of list order
+        canonical['validators'] = sorted(canonical['validators'])
+    return json.dumps(canonical, sort_keys=True, default=str, separators=(',', ':'))
+
+
+class ResultCache:
+    """LRU + TTL cache of validation results with an optional on-disk tier."""
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 3600.0,
+                 disk_dir: Optional[str] = None, max_disk_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def make_key(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 config: Dict[str, Any]) -> str:
+        """Build a cache key from both dataset hashes and the canonical config."""
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(hash_dataframe(real_data).encode('utf-8'))
+        hasher.update(hash_dataframe(synthetic_data).encode('utf-8'))
+        hasher.update(canonicalize_config(config).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Return ``(results, cache_info)`` for a fresh entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, results = entry
+                if not self._is_expired(created_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(results), {
+                        'hit': True,
+                        'tier': 'memory',
+                        'age_seconds': time.time() - created_at
+                    }
+                del self._entries[key]
+
+        if self.disk_dir:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                created_at, results = entry
+                with self._lock:
+                    self._store_in_memory(key, created_at, results)
+                    self.hits += 1
+                return copy.deepcopy(results), {
+                    'hit': True,
+                    'tier': 'disk',
+                    'age_seconds': time.time() - created_at
+                }
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, results: Dict[str, Any]) -> None:
+        """Store results under ``key`` in memory and, if configured, on disk."""
+        created_at = time.time()
+        results = copy.deepcopy(results)
+        with self._lock:
+            self._store_in_memory(key, created_at, results)
+
+        if self.disk_dir:
+            tmp_path = self._disk_path(key) + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as handle:
+                    pickle.dump((created_at, results), handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError as e:
+                self.logger.warning(f"Could not write cache entry {key} to disk: {e}")
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Remove expired entry files, then the oldest beyond ``max_disk_entries``."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue  # removed by another worker
+        entries.sort()
+        # Files are written once at put() time, so mtime is the creation time
+        expired = [path for mtime, path in entries if self._is_expired(mtime)]
+        fresh = [path for mtime, path in entries if not self._is_expired(mtime)]
+        for path in expired + fresh[:max(len(fresh) - self.max_disk_entries, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _store_in_memory(self, key: str, created_at: float, results: Dict[str, Any]) -> None:
+        self._entries[key] = (created_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as handle:
+                created_at, results = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            self.logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+        if self._is_expired(created_at):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return created_at, results
+
+    def clear(self) -> None:
+        """Drop all cached entries from both tiers."""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit statistics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'max_disk_entries': self.max_disk_entries if self.disk_dir else None,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,307 @@
+"""
+Segmented (slice-wise) validation.
+Breaks fidelity, bias and causal metrics down by the values of one or more
+``segment_by`` columns. Every segment is labelled with an integer code once;
+per-segment statistics then come from grouped sorts, bincounts and
+contiguous slices instead of one pipeline run per segment.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple
+from src.validator_modules.sketches import frobenius_difference, structural_correlations
+
+# Segments with fewer rows than this on either side get no metrics
+MIN_SEGMENT_ROWS = 10
+
+
+def segment_codes(real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                  columns: List[str]) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+    """Segment id of every real and synthetic row and the column values of each segment."""
+    n_real = len(real_data)
+    key = np.zeros(n_real + len(synthetic_data), dtype=np.int64)
+    uniques = []
+    for column in columns:
+        # Missing values form a segment of their own
+        codes, values = pd.factorize(pd.concat([real_data[column], synthetic_data[column]],
+                                               ignore_index=True), use_na_sentinel=False)
+        key = key * len(values) + codes
+        uniques.append((column, codes, values))
+
+    # One sort of the combined key; ``first`` is each segment's first row
+    _, first, segment_ids = np.unique(key, return_index=True, return_inverse=True)
+    labels = [{column: values[codes[row]] for column, codes, values in uniques} for row in first]
+    return segment_ids[:n_real], segment_ids[n_real:], labels
+
+
+def grouped_ks(real_values: np.ndarray, real_groups: np.ndarray, synthetic_values: np.ndarray,
+               synthetic_groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Two-sample KS statistic per group from one sort by (group, value).
+
+    NaN values are ignored; groups empty on either side get NaN.
+    """
+    real_keep = ~np.isnan(real_values)
+    synthetic_keep = ~np.isnan(synthetic_values)
+    values = np.concatenate([real_values[real_keep], synthetic_values[synthetic_keep]])
+    groups = np.concatenate([real_groups[real_keep], synthetic_groups[synthetic_keep]])
+    is_real = np.concatenate([np.ones(real_keep.sum()), np.zeros(synthetic_keep.sum())])
+
+    n_real = np.bincount(groups, weights=is_real, minlength=n_groups)
+    n_synthetic = np.bincount(groups, minlength=n_groups) - n_real
+    result = np.full(n_groups, np.nan)
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, groups))
+    groups, values, is_real = groups[order], values[order], is_real[order]
+    starts = np.searchsorted(groups, np.arange(n_groups))
+
+    # Empirical CDFs within each group: running counts minus the count before the group
+    def _cdf(indicator: np.ndarray, totals: np.ndarray) -> np.ndarray:
+        running = np.cumsum(indicator)
+        before = np.concatenate([[0.0], running])[starts][groups]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (running - before) / totals[groups]
+
+    gap = np.abs(_cdf(is_real, n_real) - _cdf(1.0 - is_real, n_synthetic))
+    # Compare the CDFs only after the last of a run of tied values
+    last = np.concatenate([(groups[1:] != groups[:-1]) | (values[1:] != values[:-1]), [True]])
+    gap = np.where(last, gap, 0.0)
+
+    nonempty = np.flatnonzero(n_real + n_synthetic > 0)
+    result[nonempty] = np.maximum.reduceat(gap, starts[nonempty])
+    result[(n_real == 0) | (n_synthetic == 0)] = np.nan
+    return result
+
+
+def _grouped_distribution(values: pd.Series, groups: np.ndarray, categories: pd.Index,
+                          n_groups: int) -> np.ndarray:
+    """Per-group category frequencies (n_groups x n_categories); missing values ignored."""
+    codes = categories.get_indexer(values.astype(str))
+    known = values.notna().to_numpy() & (codes >= 0)
+    counts = np.bincount(groups[known] * len(categories) + codes[known],
+                         minlength=n_groups * len(categories)).reshape(n_groups, len(categories))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return counts / counts.sum(axis=1, keepdims=True)
+
+
+def _grouped_means(values: np.ndarray, keys: np.ndarray, n_keys: int) -> np.ndarray:
+    """Mean of ``values`` per integer key (NaN for empty keys or missing values)."""
+    keep = ~np.isnan(values)
+    sums = np.bincount(keys[keep], weights=values[keep], minlength=n_keys)
+    counts = np.bincount(keys[keep], minlength=n_keys)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sums / counts
+
+
+def _numeric(data: pd.DataFrame, column: str) -> np.ndarray:
+    return pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+class SegmentedValidator:
+    def __init__(self):
+        self.name = "Segmented Validator"
+        self.min_segment_rows = MIN_SEGMENT_ROWS
+
+    def _covariances(self, data: pd.DataFrame, groups: np.ndarray, columns: List[str],
+                     n_groups: int) -> np.ndarray:
+        """Pairwise-complete covariance of ``columns`` per group (n_groups x d x d).
+
+        Co-moment sums of the values and of their observed-indicators are
+        accumulated for all groups at once with one bincount per pair of rows.
+        """
+        d = len(columns)
+        # One contiguous row per column
+        values = np.vstack([_numeric(data, c) for c in columns]) if d else np.empty((0, len(data)))
+        observed = ~np.isnan(values)
+        # Centring on the column means keeps the raw-moment formula stable
+        means = np.where(observed, values, 0.0).sum(axis=1) / np.maximum(observed.sum(axis=1), 1)
+        # Indicator rows only for columns with missing values; complete ones share a row of ones
+        incomplete = np.flatnonzero(~observed.all(axis=1))
+        indicator = np.full(d, d + len(incomplete), dtype=int)
+        indicator[incomplete] = d + np.arange(len(incomplete))
+        stacked = np.vstack([np.where(observed, values - means[:, None], 0.0),
+                             observed[incomplete].astype(float), np.ones((1, len(data)))])
+
+        width = len(stacked)
+        sums = np.empty((n_groups, width, width))
+        for i, j in zip(*np.triu_indices(width)):
+            sums[:, i, j] = sums[:, j, i] = np.bincount(groups, weights=stacked[i] * stacked[j],
+                                                        minlength=n_groups)
+
+        # products: sum x_i x_j; partial[i, j]: sum of x_i where x_j is also observed;
+        # pairs: number of rows where both are observed
+        products = sums[:, :d, :d]
+        partial = sums[:, :d][:, :, indicator]
+        pairs = sums[:, indicator][:, :, indicator]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = (products - partial * partial.transpose(0, 2, 1) / pairs) / (pairs - 1)
+        covariance[pairs < 2] = np.nan
+        return covariance
+
+    @staticmethod
+    def _correlation(cov: np.ndarray) -> np.ndarray:
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cov / np.outer(std, std)
+
+    def fidelity(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame, real_groups: np.ndarray,
+                 synthetic_groups: np.ndarray, n_groups: int, columns: List[str],
+                 covariances: Tuple[np.ndarray, np.ndarray]) -> List[Dict[str, Any]]:
+        numeric = [c for c in columns if pd.api.types.is_numeric_dtype(real_data[c])]
+        categorical = [c for c in columns if c not in numeric]
+
+        ks = {c: grouped_ks(_numeric(real_data, c), real_groups, _numeric(synthetic_data, c),
+                            synthetic_groups, n_groups) for c in numeric}
+        tv = {}
+        for column in categorical:
+            categories = pd.Index(pd.unique(pd.concat([real_data[column], synthetic_data[column]])
+                                            .dropna().astype(str)))
+            p = _grouped_distribution(real_data[column], real_groups, categories, n_groups)
+            q = _grouped_distribution(synthetic_data[column], synthetic_groups, categories, n_groups)
+            tv[column] = 0.5 * np.abs(p - q).sum(axis=1)
+
+        results = []
+        for g in range(n_groups):
+            correlation_diff = (frobenius_difference(self._correlation(covariances[0][g]),
+                                                     self._correlation(covariances[1][g]))
+                                if len(numeric) > 1 else 0.0)
+            distances = [ks[c][g] for c in numeric] + [tv[c][g] for c in categorical]
+            distances = [d for d in distances if not np.isnan(d)]
+            mean_distance = float(np.mean(distances)) if distances else 0.0
+            results.append({
+                'fidelity_score': 1.0 / (1.0 + correlation_diff + mean_distance),
+                'correlation_diff': correlation_diff,
+                'ks_statistics': {c: float(ks[c][g]) for c in numeric},
+                'categorical_total_variation': {c: float(tv[c][g]) for c in categorical}
+            })
+        return results
+
+    def _parity_differences(self, data: pd.DataFrame, groups: np.ndarray, attribute: str,
+                            target_column: str, categories: pd.Index, n_groups: int) -> np.ndarray:
+        """Demographic Parity Difference of ``target_column`` over ``attribute`` per group."""
+        codes = categories.get_indexer(data[attribute].astype(str))
+        known = codes >= 0
+        rates = _grouped_means(_numeric(data, target_column)[known],
+                               groups[known] * len(categories) + codes[known],
+                               n_groups * len(categories)).reshape(n_groups, len(categories))
+        observed = ~np.isnan(rates)
+        spread = (np.where(observed, rates, -np.inf).max(axis=1)
+                  - np.where(observed, rates, np.inf).min(axis=1))
+        # Fewer than two groups means no disparity, as in BiasValidator
+        return np.where(observed.sum(axis=1) >= 2, spread, 0.0)
+
+    def bias(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame, real_groups: np.ndarray,
+             synthetic_groups: np.ndarray, n_groups: int, protected_attributes: List[str],
+             target_column: str) -> List[Dict[str, Any]]:
+        scores = {}
+        for attribute in protected_attributes:
+            if attribute not in real_data.columns or attribute not in synthetic_data.columns:
+                continue
+            categories = pd.Index(pd.unique(pd.concat([real_data[attribute], synthetic_data[attribute]])
+                                            .dropna().astype(str)))
+            scores[attribute] = np.abs(
+                self._parity_differences(real_data, real_groups, attribute, target_column,
+                                         categories, n_groups)
+                - self._parity_differences(synthetic_data, synthetic_groups, attribute, target_column,
+                                           categories, n_groups))
+        return [{
+            'overall_bias_score': float(np.mean([s[g] for s in scores.values()])) if scores else 0.0,
+            'attribute_bias_scores': {a: float(s[g]) for a, s in scores.items()}
+        } for g in range(n_groups)]
+
+    def _ate(self, data: pd.DataFrame, groups: np.ndarray, treatment_column: str,
+             outcome_column: str, n_groups: int) -> np.ndarray:
+        treatment = _numeric(data, treatment_column)
+        arm = np.where(treatment == 1, 1, np.where(treatment == 0, 0, -1))
+        keep = arm >= 0
+        means = _grouped_means(_numeric(data, outcome_column)[keep], groups[keep] * 2 + arm[keep],
+                               n_groups * 2).reshape(n_groups, 2)
+        return means[:, 1] - means[:, 0]
+
+    def causal(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame, real_groups: np.ndarray,
+               synthetic_groups: np.ndarray, n_groups: int, config: Dict[str, Any],
+               columns: List[str], covariances: Tuple[np.ndarray, np.ndarray]) -> List[Dict[str, Any]]:
+        treatment, outcome = config['treatment_column'], config['outcome_column']
+        delta_ate = np.abs(self._ate(real_data, real_groups, treatment, outcome, n_groups)
+                           - self._ate(synthetic_data, synthetic_groups, treatment, outcome, n_groups))
+        variables = config.get('causal_variables', [])
+
+        results = []
+        for g in range(n_groups):
+            real_structure = structural_correlations(covariances[0][g], columns, variables)
+            synthetic_structure = structural_correlations(covariances[1][g], columns, variables)
+            invariance = {var: abs(real_structure[var] - synthetic_structure[var])
+                          for var in real_structure if var in synthetic_structure}
+            finite = [v for v in invariance.values() if np.isfinite(v)]
+            delta = float(delta_ate[g])
+            results.append({
+                'causal_consistency_score': float(1.0 / (1.0 + (delta if np.isfinite(delta) else 0.0)
+                                                         + (np.mean(finite) if finite else 0.0))),
+                'delta_ate': delta,
+                'structural_invariance_scores': invariance
+            })
+        return results
+
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 config: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-segment fidelity, bias and causal metrics for the requested validators."""
+        try:
+            segment_by = config['segment_by']
+            segment_by = [segment_by] if isinstance(segment_by, str) else list(segment_by)
+            missing = [c for c in segment_by
+                       if c not in real_data.columns or c not in synthetic_data.columns]
+            if missing:
+                raise KeyError(f"Segment columns not in both datasets: {missing}")
+
+            real_groups, synthetic_groups, labels = segment_codes(real_data, synthetic_data, segment_by)
+            n_groups = len(labels)
+            columns = [c for c in real_data.columns if c in synthetic_data.columns and c not in segment_by]
+            numeric = [c for c in columns if pd.api.types.is_numeric_dtype(real_data[c])]
+            validators = config.get('validators', [])
+
+            metrics: Dict[str, List[Dict[str, Any]]] = {}
+            covariances = None
+            if 'fidelity' in validators or 'causal_consistency' in validators:
+                covariances = (self._covariances(real_data, real_groups, numeric, n_groups),
+                               self._covariances(synthetic_data, synthetic_groups, numeric, n_groups))
+            if 'fidelity' in validators:
+                metrics['fidelity'] = self.fidelity(real_data, synthetic_data, real_groups,
+                                                    synthetic_groups, n_groups, columns, covariances)
+            if 'bias_check' in validators and config.get('target_column'):
+                metrics['bias_check'] = self.bias(real_data, synthetic_data, real_groups,
+                                                  synthetic_groups, n_groups,
+                                                  config.get('protected_attributes', []),
+                                                  config['target_column'])
+            if ('causal_consistency' in validators and config.get('treatment_column')
+                    and config.get('outcome_column')):
+                metrics['causal_consistency'] = self.causal(real_data, synthetic_data, real_groups,
+                                                            synthetic_groups, n_groups, config,
+                                                            numeric, covariances)
+
+            n_real = np.bincount(real_groups, minlength=n_groups)
+            n_synthetic = np.bincount(synthetic_groups, minlength=n_groups)
+            segments = []
+            for g, label in enumerate(labels):
+                segment = {'segment': label, 'n_real': int(n_real[g]),
+                           'n_synthetic': int(n_synthetic[g])}
+                if min(n_real[g], n_synthetic[g]) < self.min_segment_rows:
+                    segment['insufficient_rows'] = True
+                else:
+                    segment.update({name: values[g] for name, values in metrics.items()})
+                segments.append(segment)
+
+            return {
+                'segment_by': segment_by,
+                'n_segments': n_groups,
+                'segments': segments,
+                'validator_name': self.name
+            }
+        except Exception as e:
+            print(f"Error in segmented validation: {e}")
+            return {
+                'segment_by': config.get('segment_by'),
+                'segments': [],
+                'error': str(e),
+                'validator_name': self.name
+            }
@@ -0,0 +1,112 @@
+"""
+JSON serialization of validation results.
+Handles NumPy scalars and arrays natively, writes non-finite floats (such as
+an ``inf`` correlation difference) as null, and uses orjson when installed.
+Results can be sent in full, as a compact summary, or streamed in chunks.
+"""
+
+import json
+import math
+import datetime
+import numpy as np
+from typing import Any, Dict, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Streamed responses are flushed in chunks of roughly this many bytes
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert ``value`` to plain JSON types (non-finite floats become None)."""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return to_jsonable(value)
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize ``value`` to compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            # orjson writes NaN/inf as null and handles numpy natively
+            return orjson.dumps(value, default=_orjson_default,
+                                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. non-contiguous arrays or integers beyond 64 bits
+            pass
+    return json.dumps(to_jsonable(value), separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def summarize_results(validation_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the scalar entries of each validator's results.
+
+    Per-column detail (dicts and lists such as ``ks_test_results``) is
+    dropped; the names of the omitted entries are listed under ``omitted``.
+    """
+    summary = {}
+    for name, results in validation_results.items():
+        if not isinstance(results, dict):
+            summary[name] = results
+            continue
+        scalars = {k: v for k, v in results.items() if not isinstance(v, (dict, list, tuple, np.ndarray))}
+        omitted = [k for k in results if k not in scalars]
+        if omitted:
+            scalars['omitted'] = omitted
+        summary[name] = scalars
+    return summary
+
+
+def iter_json(value: Any, max_depth: int = 3) -> Iterator[bytes]:
+    """Yield the JSON encoding of ``value`` in chunks.
+
+    Dicts and lists down to ``max_depth`` are written member by member, so
+    a report with thousands of per-column entries is never encoded as one
+    buffer. The concatenated output equals ``dumps(value)``.
+    """
+    buffer = bytearray()
+    for piece in _iter_pieces(value, max_depth):
+        buffer += piece
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _iter_pieces(value: Any, depth: int) -> Iterator[bytes]:
+    if depth > 0 and isinstance(value, dict):
+        yield b'{'
+        for i, (key, item) in enumerate(value.items()):
+            yield (b',' if i else b'') + dumps(str(key)) + b':'
+            yield from _iter_pieces(item, depth - 1)
+        yield b'}'
+    elif depth > 0 and isinstance(value, (list, tuple)):
+        yield b'['
+        for i, item in enumerate(value):
+            if i:
+                yield b','
+            yield from _iter_pieces(item, depth - 1)
+        yield b']'
+    else:
+        yield dumps(value)
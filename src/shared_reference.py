@@ -0,0 +1,168 @@
+"""
+Shared reference store for multi-worker deployments.
+Parsed real datasets, their reference profiles and encoded matrices are
+written once as .npy files under a shared directory (ideally a tmpfs such as
+/dev/shm) and memory-mapped read-only by every API worker and validator
+process, so the operating system keeps a single copy in its page cache.
+"""
+
+import os
+import re
+import json
+import uuid
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, List
+from src.reference_profile import ReferenceProfile
+from src.encoding import ReferenceEncoding
+from src.validator_modules.sketches import MomentSketch
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+# Keys are hash_dataframe digests; anything else (e.g. "../") must not reach a path
+KEY_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+class SharedReferenceStore:
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def is_valid_key(key: str) -> bool:
+        return isinstance(key, str) and KEY_PATTERN.fullmatch(key) is not None
+
+    def _path(self, key: str, *parts: str) -> str:
+        if not self.is_valid_key(key):
+            raise ValueError(f"Invalid shared reference key: {key!r}")
+        return os.path.join(self.root_dir, key, *parts)
+
+    def contains(self, key: str) -> bool:
+        return self.is_valid_key(key) and os.path.exists(self._path(key, MANIFEST_FILE))
+
+    def keys(self) -> List[str]:
+        """Keys of every published reference."""
+        return sorted(name for name in os.listdir(self.root_dir) if self.contains(name))
+
+    def publish(self, key: str, real_data: pd.DataFrame,
+                profile: Optional[ReferenceProfile] = None) -> None:
+        """Write ``real_data`` with its profile and encoding under ``key``.
+
+        Files are written to a private directory and renamed into place, so
+        workers never see a partial reference; if another worker published
+        the same key first its copy is kept.
+        """
+        target_dir = self._path(key)
+        if self.contains(key):
+            return
+        profile = profile if profile is not None else ReferenceProfile(real_data)
+        encoding = profile.encoding()
+
+        tmp_dir = os.path.join(self.root_dir, f".tmp-{key}-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            columns = []
+            for i, column in enumerate(real_data.columns):
+                series = real_data[column]
+                if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+                    np.save(os.path.join(tmp_dir, f"column_{i}.npy"), series.to_numpy())
+                    columns.append({'name': column, 'kind': 'array'})
+                else:
+                    # Text columns are stored as integer codes over their categories
+                    codes, categories = pd.factorize(series)
+                    np.save(os.path.join(tmp_dir, f"column_{i}.npy"), codes)
+                    columns.append({'name': column, 'kind': 'categorical',
+                                    'categories': [str(c) for c in categories],
+                                    'dtype': str(series.dtype)})
+
+            profiled = list(profile.sorted_values)
+            for j, column in enumerate(profiled):
+                np.save(os.path.join(tmp_dir, f"sorted_{j}.npy"), profile.sorted_values[column])
+                np.save(os.path.join(tmp_dir, f"edges_{j}.npy"), profile.bin_edges[column])
+                np.save(os.path.join(tmp_dir, f"cdf_{j}.npy"), profile.reference_cdf[column])
+            np.save(os.path.join(tmp_dir, 'moments_mean.npy'), profile.moments.mean)
+            np.save(os.path.join(tmp_dir, 'moments_comoment.npy'), profile.moments.comoment)
+            np.save(os.path.join(tmp_dir, 'encoded_real.npy'), encoding.real)
+
+            manifest = {
+                'n_rows': len(real_data),
+                'columns': columns,
+                'numeric_columns': profile.numeric_columns,
+                'profiled_columns': profiled,
+                'moments_count': profile.moments.count,
+                'encoding': {
+                    'feature_names': encoding.feature_names,
+                    'columns': encoding.columns,
+                    'numeric_fill': [[c, v] for c, v in encoding.numeric_fill.items()],
+                    'vocabularies': [[c, v] for c, v in encoding.vocabularies.items()]
+                }
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, default=str)
+
+            os.rename(tmp_dir, target_dir)
+        except OSError:
+            if not self.contains(key):
+                raise
+            logger.info("Shared reference %s was published by another worker", key)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def attach(self, key: str) -> Optional[ReferenceProfile]:
+        """Memory-map a published reference; returns None if ``key`` is unknown."""
+        if not self.contains(key):
+            return None
+        with open(self._path(key, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        def _load(name: str) -> np.ndarray:
+            return np.load(self._path(key, name), mmap_mode='r')
+
+        data: Dict[Any, Any] = {}
+        for i, column in enumerate(manifest['columns']):
+            values = _load(f"column_{i}.npy")
+            if column['kind'] == 'categorical':
+                # Categories keep the text dtype of the original column so content hashes match
+                dtype = column.get('dtype')
+                categories = pd.Index(column['categories'],
+                                      dtype=dtype if dtype in ('object', 'str') else None)
+                values = pd.Categorical.from_codes(values, categories=categories)
+            data[column['name']] = values
+        # copy=False keeps each column backed by its mapped file
+        real_data = pd.DataFrame(data, copy=False)
+
+        moments = MomentSketch(len(manifest['numeric_columns']))
+        moments.count = manifest['moments_count']
+        moments.mean = _load('moments_mean.npy')
+        moments.comoment = _load('moments_comoment.npy')
+
+        profiled = manifest['profiled_columns']
+        encoding_manifest = manifest['encoding']
+        encoding = ReferenceEncoding(
+            real=_load('encoded_real.npy'),
+            feature_names=encoding_manifest['feature_names'],
+            columns=encoding_manifest['columns'],
+            numeric_fill=dict((c, v) for c, v in encoding_manifest['numeric_fill']),
+            vocabularies=dict((c, v) for c, v in encoding_manifest['vocabularies'])
+        )
+
+        return ReferenceProfile.from_precomputed(
+            real_data, manifest['numeric_columns'], moments,
+            sorted_values={c: _load(f"sorted_{j}.npy") for j, c in enumerate(profiled)},
+            bin_edges={c: _load(f"edges_{j}.npy") for j, c in enumerate(profiled)},
+            reference_cdf={c: _load(f"cdf_{j}.npy") for j, c in enumerate(profiled)},
+            encoding=encoding
+        )
+
+    def get_or_publish(self, key: str, real_data: pd.DataFrame) -> ReferenceProfile:
+        """Attach to ``key``, publishing ``real_data`` first if no worker has yet."""
+        if not self.contains(key):
+            self.publish(key, real_data)
+        return self.attach(key)
+
+    def remove(self, key: str) -> None:
+        """Delete a published reference; workers holding maps keep their view."""
+        shutil.rmtree(self._path(key), ignore_errors=True)
@@ -0,0 +1,206 @@
+"""
+Continuous drift monitoring of a synthetic data stream.
+Records are folded into fixed-size panes of mergeable sketches (moments,
+histograms, group sums and exact-copy counts) against a fixed reference
+profile. Every completed pane closes a window: tumbling windows are one pane,
+sliding windows merge the last few panes. Each window is scored with
+ScoreAggregator and alerts are raised when quality drops.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Union
+import numpy as np
+import pandas as pd
+from src.aggregator import ScoreAggregator
+from src.incremental import IncrementalValidationSession
+from src.reference_profile import ReferenceProfile
+from src.validator_modules.sketches import row_hashes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERT_THRESHOLDS = {
+    'min_quality_score': 0.7,      # absolute floor for the window quality score
+    'max_quality_drop': 0.1,       # allowed drop below the baseline (first) window
+    'max_exact_copy_rate': 0.05    # share of window rows copying a real row
+}
+
+
+class _Pane:
+    """Sketches of one contiguous run of ``slide_rows`` stream records.
+
+    Records are buffered as they arrive and folded into the sketches in one
+    vectorized pass when the pane is complete.
+    """
+
+    def __init__(self, reference: ReferenceProfile, config: Dict[str, Any], start_row: int):
+        self.session = IncrementalValidationSession(reference, config)
+        self.start_row = start_row
+        self.exact_copies = 0
+        # Dict records share one list; DataFrame slices are kept as frames, in arrival order
+        self.records: List[Dict[str, Any]] = []
+        self.frames: List[pd.DataFrame] = []
+        self.n_rows = 0
+
+    def add(self, records: Union[pd.DataFrame, List[Dict[str, Any]]]) -> None:
+        if isinstance(records, pd.DataFrame):
+            self._close_records()
+            self.frames.append(records)
+        else:
+            self.records.extend(records)
+        self.n_rows += len(records)
+
+    def _close_records(self) -> None:
+        if self.records:
+            self.frames.append(pd.DataFrame.from_records(self.records))
+            self.records = []
+
+    def flush(self) -> pd.DataFrame:
+        """Buffered records as one frame; the buffer is released."""
+        self._close_records()
+        frames, self.frames = self.frames, []
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+class StreamingValidationMonitor:
+    def __init__(self, reference: ReferenceProfile, config: Dict[str, Any],
+                 window_rows: int = 10000, slide_rows: Optional[int] = None,
+                 aggregator: Optional[ScoreAggregator] = None,
+                 alert_thresholds: Optional[Dict[str, float]] = None,
+                 on_alert: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_history: int = 1000):
+        """
+        ``slide_rows`` below ``window_rows`` gives sliding windows that
+        advance by ``slide_rows`` records; by default windows tumble.
+        ``window_rows`` must be a multiple of ``slide_rows``.
+        """
+        slide_rows = slide_rows or window_rows
+        if window_rows % slide_rows:
+            raise ValueError("window_rows must be a multiple of slide_rows")
+        self.reference = reference
+        self.config = config
+        self.window_rows = window_rows
+        self.slide_rows = slide_rows
+        self.aggregator = aggregator or ScoreAggregator()
+        self.alert_thresholds = dict(DEFAULT_ALERT_THRESHOLDS, **(alert_thresholds or {}))
+        self.on_alert = on_alert
+
+        # Columns hashed for exact-copy detection are fixed by the reference
+        self.copy_columns = list(reference.real_data.columns)
+        self.panes: deque = deque(maxlen=window_rows // slide_rows)
+        self.current = _Pane(reference, config, start_row=0)
+        self.n_records = 0
+        self.n_windows = 0
+        self.baseline_score: Optional[float] = None
+        self.windows: deque = deque(maxlen=max_history)
+        self.alerts: deque = deque(maxlen=max_history)
+
+    def append(self, records: Union[pd.DataFrame, Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Add stream records and return the reports of any windows they complete.
+
+        Records are buffered until a pane is full, then sketched in one
+        vectorized pass, so the cost per record is constant (amortized)
+        however the stream is batched.
+        """
+        if isinstance(records, dict):
+            records = [records]
+
+        reports = []
+        offset = 0
+        while offset < len(records):
+            take = min(self.slide_rows - self.current.n_rows, len(records) - offset)
+            self.current.add(records.iloc[offset:offset + take] if isinstance(records, pd.DataFrame)
+                             else records[offset:offset + take])
+            offset += take
+            self.n_records += take
+            if self.current.n_rows == self.slide_rows:
+                self._sketch_pane(self.current)
+                self.panes.append(self.current)
+                self.current = _Pane(self.reference, self.config, start_row=self.n_records)
+                if len(self.panes) == self.panes.maxlen:
+                    reports.append(self._close_window())
+        return reports
+
+    def _sketch_pane(self, pane: _Pane) -> None:
+        rows = pane.flush()
+        pane.session.append(rows)
+        if all(c in rows.columns for c in self.copy_columns):
+            synthetic_hashes = row_hashes(rows, self.copy_columns)
+            real_hashes = self.reference.row_hashes(self.copy_columns)
+            if len(real_hashes):
+                positions = np.minimum(np.searchsorted(real_hashes, synthetic_hashes), len(real_hashes) - 1)
+                pane.exact_copies = int(np.sum(real_hashes[positions] == synthetic_hashes))
+
+    def _window_session(self) -> IncrementalValidationSession:
+        if len(self.panes) == 1:
+            return self.panes[0].session
+        # Sliding windows: merging a fixed number of panes keeps the per-record cost constant
+        merged = IncrementalValidationSession(self.reference, self.config)
+        for pane in self.panes:
+            merged.merge(pane.session)
+        return merged
+
+    def _close_window(self) -> Dict[str, Any]:
+        results = self._window_session().validate()
+        results.pop('pipeline_metadata', None)
+        copies = sum(pane.exact_copies for pane in self.panes)
+        results['exact_copy'] = {
+            'exact_copy_rate': copies / self.window_rows,
+            'exact_copies': copies,
+            'validator_name': "Exact Copy Validator"
+        }
+
+        quality = self.aggregator.calculate_synthetic_data_quality_score(results)
+        score = quality['overall_synthetic_data_quality_score']
+        if self.baseline_score is None:
+            self.baseline_score = score
+
+        report = {
+            'window_index': self.n_windows,
+            'start_row': self.panes[0].start_row,
+            'end_row': self.n_records,
+            'validation_results': results,
+            'synthetic_data_quality_score': quality,
+            'alerts': self._check_alerts(score, results['exact_copy']['exact_copy_rate'])
+        }
+        self.n_windows += 1
+        self.windows.append(report)
+        for alert in report['alerts']:
+            alert = dict(alert, window_index=report['window_index'],
+                         start_row=report['start_row'], end_row=report['end_row'])
+            self.alerts.append(alert)
+            logger.warning("Stream alert in window %d: %s", report['window_index'], alert['message'])
+            if self.on_alert is not None:
+                self.on_alert(alert)
+        return report
+
+    def _check_alerts(self, score: float, copy_rate: float) -> List[Dict[str, Any]]:
+        thresholds = self.alert_thresholds
+        alerts = []
+        if score < thresholds['min_quality_score']:
+            alerts.append({'type': 'quality_below_threshold', 'value': score,
+                           'threshold': thresholds['min_quality_score'],
+                           'message': f"quality score {score:.3f} below {thresholds['min_quality_score']}"})
+        if self.baseline_score - score > thresholds['max_quality_drop']:
+            alerts.append({'type': 'quality_drop', 'value': score, 'baseline': self.baseline_score,
+                           'threshold': thresholds['max_quality_drop'],
+                           'message': f"quality score dropped from {self.baseline_score:.3f} to {score:.3f}"})
+        if copy_rate > thresholds['max_exact_copy_rate']:
+            alerts.append({'type': 'exact_copies', 'value': copy_rate,
+                           'threshold': thresholds['max_exact_copy_rate'],
+                           'message': f"{copy_rate:.1%} of window rows copy real records"})
+        return alerts
+
+    def status(self) -> Dict[str, Any]:
+        """Stream position, latest window scores and recent alerts."""
+        latest = self.windows[-1] if self.windows else None
+        return {
+            'records': self.n_records,
+            'windows': self.n_windows,
+            'window_rows': self.window_rows,
+            'slide_rows': self.slide_rows,
+            'pending_rows': self.current.n_rows,
+            'baseline_score': self.baseline_score,
+            'latest_window': latest,
+            'recent_alerts': list(self.alerts)[-20:]
+        }
@@ -0,0 +1,87 @@
+"""
+k-anonymity and l-diversity analysis module.
+Groups synthetic rows into equivalence classes by hashing their
+quasi-identifier values and measures class sizes and the diversity of
+sensitive attributes within each class, in one linear pass that also works
+chunk by chunk.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional
+from src.validator_modules.sketches import EquivalenceClassSketch
+
+class AnonymityValidator:
+    def __init__(self):
+        self.name = "Anonymity Validator"
+        self.k_threshold = 5
+        self.l_threshold = 2
+        # Rows hashed per batch in validate(); bounds the temporary hash arrays
+        self.chunk_rows = 1_000_000
+    
+    def summarize(self, sketch: EquivalenceClassSketch, k_threshold: Optional[int] = None,
+                  l_threshold: Optional[int] = None) -> Dict[str, Any]:
+        """k-anonymity and l-diversity figures from an equivalence-class sketch."""
+        k_threshold = k_threshold or self.k_threshold
+        l_threshold = l_threshold or self.l_threshold
+        sizes = sketch.class_sizes.to_numpy()
+        if len(sizes) == 0:
+            return {'anonymity_score': 1.0, 'k_anonymity': 0, 'n_equivalence_classes': 0,
+                    'l_diversity': {}, 'validator_name': self.name}
+        
+        below_k = sizes < k_threshold
+        records_below_k = float(sizes[below_k].sum() / sketch.count)
+        
+        l_diversity = {}
+        for attribute in sketch.sensitive_attributes:
+            distinct = sketch.distinct_values(attribute).to_numpy()
+            l_diversity[attribute] = {
+                'l': int(distinct.min()),
+                'mean_distinct_values': float(distinct.mean()),
+                'classes_below_l': float(np.mean(distinct < l_threshold))
+            }
+        
+        return {
+            'anonymity_score': 1.0 - records_below_k,
+            'k_anonymity': int(sizes.min()),
+            'n_equivalence_classes': int(len(sizes)),
+            'mean_class_size': float(sizes.mean()),
+            'records_below_k': records_below_k,
+            'unique_record_rate': float(sizes[sizes == 1].sum() / sketch.count),
+            'k_threshold': k_threshold,
+            'l_diversity': l_diversity,
+            'validator_name': self.name
+        }
+    
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame], quasi_identifiers: List[str],
+                        sensitive_attributes: Optional[List[str]] = None,
+                        k_threshold: Optional[int] = None,
+                        l_threshold: Optional[int] = None) -> Dict[str, Any]:
+        """Analyse a table given as DataFrame chunks, e.g. ``pd.read_csv(path, chunksize=...)``."""
+        sketch = EquivalenceClassSketch(quasi_identifiers, sensitive_attributes or [])
+        for chunk in chunks:
+            sketch.update(chunk)
+        return self.summarize(sketch, k_threshold, l_threshold)
+    
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 quasi_identifiers: List[str], sensitive_attributes: Optional[List[str]] = None,
+                 k_threshold: Optional[int] = None, l_threshold: Optional[int] = None) -> Dict[str, Any]:
+        """Main validation method for k-anonymity and l-diversity of the synthetic data."""
+        try:
+            missing = [c for c in list(quasi_identifiers) + list(sensitive_attributes or [])
+                       if c not in synthetic_data.columns]
+            if missing:
+                raise KeyError(f"Columns not in synthetic data: {missing}")
+            
+            chunks = (synthetic_data.iloc[start:start + self.chunk_rows]
+                      for start in range(0, len(synthetic_data), self.chunk_rows))
+            return self.validate_chunks(chunks, quasi_identifiers, sensitive_attributes,
+                                        k_threshold, l_threshold)
+        except Exception as e:
+            print(f"Error in anonymity analysis: {e}")
+            return {
+                'anonymity_score': 0.0,
+                'k_anonymity': 0,
+                'error': str(e),
+                'validator_name': self.name
+            }
@@ -0,0 +1,166 @@
+"""
+Attribute inference risk module.
+Simulates an attacker who knows the quasi-identifiers of a real record and
+guesses its sensitive attributes from the closest synthetic records. Real
+rows are matched on hashed quasi-identifier keys first; the rest are looked
+up in a neighbour index over the distinct synthetic quasi-identifier values,
+queried in fixed-size batches, so memory stays linear in rows.
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.neighbors import KDTree
+from typing import Dict, Any, List
+from src.validator_modules.sketches import row_hashes
+
+class AttributeInferenceValidator:
+    def __init__(self):
+        self.name = "Attribute Inference Validator"
+        self.batch_rows = 50000
+        self.n_jobs = os.cpu_count() or 1
+    
+    def _numeric_matrix(self, data: pd.DataFrame, columns: List[str], mean: np.ndarray,
+                        scale: np.ndarray) -> np.ndarray:
+        values = np.column_stack([pd.to_numeric(data[c], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                                  for c in columns])
+        values = np.where(np.isnan(values), mean, values)
+        return (values - mean) / scale
+    
+    def nearest_synthetic(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                          quasi_identifiers: List[str]) -> np.ndarray:
+        """Index of the closest synthetic row for every real row (-1 if none).
+        
+        Rows with identical quasi-identifiers are joined on their hash. Other
+        real rows get the nearest distinct synthetic value of the numeric
+        quasi-identifiers (in real standard deviations) among synthetic rows
+        with the same categorical ones.
+        """
+        numeric = [c for c in quasi_identifiers if pd.api.types.is_numeric_dtype(real_data[c])]
+        categorical = [c for c in quasi_identifiers if c not in numeric]
+        
+        # Distinct synthetic quasi-identifier combinations, by first occurrence
+        synthetic_keys = row_hashes(synthetic_data, quasi_identifiers)
+        representatives = np.flatnonzero(~pd.Series(synthetic_keys).duplicated().to_numpy())
+        matches = pd.Index(synthetic_keys[representatives]).get_indexer(
+            row_hashes(real_data, quasi_identifiers))
+        matches = np.where(matches >= 0, representatives[np.maximum(matches, 0)], -1)
+        
+        unmatched = np.flatnonzero(matches < 0)
+        if len(unmatched) == 0 or not numeric:
+            return matches
+        
+        real_numeric = real_data[numeric].apply(pd.to_numeric, errors='coerce')
+        mean = real_numeric.mean().fillna(0.0).to_numpy()
+        std = real_numeric.std().fillna(0.0).to_numpy()
+        scale = np.where(std > 0, std, 1.0)
+        
+        # Categorical values become a group coordinate far beyond any numeric distance
+        candidates = synthetic_data.iloc[representatives]
+        if categorical:
+            groups, group_keys = pd.factorize(row_hashes(candidates, categorical))
+            query_groups = pd.Index(group_keys).get_indexer(
+                row_hashes(real_data.iloc[unmatched], categorical))
+        else:
+            groups = np.zeros(len(candidates), dtype=np.intp)
+            query_groups = np.zeros(len(unmatched), dtype=np.intp)
+        points = self._numeric_matrix(candidates, numeric, mean, scale)
+        queries = self._numeric_matrix(real_data.iloc[unmatched], numeric, mean, scale)
+        reach = max(np.abs(points).max(initial=0.0), np.abs(queries).max(initial=0.0))
+        separation = 2 * np.sqrt(len(numeric)) * reach + 1
+        tree = KDTree(np.column_stack([points, groups * separation]))
+        
+        # Real rows whose categorical values never occur in the synthetic data stay unmatched
+        searchable = np.flatnonzero(query_groups >= 0)
+        queries = np.column_stack([queries, query_groups * separation])[searchable]
+        starts = range(0, len(queries), self.batch_rows)
+        
+        def _query(start: int) -> np.ndarray:
+            # Tree queries release the GIL, so batches share one index across threads
+            return tree.query(queries[start:start + self.batch_rows], k=1, return_distance=False)[:, 0]
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.n_jobs, len(starts)))) as executor:
+            nearest = list(executor.map(_query, starts))
+        if nearest:
+            matches[unmatched[searchable]] = representatives[np.concatenate(nearest)]
+        return matches
+    
+    def _categorical_risk(self, real_values: pd.Series, synthetic_values: pd.Series,
+                          synthetic_keys: np.ndarray, matches: np.ndarray) -> Dict[str, float]:
+        codes, categories = pd.factorize(synthetic_values.astype(str))
+        majority = np.bincount(codes[codes >= 0]).argmax() if (codes >= 0).any() else -1
+        
+        # Most common sensitive value among synthetic rows sharing each key
+        pairs = pd.DataFrame({'key': synthetic_keys, 'code': codes})
+        pairs = pairs[pairs['code'] >= 0].value_counts().reset_index().drop_duplicates('key')
+        guess_by_key = pd.Series(pairs['code'].to_numpy(), index=pairs['key'].to_numpy())
+        predicted = np.full(len(matches), majority)
+        matched = matches >= 0
+        predicted[matched] = guess_by_key.reindex(synthetic_keys[matches[matched]]).fillna(majority).to_numpy()
+        
+        truth = pd.Index(categories).get_indexer(real_values.astype(str))
+        known = real_values.notna().to_numpy()
+        if not known.any():
+            return {'inference_accuracy': 0.0, 'baseline_accuracy': 0.0, 'risk': 0.0}
+        accuracy = float(np.mean(predicted[known] == truth[known]))
+        # An attacker without quasi-identifiers guesses the most common synthetic value
+        baseline = float(np.mean(truth[known] == majority))
+        return {
+            'inference_accuracy': accuracy,
+            'baseline_accuracy': baseline,
+            'risk': max(0.0, (accuracy - baseline) / (1 - baseline)) if baseline < 1 else 0.0
+        }
+    
+    def _numeric_risk(self, real_values: pd.Series, synthetic_values: pd.Series,
+                      synthetic_keys: np.ndarray, matches: np.ndarray) -> Dict[str, float]:
+        synthetic = pd.to_numeric(synthetic_values, errors='coerce')
+        truth = pd.to_numeric(real_values, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        median = float(synthetic.median()) if synthetic.notna().any() else 0.0
+        
+        # Mean sensitive value among synthetic rows sharing each key
+        guess_by_key = synthetic.groupby(synthetic_keys, sort=False).mean()
+        predicted = np.full(len(matches), median)
+        matched = matches >= 0
+        predicted[matched] = guess_by_key.reindex(synthetic_keys[matches[matched]]).fillna(median).to_numpy()
+        
+        known = ~np.isnan(truth)
+        if not known.any():
+            return {'inference_mae': 0.0, 'baseline_mae': 0.0, 'risk': 0.0}
+        mae = float(np.mean(np.abs(predicted[known] - truth[known])))
+        # Baseline: always guess the synthetic median
+        baseline = float(np.mean(np.abs(median - truth[known])))
+        return {
+            'inference_mae': mae,
+            'baseline_mae': baseline,
+            'risk': max(0.0, 1 - mae / baseline) if baseline > 0 else 0.0
+        }
+    
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 quasi_identifiers: List[str], sensitive_attributes: List[str]) -> Dict[str, Any]:
+        """Main validation method for attribute inference risk."""
+        try:
+            matches = self.nearest_synthetic(real_data, synthetic_data, quasi_identifiers)
+            synthetic_keys = row_hashes(synthetic_data, quasi_identifiers)
+            
+            column_risks = {}
+            for attribute in sensitive_attributes:
+                values = real_data[attribute]
+                risk = (self._numeric_risk if pd.api.types.is_numeric_dtype(values)
+                        and not pd.api.types.is_bool_dtype(values) else self._categorical_risk)
+                column_risks[attribute] = risk(values, synthetic_data[attribute], synthetic_keys, matches)
+            
+            return {
+                'attribute_inference_risk': max((r['risk'] for r in column_risks.values()), default=0.0),
+                'matched_rate': float(np.mean(matches >= 0)) if len(matches) else 0.0,
+                'column_risks': column_risks,
+                'validator_name': self.name
+            }
+        except Exception as e:
+            print(f"Error in attribute inference attack: {e}")
+            return {
+                'attribute_inference_risk': 0.0,
+                'column_risks': {},
+                'error': str(e),
+                'validator_name': self.name
+            }
@@ -36,14 +36,18 @@ class BiasValidator:
             return 1.0  # Worst case bias
     
     def bias_score(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
-                  protected_attributes: List[str], target_column: str) -> Dict[str, float]:
+                  protected_attributes: List[str], target_column: str,
+                  reference=None) -> Dict[str, float]:
         """Calculate bias scores for protected attributes."""
         bias_scores = {}
         
         for attr in protected_attributes:
             if attr in real_data.columns and attr in synthetic_data.columns:
                 try:
-                    dpd_real = self.demographic_parity_difference(real_data, attr, target_column)
+                    if reference is not None:
+                        dpd_real = self._parity_from_sketch(reference.group_sketch(attr, target_column))
+                    else:
+                        dpd_real = self.demographic_parity_difference(real_data, attr, target_column)
                     dpd_synthetic = self.demographic_parity_difference(synthetic_data, attr, target_column)
                     
                     # Bias score: how much synthetic data preserves bias patterns
@@ -56,10 +60,21 @@ class BiasValidator:
         
         return bias_scores
     
+    def _parity_from_sketch(self, sketch) -> float:
+        """Demographic Parity Difference from precomputed per-group target sums."""
+        if sketch is None:
+            return 1.0  # Worst case bias
+        positive_rates = list(sketch.means().values())
+        if len(positive_rates) < 2:
+            return 0.0
+        return max(positive_rates) - min(positive_rates)
+    
     def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
-                protected_attributes: List[str], target_column: str) -> Dict[str, Any]:
+                protected_attributes: List[str], target_column: str,
+                reference=None) -> Dict[str, Any]:
         """Main validation method for bias checks."""
-        bias_scores = self.bias_score(real_data, synthetic_data, protected_attributes, target_column)
+        bias_scores = self.bias_score(real_data, synthetic_data, protected_attributes,
+                                      target_column, reference)
         
         # Calculate overall bias score
         overall_bias_score = np.mean(list(bias_scores.values())) if bias_scores else 0.0
@@ -26,10 +26,13 @@ class CausalConsistencyValidator:
             return 0.0
     
     def delta_ate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
-                  treatment_col: str, outcome_col: str) -> float:
+                  treatment_col: str, outcome_col: str, reference=None) -> float:
         """Calculate difference in ATE between real and synthetic data."""
         try:
-            ate_real = self.calculate_ate(real_data, treatment_col, outcome_col)
+            if reference is not None:
+                ate_real = self._ate_from_profile(reference, treatment_col, outcome_col)
+            else:
+                ate_real = self.calculate_ate(real_data, treatment_col, outcome_col)
             ate_synthetic = self.calculate_ate(synthetic_data, treatment_col, outcome_col)
             
             delta_ate = abs(ate_real - ate_synthetic)
@@ -39,6 +42,19 @@ class CausalConsistencyValidator:
             print(f"Error calculating Delta ATE: {e}")
             return float('inf')
     
+    def _ate_from_profile(self, reference, treatment_col: str, outcome_col: str) -> float:
+        """ATE from the reference profile's precomputed per-arm outcome sums."""
+        try:
+            sketch = reference.group_sketch(treatment_col, outcome_col)
+            if sketch is None:
+                return 0.0
+            means = sketch.means()
+            return means.get(1, np.nan) - means.get(0, np.nan)
+            
+        except Exception as e:
+            print(f"Error calculating ATE: {e}")
+            return 0.0
+    
     def structural_invariance_test(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
                                   variables: list) -> Dict[str, float]:
         """Test structural invariance between real and synthetic data."""
@@ -61,9 +77,11 @@ class CausalConsistencyValidator:
         return invariance_scores
     
     def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
-                treatment_col: str, outcome_col: str, variables: list) -> Dict[str, Any]:
+                treatment_col: str, outcome_col: str, variables: list,
+                reference=None) -> Dict[str, Any]:
         """Main validation method for causal consistency."""
-        delta_ate_score = self.delta_ate(real_data, synthetic_data, treatment_col, outcome_col)
+        delta_ate_score = self.delta_ate(real_data, synthetic_data, treatment_col,
+                                         outcome_col, reference)
         invariance_scores = self.structural_invariance_test(real_data, synthetic_data, variables)
         
         # Calculate overall causal consistency score
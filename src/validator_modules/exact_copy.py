@@ -0,0 +1,47 @@
+"""
+Exact copy detection module.
+Measures how many synthetic rows are verbatim copies of real rows using
+64-bit row hashes, a cheap first check for memorisation and leakage.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any
+from src.validator_modules.sketches import row_hashes
+
+class ExactCopyValidator:
+    def __init__(self):
+        self.name = "Exact Copy Validator"
+    
+    def exact_copy_mask(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                        reference=None) -> np.ndarray:
+        """Boolean mask of synthetic rows that also occur in the real data."""
+        columns = [c for c in real_data.columns if c in synthetic_data.columns]
+        if not columns or len(real_data) == 0 or len(synthetic_data) == 0:
+            return np.zeros(len(synthetic_data), dtype=bool)
+        
+        real_hashes = (reference.row_hashes(columns) if reference is not None
+                       else np.sort(row_hashes(real_data, columns)))
+        synthetic_hashes = row_hashes(synthetic_data, columns)
+        # Binary search into the sorted real hashes
+        positions = np.minimum(np.searchsorted(real_hashes, synthetic_hashes), len(real_hashes) - 1)
+        return real_hashes[positions] == synthetic_hashes
+    
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 reference=None) -> Dict[str, Any]:
+        """Main validation method for exact copy detection."""
+        try:
+            copies = self.exact_copy_mask(real_data, synthetic_data, reference)
+            return {
+                'exact_copy_rate': float(copies.mean()) if len(copies) else 0.0,
+                'exact_copies': int(copies.sum()),
+                'validator_name': self.name
+            }
+        except Exception as e:
+            print(f"Error in exact copy detection: {e}")
+            return {
+                'exact_copy_rate': 0.0,
+                'exact_copies': 0,
+                'error': str(e),
+                'validator_name': self.name
+            }
@@ -0,0 +1,159 @@
+"""
+Pairwise joint-distribution fidelity module.
+Bins every column once into small integer codes (real-data quantiles for
+numeric columns, top categories for categorical ones) and compares the 2D
+histograms of column pairs with block-wise bincounts.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Tuple
+from src.validator_modules.sketches import category_counts
+
+class JointFidelityValidator:
+    def __init__(self):
+        self.name = "Joint Fidelity Validator"
+        self.n_bins = 16
+        # Above this many pairs only the most dependent real pairs are compared
+        self.max_pairs = 2000
+        self.top_k = 10
+        # Upper bound on code-matrix elements handled per bincount block
+        self.block_elements = 1 << 24
+    
+    def fit_binning(self, real_data: pd.DataFrame, columns: List[str], reference=None) -> List[Tuple]:
+        """Per-column binning learned from the real data."""
+        binning = []
+        for column in columns:
+            values = real_data[column]
+            if pd.api.types.is_numeric_dtype(values):
+                # The profile holds np.number columns only; bools and the like are sorted here
+                sorted_values = (reference.sorted_values[column]
+                                 if reference is not None and column in reference.sorted_values
+                                 else np.sort(values.dropna().to_numpy(dtype=float)))
+                levels = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+                edges = (np.unique(np.quantile(sorted_values, levels)) if len(sorted_values)
+                         else np.array([]))
+                binning.append(('numeric', edges))
+            else:
+                categories, counts = category_counts(values)
+                top = categories[np.argsort(-counts, kind='stable')[:self.n_bins - 1]]
+                binning.append(('categorical', top))
+        return binning
+    
+    def apply_binning(self, data: pd.DataFrame, columns: List[str], binning: List[Tuple]) -> np.ndarray:
+        """Integer codes in ``[0, n_bins]``; ``n_bins`` marks missing values."""
+        codes = np.empty((len(data), len(columns)), dtype=np.int16)
+        for k, (column, (kind, spec)) in enumerate(zip(columns, binning)):
+            values = data[column]
+            if kind == 'numeric':
+                numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                codes[:, k] = np.searchsorted(spec, numeric, side='right')
+                codes[np.isnan(numeric), k] = self.n_bins
+            else:
+                indexer = spec.get_indexer(values.astype(str))
+                # Categories outside the top share the last regular bin
+                codes[:, k] = np.where(indexer >= 0, indexer, self.n_bins - 1)
+                codes[values.isna().to_numpy(), k] = self.n_bins
+        return codes
+    
+    def select_pairs(self, real_codes: np.ndarray) -> np.ndarray:
+        """All column pairs, or the ``max_pairs`` most dependent ones in the real data."""
+        n_columns = real_codes.shape[1]
+        i, j = np.triu_indices(n_columns, k=1)
+        if len(i) <= self.max_pairs:
+            return np.column_stack([i, j])
+        
+        # Correlation of the bin codes over observed values: missing entries are
+        # centred to zero so shared missingness does not rank a pair as dependent
+        missing = real_codes == self.n_bins
+        values = np.where(missing, 0.0, real_codes.astype(float))
+        means = values.sum(axis=0) / np.maximum((~missing).sum(axis=0), 1)
+        centered = np.where(missing, 0.0, values - means)
+        covariance = centered.T @ centered
+        scale = np.sqrt(np.diag(covariance))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dependence = np.abs(np.nan_to_num(covariance / np.outer(scale, scale)))
+        keep = np.argsort(-dependence[i, j], kind='stable')[:self.max_pairs]
+        return np.column_stack([i[keep], j[keep]])
+    
+    def _pair_histograms(self, codes: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+        """Normalized 2D histograms (pairs x K x K) from one bincount."""
+        n_codes = self.n_bins + 1
+        cells = n_codes * n_codes
+        joint = (codes[:, pairs[:, 0]].astype(np.int64) * n_codes + codes[:, pairs[:, 1]]
+                 + np.arange(len(pairs)) * cells)
+        counts = np.bincount(joint.ravel(), minlength=len(pairs) * cells)
+        return counts.reshape(len(pairs), n_codes, n_codes) / max(len(codes), 1)
+    
+    @staticmethod
+    def _mutual_information(joint: np.ndarray) -> np.ndarray:
+        outer = joint.sum(axis=2)[:, :, None] * joint.sum(axis=1)[:, None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.where(joint > 0, joint * np.log(joint / outer), 0.0)
+        return terms.sum(axis=(1, 2))
+    
+    def pairwise_distances(self, real_codes: np.ndarray, synthetic_codes: np.ndarray,
+                           pairs: np.ndarray) -> Dict[str, np.ndarray]:
+        """Total variation and mutual information per pair, computed in pair blocks."""
+        block = max(1, self.block_elements // max(len(real_codes), len(synthetic_codes), 1))
+        tv, mi_real, mi_synthetic = [], [], []
+        for start in range(0, len(pairs), block):
+            chunk = pairs[start:start + block]
+            p = self._pair_histograms(real_codes, chunk)
+            q = self._pair_histograms(synthetic_codes, chunk)
+            tv.append(0.5 * np.abs(p - q).sum(axis=(1, 2)))
+            mi_real.append(self._mutual_information(p))
+            mi_synthetic.append(self._mutual_information(q))
+        
+        def _join(parts: List[np.ndarray]) -> np.ndarray:
+            return np.concatenate(parts) if parts else np.array([])
+        return {'total_variation': _join(tv), 'mi_real': _join(mi_real),
+                'mi_synthetic': _join(mi_synthetic)}
+    
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 reference=None) -> Dict[str, Any]:
+        """Main validation method for pairwise joint fidelity."""
+        try:
+            columns = [c for c in real_data.columns if c in synthetic_data.columns]
+            if len(columns) < 2:
+                return {'joint_fidelity_score': 1.0, 'n_pairs_evaluated': 0, 'worst_pairs': [],
+                        'validator_name': self.name}
+            
+            def _fit():
+                binning = self.fit_binning(real_data, columns, reference)
+                return binning, self.apply_binning(real_data, columns, binning)
+            
+            # Real-side codes are reused across runs against the same reference
+            binning, real_codes = (reference.cached(('joint_fidelity', self.n_bins, tuple(columns)), _fit)
+                                   if reference is not None else _fit())
+            synthetic_codes = self.apply_binning(synthetic_data, columns, binning)
+            
+            pairs = self.select_pairs(real_codes)
+            distances = self.pairwise_distances(real_codes, synthetic_codes, pairs)
+            tv = distances['total_variation']
+            mi_difference = np.abs(distances['mi_real'] - distances['mi_synthetic'])
+            
+            worst = np.argsort(-tv, kind='stable')[:self.top_k]
+            return {
+                'joint_fidelity_score': float(1.0 - tv.mean()),
+                'mean_pair_total_variation': float(tv.mean()),
+                'max_pair_total_variation': float(tv.max()),
+                'mean_mutual_information_difference': float(mi_difference.mean()),
+                'n_pairs_evaluated': int(len(pairs)),
+                'n_pairs_total': len(columns) * (len(columns) - 1) // 2,
+                'worst_pairs': [{
+                    'columns': [columns[pairs[k, 0]], columns[pairs[k, 1]]],
+                    'total_variation': float(tv[k]),
+                    'mutual_information_real': float(distances['mi_real'][k]),
+                    'mutual_information_synthetic': float(distances['mi_synthetic'][k])
+                } for k in worst],
+                'validator_name': self.name
+            }
+        except Exception as e:
+            print(f"Error in joint fidelity validation: {e}")
+            return {
+                'joint_fidelity_score': 0.0,
+                'error': str(e),
+                'validator_name': self.name
+            }
+
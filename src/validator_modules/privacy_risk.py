@@ -1,29 +1,47 @@
 
 """
 Privacy risk assessment module.
-Implements membership inference attack and ROC AUC calculation.
+Implements membership inference attack and ROC AUC calculation, plus the
+propensity-score mean squared error (pMSE) distinguishability metric.
 """
 
 import pandas as pd
 import numpy as np
+from joblib import parallel_config
+from scipy import sparse
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
 from sklearn.metrics import roc_auc_score
 from typing import Dict, Any
+from src.encoding import encode_datasets
 
 class PrivacyRiskValidator:
     def __init__(self):
         self.name = "Privacy Risk Validator"
+        self.pmse_folds = 5
+        # Above this many stacked rows the propensity model switches to SGD
+        self.pmse_sgd_rows = 200000
     
-    def membership_inference(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame) -> float:
-        """Perform membership inference attack to assess privacy risk."""
+    def membership_inference(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                             encoded=None) -> float:
+        """Perform membership inference attack to assess privacy risk.
+        
+        ``encoded`` is an optional EncodedMatrices of both datasets; when given,
+        the attack trains on the shared numeric design matrix.
+        """
         try:
             # Create labels: 1 for real data, 0 for synthetic data
-            real_labels = np.ones(len(real_data))
-            synthetic_labels = np.zeros(len(synthetic_data))
+            n_real = len(encoded.real) if encoded is not None else len(real_data)
+            n_synthetic = len(encoded.synthetic) if encoded is not None else len(synthetic_data)
+            real_labels = np.ones(n_real)
+            synthetic_labels = np.zeros(n_synthetic)
             
             # Combine datasets
-            combined_data = pd.concat([real_data, synthetic_data], ignore_index=True)
+            if encoded is not None:
+                combined_data = encoded.combined()
+            else:
+                combined_data = pd.concat([real_data, synthetic_data], ignore_index=True)
             combined_labels = np.concatenate([real_labels, synthetic_labels])
             
             # Train membership inference model
@@ -47,6 +65,55 @@ class PrivacyRiskValidator:
             print(f"Error in membership inference attack: {e}")
             return 0.5  # Random guess baseline
     
+    def propensity_mse(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                       encoded=None) -> Dict[str, Any]:
+        """Propensity-score MSE of a logistic real-vs-synthetic classifier.
+        
+        Propensities are out-of-fold predictions from a stratified k-fold run
+        in parallel threads. ``pmse_ratio`` divides the pMSE by its expected
+        value when both datasets come from the same distribution, so ~1 means
+        indistinguishable.
+        """
+        try:
+            if encoded is None:
+                encoded = encode_datasets(real_data, synthetic_data)
+            n_real, n_synthetic = len(encoded.real), len(encoded.synthetic)
+            X = encoded.combined()
+            y = np.concatenate([np.zeros(n_real), np.ones(n_synthetic)])
+            
+            # Standardize numeric features; one-hot blocks stay 0/1 and sparse
+            numeric = [i for i, name in enumerate(encoded.feature_names) if '=' not in name]
+            if numeric:
+                block = X[:, numeric]
+                std = block.std(axis=0)
+                X[:, numeric] = (block - block.mean(axis=0)) / np.where(std > 0, std, 1.0)
+            X = sparse.csr_matrix(X)
+            
+            if len(y) > self.pmse_sgd_rows:
+                model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+            else:
+                model = LogisticRegression(solver='liblinear', max_iter=200)
+            folds = StratifiedKFold(n_splits=self.pmse_folds, shuffle=True, random_state=42)
+            # liblinear and SGD release the GIL, so folds run on threads without copies
+            with parallel_config(backend='threading'):
+                propensity = cross_val_predict(model, X, y, cv=folds, n_jobs=self.pmse_folds,
+                                               method='predict_proba')[:, 1]
+            
+            share = n_synthetic / len(y)
+            pmse = float(np.mean((propensity - share) ** 2))
+            # Null expectation (k - 1)(1 - c)^2 c / N with k = features + intercept
+            expected = X.shape[1] * (1 - share) ** 2 * share / len(y)
+            return {
+                'pmse': pmse,
+                'pmse_ratio': pmse / expected if expected > 0 else 0.0,
+                'propensity_auc': float(roc_auc_score(y, propensity))
+            }
+            
+        except Exception as e:
+            print(f"Error in propensity score estimation: {e}")
+            # No numbers: zeros would read as perfectly indistinguishable data
+            return {'pmse': None, 'pmse_ratio': None, 'propensity_auc': None, 'error': str(e)}
+    
     def privacy_risk_score(self, roc_auc: float) -> float:
         """Convert ROC AUC to privacy risk score."""
         # Higher AUC means higher privacy risk
@@ -54,14 +121,22 @@ class PrivacyRiskValidator:
         privacy_risk = max(0, (roc_auc - 0.5) * 2)
         return privacy_risk
     
-    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame) -> Dict[str, Any]:
+    def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame,
+                 encoded=None) -> Dict[str, Any]:
         """Main validation method for privacy risk assessment."""
-        roc_auc = self.membership_inference(real_data, synthetic_data)
+        roc_auc = self.membership_inference(real_data, synthetic_data, encoded)
         privacy_risk = self.privacy_risk_score(roc_auc)
+        propensity = self.propensity_mse(real_data, synthetic_data, encoded)
         
         return {
             'privacy_risk_score': privacy_risk,
             'membership_inference_auc': roc_auc,
+            **propensity,
             'privacy_level': 'High' if privacy_risk > 0.7 else 'Medium' if privacy_risk > 0.3 else 'Low',
             'validator_name': self.name
         }
+
+
+def run_encoded(encoded, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool runner working only from the shared encoded matrices."""
+    return PrivacyRiskValidator().validate(None, None, encoded=encoded)
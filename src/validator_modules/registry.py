@@ -0,0 +1,208 @@
+"""
+Validator registry.
+Validators are registered by name with the module path of their class, the
+shared preparation stages they consume and the config keys they require.
+Modules are imported only when a validator is first used.
+"""
+
+import importlib
+from typing import Dict, Any, Callable, Optional, Tuple, List
+
+# Shared preparation stages the orchestrator can compute once per run
+PREPARATION_STAGES = ('reference_profile', 'encoded_matrices')
+
+
+class PipelineContext:
+    """Inputs and intermediate outputs shared by the stages of one run."""
+
+    def __init__(self, real_data, synthetic_data, config: Dict[str, Any]):
+        self.real_data = real_data
+        self.synthetic_data = synthetic_data
+        self.config = config
+        self.inputs: Dict[str, Any] = {}
+        self.results: Dict[str, Any] = {}
+
+
+class ValidatorSpec:
+    def __init__(self, name: str, target: Optional[str] = None, validator_class: Optional[type] = None,
+                 inputs: Tuple[str, ...] = (), required_config: Tuple[str, ...] = (),
+                 depends_on: Tuple[str, ...] = (),
+                 runner: Optional[Callable[[Any, PipelineContext], Dict[str, Any]]] = None,
+                 process_target: Optional[str] = None,
+                 variants: Optional[Dict[str, Optional[Callable]]] = None,
+                 expensive: bool = False):
+        self.name = name
+        self.target = target
+        self.validator_class = validator_class
+        self.inputs = tuple(inputs)
+        self.required_config = tuple(required_config)
+        self.depends_on = tuple(depends_on)
+        self.runner = runner or (lambda validator, context: validator.validate_context(context))
+        # "module:function" taking (encoded, config), used when running in a process pool
+        self.process_target = process_target
+        # Approximate variants the planner may choose: 'sampled' (generic row
+        # sampling, value None) or 'sketch' (a runner of its own)
+        self.variants = dict(variants or {})
+        # Expensive validators wait for the cheap gate checks in gated mode
+        self.expensive = expensive
+
+    def load_class(self) -> type:
+        """Import the validator class on first use."""
+        if self.validator_class is None:
+            module_name, class_name = self.target.split(':')
+            self.validator_class = getattr(importlib.import_module(module_name), class_name)
+        return self.validator_class
+
+    def is_configured(self, config: Dict[str, Any]) -> bool:
+        """Whether ``config`` provides everything this validator needs."""
+        return all(key in config for key in self.required_config)
+
+
+_REGISTRY: Dict[str, ValidatorSpec] = {}
+
+
+def register_validator(name: str, target: Optional[str] = None, inputs: Tuple[str, ...] = (),
+                       required_config: Tuple[str, ...] = (), depends_on: Tuple[str, ...] = (),
+                       runner: Optional[Callable] = None, process_target: Optional[str] = None,
+                       variants: Optional[Dict[str, Optional[Callable]]] = None,
+                       expensive: bool = False):
+    """Register a validator by ``"module:Class"`` target, or use as a class decorator.
+
+    Decorated classes are run through ``validate_context(context)`` unless a
+    ``runner(validator, context)`` is supplied. Validators with a
+    ``process_target`` can be offloaded to the orchestrator's process pool,
+    where they only receive the shared encoded matrices and the config.
+    ``variants`` lists the approximate variants the planner may substitute
+    under a latency budget. ``expensive`` validators are skipped in gated
+    mode when the cheap checks fail.
+    """
+    unknown = set(inputs) - set(PREPARATION_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown preparation stages for {name}: {sorted(unknown)}")
+
+    if target is not None:
+        _REGISTRY[name] = ValidatorSpec(name, target=target, inputs=inputs,
+                                        required_config=required_config,
+                                        depends_on=depends_on, runner=runner,
+                                        process_target=process_target, variants=variants,
+                                        expensive=expensive)
+        return None
+
+    def decorator(cls: type) -> type:
+        _REGISTRY[name] = ValidatorSpec(name, validator_class=cls, inputs=inputs,
+                                        required_config=required_config,
+                                        depends_on=depends_on, runner=runner,
+                                        process_target=process_target, variants=variants,
+                                        expensive=expensive)
+        return cls
+    return decorator
+
+
+def unregister_validator(name: str) -> None:
+    _REGISTRY.pop(name, None)
+
+
+def get_validator_spec(name: str) -> Optional[ValidatorSpec]:
+    return _REGISTRY.get(name)
+
+
+def registered_validators() -> List[str]:
+    """Registered validator names in registration order."""
+    return list(_REGISTRY)
+
+
+def _run_fidelity(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              reference=context.inputs['reference_profile'],
+                              multivariate_test=context.config.get('multivariate_test', False))
+
+
+def _run_fidelity_sketch(validator, context: PipelineContext) -> Dict[str, Any]:
+    # KS and correlations from histogram/moment sketches against the reference profile
+    from src.incremental import IncrementalValidationSession
+
+    session = IncrementalValidationSession(context.inputs['reference_profile'],
+                                           {'validators': ['fidelity']})
+    session.append(context.synthetic_data)
+    results = session.validate()['fidelity']
+    results.pop('incremental', None)
+    return results
+
+
+def _run_task_utility(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              context.config['target_column'], context.config.get('task_type'),
+                              encoded=context.inputs['encoded_matrices'])
+
+
+def _run_bias_check(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              context.config.get('protected_attributes', []),
+                              context.config.get('target_column', ''),
+                              reference=context.inputs['reference_profile'])
+
+
+def _run_privacy_risk(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              encoded=context.inputs['encoded_matrices'])
+
+
+def _run_exact_copy(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              reference=context.inputs['reference_profile'])
+
+
+def _run_joint_fidelity(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              reference=context.inputs['reference_profile'])
+
+
+def _run_anonymity(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              context.config['quasi_identifiers'],
+                              context.config.get('sensitive_attributes', []),
+                              k_threshold=context.config.get('k_threshold'),
+                              l_threshold=context.config.get('l_threshold'))
+
+
+def _run_attribute_inference(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              context.config['quasi_identifiers'],
+                              context.config['sensitive_attributes'])
+
+
+def _run_causal_consistency(validator, context: PipelineContext) -> Dict[str, Any]:
+    return validator.validate(context.real_data, context.synthetic_data,
+                              context.config.get('treatment_column', ''),
+                              context.config.get('outcome_column', ''),
+                              context.config.get('causal_variables', []),
+                              reference=context.inputs['reference_profile'])
+
+
+register_validator('fidelity', 'src.validator_modules.fidelity:FidelityValidator',
+                   inputs=('reference_profile',), runner=_run_fidelity,
+                   variants={'sketch': _run_fidelity_sketch})
+register_validator('task_utility', 'src.validator_modules.task_utility:TaskUtilityValidator',
+                   inputs=('encoded_matrices',), required_config=('target_column',),
+                   runner=_run_task_utility,
+                   process_target='src.validator_modules.task_utility:run_encoded',
+                   variants={'sampled': None}, expensive=True)
+register_validator('bias_check', 'src.validator_modules.bias_check:BiasValidator',
+                   inputs=('reference_profile',), runner=_run_bias_check)
+register_validator('privacy_risk', 'src.validator_modules.privacy_risk:PrivacyRiskValidator',
+                   inputs=('encoded_matrices',), runner=_run_privacy_risk,
+                   process_target='src.validator_modules.privacy_risk:run_encoded',
+                   variants={'sampled': None}, expensive=True)
+register_validator('causal_consistency',
+                   'src.validator_modules.causal_consistency:CausalConsistencyValidator',
+                   inputs=('reference_profile',), runner=_run_causal_consistency)
+register_validator('exact_copy', 'src.validator_modules.exact_copy:ExactCopyValidator',
+                   inputs=('reference_profile',), runner=_run_exact_copy)
+register_validator('joint_fidelity', 'src.validator_modules.joint_fidelity:JointFidelityValidator',
+                   inputs=('reference_profile',), runner=_run_joint_fidelity)
+register_validator('anonymity', 'src.validator_modules.anonymity:AnonymityValidator',
+                   required_config=('quasi_identifiers',), runner=_run_anonymity)
+register_validator('attribute_inference',
+                   'src.validator_modules.attribute_inference:AttributeInferenceValidator',
+                   required_config=('quasi_identifiers', 'sensitive_attributes'),
+                   runner=_run_attribute_inference, variants={'sampled': None}, expensive=True)
@@ -0,0 +1,266 @@
+"""
+Mergeable summary sketches for incremental and windowed validation.
+Each sketch can be updated with a batch of new rows and merged with another
+sketch of the same shape, so statistics never need a full rescan.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Hashable, Tuple
+
+
+def category_counts(values: pd.Series) -> Tuple[pd.Index, np.ndarray]:
+    """Distinct non-missing values (as strings) and their counts."""
+    codes, categories = pd.factorize(values.dropna().astype(str))
+    return pd.Index(categories), np.bincount(codes, minlength=len(categories))
+
+
+def row_hashes(data: pd.DataFrame, columns: List[Hashable]) -> np.ndarray:
+    """64-bit hash of each row over ``columns``, insensitive to int/float and dtype differences."""
+    # Build from arrays on a fresh index; Series values would be realigned on the
+    # caller's index and hash as NaN for filtered or offset frames
+    normalized = pd.DataFrame({
+        column: (data[column].to_numpy(dtype=float, na_value=np.nan)
+                 if pd.api.types.is_numeric_dtype(data[column]) else data[column].astype(str).to_numpy())
+        for column in columns
+    }, index=pd.RangeIndex(len(data)))
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+class MomentSketch:
+    """Running count, mean vector and co-moment matrix over complete rows."""
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of rows (n x d); rows with missing values are skipped."""
+        values = np.asarray(values, dtype=float).reshape(-1, self.n_features)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            return
+
+        batch_mean = values.mean(axis=0)
+        deviations = values - batch_mean
+        self._combine(len(values), batch_mean, deviations.T @ deviations)
+
+    def merge(self, other: "MomentSketch") -> None:
+        """Fold another sketch over the same columns into this one."""
+        if other.count:
+            self._combine(other.count, other.mean, other.comoment)
+
+    def _combine(self, count: int, mean: np.ndarray, comoment: np.ndarray) -> None:
+        # Chan et al. pairwise update for means and co-moments
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance matrix."""
+        if self.count < 2:
+            return np.full((self.n_features, self.n_features), np.nan)
+        return self.comoment / (self.count - 1)
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation matrix (NaN for constant columns)."""
+        cov = self.covariance()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cov / np.outer(std, std)
+
+
+class HistogramSketch:
+    """Per-column counts over fixed bin edges, giving an empirical CDF at the edges."""
+
+    def __init__(self, bin_edges: List[np.ndarray]):
+        self.bin_edges = [np.asarray(edges, dtype=float) for edges in bin_edges]
+        self.counts = [np.zeros(len(edges) + 1, dtype=np.int64) for edges in self.bin_edges]
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of rows (n x d) column by column."""
+        values = np.asarray(values, dtype=float).reshape(-1, len(self.bin_edges))
+        for j, edges in enumerate(self.bin_edges):
+            column = values[:, j]
+            column = column[~np.isnan(column)]
+            # Bin k holds values in (edges[k-1], edges[k]]
+            bins = np.searchsorted(edges, column, side='left')
+            self.counts[j] += np.bincount(bins, minlength=len(edges) + 1)
+
+    def merge(self, other: "HistogramSketch") -> None:
+        """Add another sketch's counts (bin edges must match)."""
+        for j in range(len(self.counts)):
+            self.counts[j] += other.counts[j]
+
+    def totals(self) -> np.ndarray:
+        """Number of non-missing values seen per column."""
+        return np.array([counts.sum() for counts in self.counts])
+
+    def cdf_at_edges(self, column_index: int) -> np.ndarray:
+        """Fraction of values <= each bin edge for one column."""
+        counts = self.counts[column_index]
+        total = counts.sum()
+        if total == 0:
+            return np.zeros(len(self.bin_edges[column_index]))
+        return np.cumsum(counts)[:-1] / total
+
+
+class GroupSumSketch:
+    """Per-group row counts and value sums, e.g. positive rates or treatment arms."""
+
+    def __init__(self):
+        self.counts: Dict[Hashable, float] = {}
+        self.sums: Dict[Hashable, float] = {}
+
+    def update(self, groups: pd.Series, values: pd.Series) -> None:
+        """Add a batch of (group, value) pairs with one vectorized groupby."""
+        grouped = values.groupby(groups).agg(['count', 'sum'])
+        for group, count, total in zip(grouped.index, grouped['count'].to_numpy(),
+                                       grouped['sum'].to_numpy()):
+            self.counts[group] = self.counts.get(group, 0) + int(count)
+            self.sums[group] = self.sums.get(group, 0.0) + float(total)
+
+    def merge(self, other: "GroupSumSketch") -> None:
+        """Add another sketch's per-group totals."""
+        for group, count in other.counts.items():
+            self.counts[group] = self.counts.get(group, 0) + count
+            self.sums[group] = self.sums.get(group, 0.0) + other.sums[group]
+
+    def means(self) -> Dict[Hashable, float]:
+        """Mean value per group (groups with no values are omitted)."""
+        return {group: self.sums[group] / count
+                for group, count in self.counts.items() if count > 0}
+
+
+class CategoryCountSketch:
+    """Running counts of the distinct non-missing values (as strings) of categorical columns.
+
+    Each column keeps a value -> code dict and a count array indexed by code
+    that only grows, so an update costs the batch's rows and distinct values
+    rather than the vocabulary seen so far.
+    """
+
+    def __init__(self, columns: List[Hashable]):
+        self.codes: Dict[Hashable, Dict[str, int]] = {column: {} for column in columns}
+        # Capacity grows by doubling; entries past len(codes) stay zero
+        self.counts: Dict[Hashable, np.ndarray] = {column: np.zeros(0, dtype=np.int64)
+                                                   for column in columns}
+
+    def _add(self, column: Hashable, categories, counts: np.ndarray) -> None:
+        codes = self.codes[column]
+        batch_codes = np.fromiter((codes.setdefault(c, len(codes)) for c in categories),
+                                  dtype=np.int64, count=len(counts))
+        if len(codes) > len(self.counts[column]):
+            grown = np.zeros(max(len(codes), 2 * len(self.counts[column])), dtype=np.int64)
+            grown[:len(self.counts[column])] = self.counts[column]
+            self.counts[column] = grown
+        # Codes are distinct within a batch, so a fancy-indexed add is exact
+        self.counts[column][batch_codes] += counts
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Add the category counts of a batch of rows."""
+        for column in self.counts:
+            if column in data.columns:
+                categories, counts = category_counts(data[column])
+                self._add(column, categories, counts)
+
+    def merge(self, other: "CategoryCountSketch") -> None:
+        """Add another sketch's counts."""
+        for column, codes in other.codes.items():
+            self._add(column, list(codes), other.counts[column][:len(codes)])
+
+    def total_variation(self, column: Hashable, real_categories: pd.Index,
+                        real_counts: np.ndarray) -> float:
+        """Total variation distance between the real counts and this sketch's counts."""
+        codes = self.codes[column]
+        real_codes = np.fromiter((codes.get(c, -1) for c in real_categories),
+                                 dtype=np.int64, count=len(real_categories))
+        known = real_codes >= 0
+        # Categories seen only in the real data are appended after the sketch's
+        p = np.zeros(len(codes) + int((~known).sum()))
+        p[real_codes[known]] = real_counts[known]
+        p[len(codes):] = real_counts[~known]
+        q = np.zeros(len(p))
+        q[:len(codes)] = self.counts[column][:len(codes)]
+        return float(0.5 * np.abs(p / p.sum() - q / q.sum()).sum())
+
+
+class EquivalenceClassSketch:
+    """Equivalence-class sizes over quasi-identifier row hashes.
+
+    Also keeps the distinct (class, value) pairs of each sensitive attribute,
+    so memory grows with the number of classes and pairs, not rows.
+    """
+
+    def __init__(self, quasi_identifiers: List[Hashable], sensitive_attributes: List[Hashable] = ()):
+        self.quasi_identifiers = list(quasi_identifiers)
+        self.sensitive_attributes = list(sensitive_attributes)
+        self.class_sizes = pd.Series(dtype=np.int64)
+        self.pairs: Dict[Hashable, pd.DataFrame] = {
+            attribute: pd.DataFrame({'key': np.array([], dtype=np.uint64),
+                                     'value': np.array([], dtype=np.uint64)})
+            for attribute in self.sensitive_attributes
+        }
+        self.count = 0
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Add a batch of rows; one hash pass and one hash-table count per column set."""
+        keys = row_hashes(data, self.quasi_identifiers)
+        self.count += len(keys)
+        self._add_sizes(pd.Series(keys).value_counts(sort=False))
+        for attribute in self.sensitive_attributes:
+            batch = pd.DataFrame({'key': keys, 'value': row_hashes(data, [attribute])})
+            self._add_pairs(attribute, batch.drop_duplicates())
+
+    def merge(self, other: "EquivalenceClassSketch") -> None:
+        """Add another sketch built over the same columns."""
+        self.count += other.count
+        self._add_sizes(other.class_sizes)
+        for attribute in self.sensitive_attributes:
+            self._add_pairs(attribute, other.pairs[attribute])
+
+    def _add_sizes(self, sizes: pd.Series) -> None:
+        if self.class_sizes.empty:
+            self.class_sizes = sizes.astype(np.int64)
+        else:
+            self.class_sizes = self.class_sizes.add(sizes, fill_value=0).astype(np.int64)
+
+    def _add_pairs(self, attribute: Hashable, pairs: pd.DataFrame) -> None:
+        combined = pd.concat([self.pairs[attribute], pairs], ignore_index=True)
+        self.pairs[attribute] = combined.drop_duplicates(ignore_index=True)
+
+    def distinct_values(self, attribute: Hashable) -> pd.Series:
+        """Number of distinct sensitive values per equivalence class."""
+        return self.pairs[attribute].groupby('key', sort=False).size()
+
+
+def structural_correlations(covariance: np.ndarray, columns: List[str],
+                            variables: List[str]) -> Dict[str, float]:
+    """Correlation of each variable with the row mean of the other columns.
+
+    Derived from a covariance matrix, so it can be evaluated from sketches.
+    """
+    results = {}
+    index = {col: i for i, col in enumerate(columns)}
+
+    for var in variables:
+        if var not in index or len(columns) < 2:
+            continue
+        v = index[var]
+        others = [i for i in range(len(columns)) if i != v]
+        k = len(others)
+        cov_with_mean = covariance[v, others].sum() / k
+        var_of_mean = covariance[np.ix_(others, others)].sum() / (k * k)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results[var] = float(cov_with_mean / np.sqrt(covariance[v, v] * var_of_mean))
+
+    return results
+
+
+def frobenius_difference(a: np.ndarray, b: np.ndarray) -> float:
+    """Frobenius norm of ``a - b`` ignoring undefined (NaN) entries."""
+    return float(np.sqrt(np.nansum((a - b) ** 2)))
@@ -1,70 +1,191 @@
 
 """
 Task utility evaluation module.
-Uses RandomForestClassifier and F1 score to evaluate synthetic data utility.
+Compares models trained on synthetic data and tested on real data (TSTR)
+with models trained and tested on real data (TRTR) over k cross-validation
+folds. Classification targets use RandomForestClassifier and weighted F1;
+continuous targets use RandomForestRegressor with R² and MAE.
 """
 
+import os
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import f1_score, classification_report
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.model_selection import KFold, StratifiedKFold
+from sklearn.metrics import f1_score, r2_score, mean_absolute_error
+from typing import Dict, Any, List, Optional
+from src.encoding import EncodedMatrices, encode_datasets
 
 class TaskUtilityValidator:
     def __init__(self):
         self.name = "Task Utility Validator"
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.regression_model = RandomForestRegressor(n_estimators=100, random_state=42)
+        self.n_folds = 5
+        # Numeric targets with at most this many integer values are treated as classes
+        self.max_classes = 20
+        # Folds trained at once; each holds one copy of its training rows
+        self.fold_workers = min(self.n_folds, os.cpu_count() or 1)
+    
+    def detect_task(self, y) -> str:
+        """'classification' for categorical or few-valued integer targets, else 'regression'."""
+        values = pd.Series(y)
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            return 'classification'
+        observed = values.dropna().to_numpy(dtype=float)
+        if np.all(np.mod(observed, 1) == 0) and len(np.unique(observed)) <= self.max_classes:
+            return 'classification'
+        return 'regression'
     
     def evaluate_task_utility(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame, 
-                            target_column: str) -> Dict[str, Any]:
-        """Evaluate task utility using downstream ML performance."""
+                            target_column: str, task_type: Optional[str] = None,
+                            encoded: Optional[EncodedMatrices] = None) -> Dict[str, Any]:
+        """Evaluate task utility using downstream ML performance.
+        
+        Features are encoded with the shared encoding (the pipeline's
+        ``encoded`` matrices when given), as on the process-pool path.
+        """
         try:
-            # Prepare real data
-            X_real = real_data.drop(columns=[target_column])
-            y_real = real_data[target_column]
-            
-            # Prepare synthetic data
-            X_synthetic = synthetic_data.drop(columns=[target_column])
-            y_synthetic = synthetic_data[target_column]
-            
-            # Train on real data, test on synthetic
-            X_train_real, X_test_real, y_train_real, y_test_real = train_test_split(
-                X_real, y_real, test_size=0.2, random_state=42
-            )
-            
-            # Train model on real data
-            self.model.fit(X_train_real, y_train_real)
+            if encoded is None or encoded.target_column != target_column:
+                encoded = encode_datasets(real_data, synthetic_data, target_column=target_column)
+            return self.evaluate_encoded(encoded, target_column, task_type)
             
-            # Test on real data (baseline)
-            y_pred_real = self.model.predict(X_test_real)
-            f1_real = f1_score(y_test_real, y_pred_real, average='weighted')
-            
-            # Test on synthetic data
-            y_pred_synthetic = self.model.predict(X_synthetic)
-            f1_synthetic = f1_score(y_synthetic, y_pred_synthetic, average='weighted')
+        except Exception as e:
+            return self._error_result(e)
+    
+    def evaluate_encoded(self, encoded: EncodedMatrices, target_column: str,
+                         task_type: Optional[str] = None) -> Dict[str, Any]:
+        """Evaluate task utility on shared EncodedMatrices instead of DataFrames.
+        
+        The target comes from the raw values attached to ``encoded`` (see
+        ``encode_datasets``), so missing targets stay missing. Without them a
+        numeric target is used as-is and a one-hot encoded target is decoded
+        back to category indices.
+        """
+        try:
+            target_features = encoded.feature_slices().get(str(target_column))
+            if not target_features:
+                raise KeyError(f"Target column {target_column} is not encoded")
             
-            # Calculate utility score (how well synthetic data performs)
-            utility_score = f1_synthetic / f1_real if f1_real > 0 else 0
+            def _split(matrix: np.ndarray, raw_target: Optional[np.ndarray]):
+                if raw_target is not None:
+                    y = raw_target
+                elif (len(target_features) == 1
+                      and encoded.feature_names[target_features[0]] == str(target_column)):
+                    y = matrix[:, target_features[0]]
+                else:
+                    one_hot = matrix[:, target_features]
+                    # All-zero rows hold a category outside the vocabulary: treat as missing
+                    y = np.where(one_hot.any(axis=1), np.argmax(one_hot, axis=1), np.nan)
+                return np.delete(matrix, target_features, axis=1), y
             
-            return {
-                'utility_score': utility_score,
-                'f1_score_real': f1_real,
-                'f1_score_synthetic': f1_synthetic,
-                'validator_name': self.name
-            }
+            has_target = encoded.target_column == target_column and encoded.real_target is not None
+            X_real, y_real = _split(encoded.real, encoded.real_target if has_target else None)
+            X_synthetic, y_synthetic = _split(encoded.synthetic,
+                                              encoded.synthetic_target if has_target else None)
+            if task_type is None and has_target and encoded.target_categories is not None:
+                task_type = 'classification'
+            return self._score(X_real, y_real, X_synthetic, y_synthetic, task_type)
             
         except Exception as e:
-            print(f"Error in task utility evaluation: {e}")
+            return self._error_result(e)
+    
+    def _folds(self, y: np.ndarray, classification: bool) -> List[np.ndarray]:
+        """Test indices of each fold (stratified when every class has enough rows)."""
+        n_splits = min(self.n_folds, len(y))
+        if classification and np.unique(y, return_counts=True)[1].min() >= n_splits:
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        else:
+            splitter = KFold(n_splits=n_splits, shuffle=True, random_state=42)
+        return [test for _, test in splitter.split(np.zeros(len(y)), y)]
+    
+    def _metrics(self, y_true, y_pred, classification: bool) -> Dict[str, float]:
+        if classification:
+            return {'f1': f1_score(y_true, y_pred, average='weighted')}
+        return {'r2': r2_score(y_true, y_pred), 'mae': mean_absolute_error(y_true, y_pred)}
+    
+    def _score(self, X_real, y_real, X_synthetic, y_synthetic,
+               task_type: Optional[str] = None) -> Dict[str, Any]:
+        task_type = task_type or self.detect_task(y_real)
+        classification = task_type == 'classification'
+        base_model = self.model if classification else self.regression_model
+        
+        def _rows(X, y):
+            # Rows with a missing target cannot be scored
+            keep = np.flatnonzero(pd.notna(np.asarray(y)))
+            return X[keep], np.asarray(y)[keep]
+        
+        X_real, y_real = _rows(X_real, y_real)
+        X_synthetic, y_synthetic = _rows(X_synthetic, y_synthetic)
+        
+        real_folds = self._folds(y_real, classification)
+        synthetic_folds = self._folds(y_synthetic, classification)
+        
+        def _train_test(X_train, y_train, X_test, y_test) -> Dict[str, float]:
+            # A fresh copy per fold so concurrent fits never share state
+            model = clone(base_model).set_params(n_jobs=1)
+            model.fit(X_train, y_train)
+            return self._metrics(y_test, model.predict(X_test), classification)
+        
+        def _run_fold(k: int) -> Dict[str, Dict[str, float]]:
+            # Training slices are materialized inside the worker, so at most
+            # fold_workers copies are alive at a time
+            test = real_folds[k]
+            train = np.setdiff1d(np.arange(len(y_real)), test, assume_unique=True)
+            synthetic_train = np.setdiff1d(np.arange(len(y_synthetic)),
+                                           synthetic_folds[k % len(synthetic_folds)], assume_unique=True)
+            X_test, y_test = X_real[test], y_real[test]
             return {
-                'utility_score': 0.0,
-                'f1_score_real': 0.0,
-                'f1_score_synthetic': 0.0,
-                'error': str(e),
-                'validator_name': self.name
+                'trtr': _train_test(X_real[train], y_real[train], X_test, y_test),
+                'tstr': _train_test(X_synthetic[synthetic_train], y_synthetic[synthetic_train],
+                                    X_test, y_test)
             }
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.fold_workers, len(real_folds)))) as executor:
+            folds = list(executor.map(_run_fold, range(len(real_folds))))
+        
+        def _ratio(tstr: float, trtr: float) -> float:
+            return float(max(tstr, 0.0) / trtr) if trtr > 0 else 0.0
+        
+        primary = 'f1' if classification else 'r2'
+        fold_scores = [_ratio(f['tstr'][primary], f['trtr'][primary]) for f in folds]
+        results = {
+            'utility_score': _ratio(np.mean([f['tstr'][primary] for f in folds]),
+                                    np.mean([f['trtr'][primary] for f in folds])),
+            'utility_score_std': float(np.std(fold_scores)),
+            'task_type': task_type,
+            'n_folds': len(folds)
+        }
+        for metric in folds[0]['trtr']:
+            for scheme, label in (('trtr', 'real'), ('tstr', 'synthetic')):
+                values = [f[scheme][metric] for f in folds]
+                results[f'{metric}_score_{label}'] = float(np.mean(values))
+                results[f'{metric}_score_{label}_std'] = float(np.std(values))
+        results['fold_results'] = folds
+        results['validator_name'] = self.name
+        return results
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        print(f"Error in task utility evaluation: {error}")
+        return {
+            'utility_score': 0.0,
+            'f1_score_real': 0.0,
+            'f1_score_synthetic': 0.0,
+            'error': str(error),
+            'validator_name': self.name
+        }
     
     def validate(self, real_data: pd.DataFrame, synthetic_data: pd.DataFrame, 
-                target_column: str) -> Dict[str, Any]:
+                target_column: str, task_type: Optional[str] = None,
+                encoded: Optional[EncodedMatrices] = None) -> Dict[str, Any]:
         """Main validation method for task utility."""
-        return self.evaluate_task_utility(real_data, synthetic_data, target_column)
+        return self.evaluate_task_utility(real_data, synthetic_data, target_column, task_type,
+                                          encoded)
+
+
+def run_encoded(encoded, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool runner working only from the shared encoded matrices."""
+    return TaskUtilityValidator().evaluate_encoded(encoded, config['target_column'],
+                                                   config.get('task_type'))
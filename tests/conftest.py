@@ -2,10 +2,22 @@
 import pytest
 import sys
 import os
+import shutil
+import tempfile
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Keep audit records from test runs out of the working directory. src.main
+# opens these files when test modules are collected, before any fixture runs.
+SERVICE_STATE_DIR = tempfile.mkdtemp(prefix='pytest-service-state-')
+os.environ['AUDIT_DB_PATH'] = os.path.join(SERVICE_STATE_DIR, 'validation_audit.db')
+os.environ['AUDIT_LOG_PATH'] = os.path.join(SERVICE_STATE_DIR, 'validation_audit.log')
+os.environ['REVIEW_QUEUE_DB_PATH'] = os.path.join(SERVICE_STATE_DIR, 'review_queue.db')
+
+def pytest_unconfigure(config):
+    shutil.rmtree(SERVICE_STATE_DIR, ignore_errors=True)
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Fixture to provide test data directory path."""
@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import io
 import sys
+import time
 import os
 from fastapi.testclient import TestClient
 from fastapi import UploadFile
@@ -12,7 +13,9 @@ from fastapi import UploadFile
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from src import main
 from src.main import app
+from src.shared_reference import SharedReferenceStore
 
 client = TestClient(app)
 
@@ -62,6 +65,25 @@ class TestAPI:
         assert "synthetic_data_quality_score" in result
         assert "data_info" in result
     
+    def test_validate_response_modes(self):
+        files = {
+            "real_data": ("real.csv", self.real_csv, "text/csv"),
+            "synthetic_data": ("synthetic.csv", self.synthetic_csv, "text/csv")
+        }
+        
+        full = client.post("/validate/", files=files).json()
+        assert "ks_test_results" in full["validation_results"]["fidelity"]
+        
+        compact = client.post("/validate/?response_mode=compact", files=files).json()
+        assert "ks_test_results" not in compact["validation_results"]["fidelity"]
+        assert "ks_test_results" in compact["validation_results"]["fidelity"]["omitted"]
+        
+        streamed = client.post("/validate/?response_mode=stream", files=files).json()
+        assert streamed["validation_results"] == full["validation_results"]
+        
+        response = client.post("/validate/?response_mode=bogus", files=files)
+        assert response.status_code == 400
+    
     def test_validate_with_config(self):
         files = {
             "real_data": ("real.csv", self.real_csv, "text/csv"),
@@ -80,3 +102,75 @@ class TestAPI:
         result = response.json()
         assert "fidelity" in result["validation_results"]
         assert "privacy_risk" in result["validation_results"]
+    
+    def test_validate_rejects_traversal_reference_id(self, tmp_path, monkeypatch):
+        # A manifest outside the store must not be reachable through reference_id
+        (tmp_path / 'outside').mkdir()
+        (tmp_path / 'outside' / 'manifest.json').write_text('{}')
+        monkeypatch.setattr(main.orchestrator, 'shared_store',
+                            SharedReferenceStore(str(tmp_path / 'store')))
+        
+        files = {"synthetic_data": ("synthetic.csv", self.synthetic_csv, "text/csv")}
+        for reference_id in ("../outside", "../../etc", "A" * 32):
+            response = client.post("/validate/", files=files, params={"reference_id": reference_id})
+            assert response.status_code == 404
+    
+    def test_audit_events_endpoint(self):
+        response = client.get("/audit/events", params={"limit": 5})
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert "events" in result
+        assert "next_cursor" in result
+        assert result["count"] <= 5
+        
+        # Upper score bounds are passed through to the store
+        for bound in ("max_fidelity", "max_quality"):
+            response = client.get("/audit/events", params={bound: -1.0})
+            assert response.status_code == 200
+            assert response.json()["count"] == 0
+    
+    def test_failed_validation_is_logged(self):
+        files = {
+            "real_data": ("broken-upload.csv", self.real_csv, "text/csv"),
+            "synthetic_data": ("synthetic.csv", "", "text/csv")
+        }
+        response = client.post("/validate/", files=files)
+        assert response.status_code == 500
+        
+        events = client.get("/audit/events", params={"dataset_id": "broken-upload.csv"}).json()["events"]
+        assert [e["event_type"] for e in events] == ["VALIDATION_FAILED", "VALIDATION_START"]
+        assert events[0]["validation_id"] == events[1]["validation_id"]
+    
+    def test_ready_endpoint_warms_up_validators(self):
+        # The warm-up runs in the background; the probe answers immediately meanwhile
+        deadline = time.monotonic() + 60
+        while True:
+            response = client.get("/ready")
+            result = response.json()
+            if result["status"] != "warming_up" or time.monotonic() > deadline:
+                break
+            assert response.status_code == 503
+            time.sleep(0.1)
+        
+        assert response.status_code == 200
+        assert result["status"] == "ready"
+        assert "fidelity" in result["warmup"]["validator_load_seconds"]
+    
+    def test_ready_endpoint_is_unavailable_until_warm(self, monkeypatch):
+        states = {
+            "warming_up": {'ready': False, 'started': True, 'report': None, 'error': None},
+            "failed": {'ready': False, 'started': True, 'report': None, 'error': 'boom'}
+        }
+        for status, state in states.items():
+            monkeypatch.setattr(main, 'start_warm_up', lambda state=state: state)
+            response = client.get("/ready")
+            assert response.status_code == 503
+            assert response.json()["status"] == status
+        assert response.json()["error"] == 'boom'
+        
+        monkeypatch.setattr(main, 'start_warm_up', lambda: {
+            'ready': True, 'started': True, 'report': {'validator_load_seconds': {}}, 'error': None})
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
@@ -0,0 +1,82 @@
+
+import pytest
+import datetime
+import logging
+import sys
+import os
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.audit_store import AuditStore
+from src.audit_logger import AuditLogger
+
+class TestAuditStore:
+    def setup_method(self):
+        self.store = AuditStore(":memory:")
+        now = datetime.datetime.utcnow()
+        for i in range(10):
+            self.store.record_event({
+                'timestamp': (now - datetime.timedelta(days=i * 20)).isoformat(),
+                'event_type': 'VALIDATION_COMPLETE',
+                'validation_id': f'val-{i}',
+                'data': {
+                    'dataset_id': 'dataset-x' if i % 2 == 0 else 'dataset-y',
+                    'results': {
+                        'privacy_risk': {'privacy_risk_score': i / 10},
+                        'fidelity': {'fidelity_score': 0.8}
+                    },
+                    'quality_score': {'overall_synthetic_data_quality_score': 0.7}
+                }
+            })
+    
+    def teardown_method(self):
+        self.store.close()
+    
+    def test_query_by_dataset_time_and_score(self):
+        start = (datetime.datetime.utcnow() - datetime.timedelta(days=90)).isoformat()
+        result = self.store.query(dataset_id='dataset-x', start_time=start,
+                                  min_privacy_risk=0.1)
+        ids = [event['validation_id'] for event in result['events']]
+        assert ids == ['val-4', 'val-2']
+        assert result['events'][0]['privacy_risk_score'] == pytest.approx(0.4)
+    
+    def test_pagination_with_cursor(self):
+        first_page = self.store.query(limit=4)
+        assert first_page['count'] == 4
+        assert first_page['next_cursor'] is not None
+        
+        second_page = self.store.query(limit=4, cursor=first_page['next_cursor'])
+        first_ids = {event['id'] for event in first_page['events']}
+        second_ids = {event['id'] for event in second_page['events']}
+        assert not first_ids & second_ids
+        
+        last_page = self.store.query(limit=4, cursor=second_page['next_cursor'])
+        assert last_page['count'] == 2
+        assert last_page['next_cursor'] is None
+    
+    def test_retention_job_removes_old_events(self):
+        stats = self.store.run_retention_job(max_age_days=90)
+        assert stats['deleted_events'] == 5
+        assert stats['remaining_events'] == 5
+    
+    def test_logger_writes_to_store(self, tmp_path):
+        logger = AuditLogger(log_file=str(tmp_path / "audit.log"), store=self.store)
+        logger.log_validation_start('val-new', {'validators': ['fidelity']},
+                                    dataset_id='dataset-z')
+        result = self.store.query(validation_id='val-new')
+        assert result['count'] == 1
+        assert result['events'][0]['event_type'] == 'VALIDATION_START'
+        assert result['events'][0]['dataset_id'] == 'dataset-z'
+    
+    def test_logger_does_not_capture_other_records(self, tmp_path):
+        root_handlers = list(logging.getLogger().handlers)
+        log_file = tmp_path / "audit.log"
+        logger = AuditLogger(log_file=str(log_file), store=self.store)
+        assert logging.getLogger().handlers == root_handlers
+        
+        logging.getLogger('httpx').warning("HTTP Request: GET /")
+        logger.log_validation_start('val-log', {'validators': ['fidelity']})
+        content = log_file.read_text()
+        assert 'val-log' in content
+        assert 'HTTP Request' not in content
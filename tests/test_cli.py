@@ -0,0 +1,58 @@
+import json
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.cli import main, completed_files
+
+class TestBatchCLI:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 200),
+            'income': np.random.normal(50000, 15000, 200)
+        })
+    
+    def _write_inputs(self, tmp_path, n_files=3):
+        self.real_data.to_csv(tmp_path / 'real.csv', index=False)
+        candidates = tmp_path / 'candidates'
+        candidates.mkdir()
+        for i in range(n_files):
+            pd.DataFrame({
+                'age': np.random.normal(40 + i, 10, 200),
+                'income': np.random.normal(50000, 15000, 200)
+            }).to_csv(candidates / f'candidate_{i}.csv', index=False)
+        config = tmp_path / 'config.json'
+        config.write_text(json.dumps({'validators': ['fidelity']}))
+        return [
+            'validate', '--real', str(tmp_path / 'real.csv'), '--synthetic', str(candidates),
+            '--config', str(config), '--output', str(tmp_path / 'results.jsonl'), '--workers', '2'
+        ]
+    
+    def test_directory_is_validated_to_jsonl(self, tmp_path, capsys):
+        args = self._write_inputs(tmp_path)
+        assert main(args) == 0
+        
+        records = [json.loads(line) for line in (tmp_path / 'results.jsonl').read_text().splitlines()]
+        assert len(records) == 3
+        assert all(r['status'] == 'success' for r in records)
+        assert all('fidelity' in r['validation_results'] for r in records)
+        assert '[3/3]' in capsys.readouterr().err
+    
+    def test_rerun_resumes_after_interruption(self, tmp_path):
+        args = self._write_inputs(tmp_path)
+        main(args)
+        output = tmp_path / 'results.jsonl'
+        
+        # Simulate a run killed after the first record, mid-way through the second
+        lines = output.read_text().splitlines()
+        output.write_text(lines[0] + '\n' + lines[1][:20])
+        assert len(completed_files(str(output))) == 1
+        
+        main(args)
+        assert len(completed_files(str(output))) == 3
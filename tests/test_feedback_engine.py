@@ -0,0 +1,142 @@
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.feedback_engine.reward_function import RewardFunction
+from src.feedback_engine.rl_agent import RLAgent
+from src.feedback_engine.replay_buffer import ReplayBuffer
+from src.feedback_engine.state_encoding import TileCodingEncoder
+from src.feedback_engine.feedback_loop import FeedbackLoopRunner
+
+class TestRewardFunction:
+    def setup_method(self):
+        self.reward_function = RewardFunction()
+        self.results = [
+            {'fidelity': {'fidelity_score': 0.8}, 'privacy_risk': {'privacy_risk_score': 0.2}},
+            {'task_utility': {'utility_score': 0.9}, 'bias_check': {'overall_bias_score': 1.5}},
+            {},
+        ]
+    
+    def test_batch_matches_single_rewards(self):
+        batch = self.reward_function.calculate_rewards_batch(self.results)
+        single = [self.reward_function.calculate_reward(result) for result in self.results]
+        assert batch == pytest.approx(single)
+    
+    def test_score_matrix_shape(self):
+        matrix = self.reward_function.score_matrix(self.results)
+        assert matrix.shape == (3, 4)
+        assert np.isnan(matrix[2]).all()
+
+class TestReplayBuffer:
+    def test_ring_buffer_keeps_latest(self):
+        buffer = ReplayBuffer(capacity=4, state_dim=2, seed=0)
+        states = np.arange(12, dtype=float).reshape(6, 2)
+        buffer.add_batch(states, np.arange(6), np.arange(6, dtype=float), states)
+        assert len(buffer) == 4
+        assert set(buffer.actions) == {2, 3, 4, 5}
+        
+        sampled_states, actions, rewards, _ = buffer.sample(16)
+        assert sampled_states.shape == (16, 2)
+        assert set(actions) <= {2, 3, 4, 5}
+        assert np.all(rewards == actions)
+
+class TestRLAgent:
+    def test_batch_update_matches_sequential_for_distinct_states(self):
+        sequential = RLAgent(action_space_size=3, learning_rate=0.5)
+        batched = RLAgent(action_space_size=3, learning_rate=0.5)
+        
+        states = np.array([[0.05, 0.95], [0.55, 0.15]])
+        next_states = np.array([[0.35, 0.35], [0.75, 0.75]])
+        actions = np.array([0, 1])
+        rewards = np.array([1.0, 0.5])
+        
+        for i in range(2):
+            sequential.update_policy(states[i], actions[i], rewards[i], next_states[i])
+        batched.update_policy_batch(states, actions, rewards, next_states)
+        
+        for state in states:
+            assert np.allclose(sequential.q_values(state), batched.q_values(state))
+    
+    def test_repeated_transitions_move_cell_by_one_step(self):
+        agent = RLAgent(action_space_size=2, learning_rate=0.5)
+        agent.discount_factor = 0.0
+        states = np.repeat(np.array([[0.5, 0.5]]), 8, axis=0)
+        agent.update_policy_batch(states, np.zeros(8, dtype=int), np.ones(8), states)
+        assert agent.q_values(states[0])[0] == pytest.approx(0.5)
+    
+    def test_binning_separates_states_with_equal_sums(self):
+        agent = RLAgent(action_space_size=2, learning_rate=1.0)
+        agent.update_policy(np.array([0.2, 0.8]), 0, 1.0, np.array([0.2, 0.8]))
+        assert agent.q_values(np.array([0.8, 0.2]))[0] == 0.0
+        assert agent.q_values(np.array([0.2, 0.8]))[0] == pytest.approx(1.0)
+    
+    def test_tile_coding_generalizes_to_nearby_states(self):
+        agent = RLAgent(action_space_size=2, learning_rate=0.5,
+                        state_encoder=TileCodingEncoder(n_tilings=4, tiles_per_dim=4))
+        agent.update_policy(np.array([0.50, 0.50]), 1, 1.0, np.array([0.0, 0.0]))
+        assert 0 < agent.q_values(np.array([0.52, 0.50]))[1] <= 0.5
+        assert agent.q_values(np.array([0.95, 0.05]))[1] == 0.0
+    
+    def test_greedy_policy_learns_best_action(self):
+        np.random.seed(0)
+        agent = RLAgent(action_space_size=3, learning_rate=0.5)
+        states = np.repeat(np.random.rand(100, 2), 3, axis=0)
+        actions = np.tile(np.arange(3), 100)
+        rewards = (actions == 2).astype(float)
+        for _ in range(5):
+            agent.update_policy_batch(states, actions, rewards, states)
+        
+        agent.epsilon = 0.0
+        assert all(agent.select_action(state) == 2 for state in states[:20])
+    
+    def test_save_and_load_round_trip(self, tmp_path):
+        agent = RLAgent(action_space_size=4, learning_rate=0.3,
+                        state_encoder=TileCodingEncoder(n_tilings=2, tiles_per_dim=5))
+        states = np.random.rand(50, 3)
+        agent.update_policy_batch(states, np.random.randint(0, 4, 50), np.random.rand(50), states)
+        
+        path = str(tmp_path / "agent.npz")
+        agent.save(path)
+        restored = RLAgent.load(path)
+        
+        assert len(restored.q_store) == len(agent.q_store)
+        assert isinstance(restored.state_encoder, TileCodingEncoder)
+        for state in states[:10]:
+            assert np.allclose(restored.q_values(state), agent.q_values(state))
+
+class TestFeedbackLoopRunner:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 300),
+            'income': np.random.normal(50000, 15000, 300)
+        })
+    
+    def _generator(self, action, n_candidates):
+        return [
+            pd.DataFrame({
+                'age': np.random.normal(40 + action, 10, 300),
+                'income': np.random.normal(50000, 15000, 300)
+            })
+            for _ in range(n_candidates)
+        ]
+    
+    def test_run_updates_agent_and_checkpoints(self, tmp_path):
+        checkpoint = str(tmp_path / "agent.npz")
+        runner = FeedbackLoopRunner(self._generator, self.real_data, {'validators': ['fidelity']},
+                                    agent=RLAgent(action_space_size=3, learning_rate=0.5),
+                                    candidates_per_step=3, checkpoint_path=checkpoint)
+        summary = runner.run(n_steps=2)
+        
+        assert summary['steps_completed'] == 2
+        assert summary['candidates_evaluated'] == 6
+        assert summary['candidates_per_minute'] > 0
+        assert 0 < summary['best_reward'] <= 1
+        assert len(runner.agent.q_store) > 0
+        assert len(RLAgent.load(checkpoint).q_store) == len(runner.agent.q_store)
@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import time
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -15,6 +16,18 @@ from src.validator_modules.task_utility import TaskUtilityValidator
 from src.validator_modules.causal_consistency import CausalConsistencyValidator
 from src.orchestrator import ValidationOrchestrator
 from src.aggregator import ScoreAggregator
+from src.result_cache import ResultCache, hash_dataframe
+from src.shared_reference import SharedReferenceStore
+from src.data_transport import SharedArrayTransport, run_in_worker
+from src.encoding import encode_datasets
+from src.planner import ValidationPlanner, DataShape
+from src.validator_modules.joint_fidelity import JointFidelityValidator
+from src.validator_modules.anonymity import AnonymityValidator
+from src.validator_modules.exact_copy import ExactCopyValidator
+from src.validator_modules.sketches import row_hashes, CategoryCountSketch
+from src.validator_modules.attribute_inference import AttributeInferenceValidator
+from src.reference_profile import ReferenceProfile
+from src.validator_modules.registry import register_validator, unregister_validator
 
 class TestFidelityValidator:
     def setup_method(self):
@@ -39,10 +52,108 @@ class TestFidelityValidator:
         assert 'correlation_difference' in result
         assert 'ks_test_results' in result
     
+    def test_column_profiles_match_reference_statistics(self):
+        from scipy import stats
+        real = self.real_data.copy()
+        real.loc[:99, 'age'] = np.nan
+        profiles = self.validator.column_profiles(real, self.synthetic_data)
+        age = profiles['age']
+        
+        assert age['missing_rate']['real'] == pytest.approx(0.1)
+        assert age['wasserstein_distance'] == pytest.approx(
+            stats.wasserstein_distance(real['age'].dropna(), self.synthetic_data['age']))
+        assert age['quantiles']['real'] == pytest.approx(
+            np.quantile(real['age'].dropna(), age['quantiles']['levels']).tolist())
+        assert sum(age['histogram']['synthetic']) == pytest.approx(1.0)
+        assert age['moments']['synthetic']['mean'] == pytest.approx(self.synthetic_data['age'].mean())
+    
+    def test_categorical_fidelity(self):
+        real = pd.DataFrame({'x': np.random.normal(0, 1, 1000),
+                             'color': ['red'] * 600 + ['blue'] * 395 + ['teal'] * 5})
+        synthetic = pd.DataFrame({'x': np.random.normal(0, 1, 1000),
+                                  'color': ['red'] * 500 + ['blue'] * 400 + ['pink'] * 100})
+        result = self.validator.validate(real, synthetic)
+        color = result['categorical_results']['color']
+        
+        # |0.6-0.5| + |0.395-0.4| + |0.005-0| + |0-0.1|, halved
+        assert color['total_variation'] == pytest.approx(0.105)
+        assert 0 < color['js_divergence'] < 1
+        assert color['rare_category_coverage'] == 0.0
+        assert color['unseen_category_rate'] == pytest.approx(0.1)
+        assert np.isfinite(result['correlation_difference'])
+        
+        same = self.validator.validate(real, real)['categorical_results']['color']
+        assert same['total_variation'] == 0.0
+        assert same['chi_square_p_value'] == pytest.approx(1.0)
+    
+    def test_mmd_detects_joint_difference(self):
+        # Same marginals, but the synthetic data loses the age/income dependence
+        real = self.real_data.copy()
+        real['income'] = real['age'] * 1000 + np.random.normal(0, 2000, 1000)
+        synthetic = real.sample(frac=1.0, random_state=1).reset_index(drop=True)
+        independent = synthetic.copy()
+        independent['income'] = np.random.permutation(independent['income'].values)
+        
+        assert self.validator.mmd_test(real, synthetic)['p_value'] > 0.05
+        result = self.validator.mmd_test(real, independent)
+        assert result['p_value'] < 0.05
+        assert result['n_permutations'] == self.validator.mmd_permutations
+    
+    def test_mmd_is_opt_in_and_reuses_reference(self):
+        reference = ReferenceProfile(self.real_data)
+        assert 'multivariate_test' not in self.validator.validate(self.real_data, self.synthetic_data)
+        
+        result = self.validator.validate(self.real_data, self.synthetic_data, reference=reference,
+                                         multivariate_test=True)
+        assert result['multivariate_test'] == self.validator.mmd_test(
+            self.real_data, self.synthetic_data, reference=reference)
+        assert result['multivariate_test'] == self.validator.mmd_test(self.real_data, self.synthetic_data)
+        
+        shape = DataShape.from_data(self.real_data, self.synthetic_data)
+        planner = ValidationPlanner()
+        assert (planner.estimate('fidelity', 'exact', shape, config={'multivariate_test': True})
+                > planner.estimate('fidelity', 'exact', shape))
+    
     def test_fidelity_score_range(self):
         result = self.validator.validate(self.real_data, self.synthetic_data)
         assert 0 <= result['fidelity_score'] <= 1
 
+class TestTaskUtilityValidator:
+    def setup_method(self):
+        self.validator = TaskUtilityValidator()
+        np.random.seed(42)
+        self.real_data = self._make(500, noise=0.3)
+    
+    def _make(self, n, noise):
+        X = np.random.normal(0, 1, (n, 3))
+        return pd.DataFrame({'a': X[:, 0], 'b': X[:, 1], 'c': X[:, 2],
+                             'y': X[:, 0] + 2 * X[:, 1] + np.random.normal(0, noise, n)})
+    
+    def test_detects_task_type(self):
+        assert self.validator.detect_task(pd.Series([0, 1, 1, 2])) == 'classification'
+        assert self.validator.detect_task(pd.Series(['a', 'b'])) == 'classification'
+        assert self.validator.detect_task(self.real_data['y']) == 'regression'
+    
+    def test_regression_utility_with_fold_variance(self):
+        good = self.validator.validate(self.real_data, self._make(500, noise=0.3), 'y')
+        poor = self.validator.validate(self.real_data, self._make(500, noise=3.0), 'y')
+        
+        assert good['task_type'] == 'regression'
+        assert good['n_folds'] == 5 and len(good['fold_results']) == 5
+        assert good['r2_score_real_std'] >= 0 and 'mae_score_synthetic' in good
+        assert good['utility_score'] > poor['utility_score']
+    
+    def test_unknown_one_hot_target_rows_are_dropped(self):
+        real = self.real_data.assign(y=np.where(self.real_data['a'] > 0, 'hi', 'lo'))
+        synthetic = real.copy()
+        synthetic.loc[synthetic.index[::4], 'y'] = 'unseen'
+        kept = synthetic[synthetic['y'] != 'unseen']
+        
+        # Without raw targets the one-hot target is decoded; unseen categories must not become class 0
+        with_unknown = self.validator.evaluate_encoded(encode_datasets(real, synthetic), 'y', 'classification')
+        without = self.validator.evaluate_encoded(encode_datasets(real, kept), 'y', 'classification')
+        assert with_unknown['utility_score'] == pytest.approx(without['utility_score'])
+
 class TestPrivacyRiskValidator:
     def setup_method(self):
         self.validator = PrivacyRiskValidator()
@@ -67,6 +178,20 @@ class TestPrivacyRiskValidator:
     def test_privacy_risk_score_range(self):
         result = self.validator.validate(self.real_data, self.synthetic_data)
         assert 0 <= result['privacy_risk_score'] <= 1
+    
+    def test_propensity_mse_separates_shifted_data(self):
+        same = self.validator.propensity_mse(self.real_data, self.real_data.sample(frac=1, random_state=0))
+        shifted = self.validator.propensity_mse(self.real_data, self.real_data + 1.0)
+        
+        assert same['pmse_ratio'] < 5
+        assert shifted['pmse_ratio'] > 50
+        assert shifted['propensity_auc'] > 0.7
+    
+    def test_propensity_failure_is_not_a_good_score(self):
+        self.validator.pmse_folds = 0
+        result = self.validator.propensity_mse(self.real_data, self.synthetic_data)
+        assert result['pmse'] is None and result['pmse_ratio'] is None
+        assert 'error' in result
 
 class TestValidationOrchestrator:
     def setup_method(self):
@@ -104,6 +229,727 @@ class TestValidationOrchestrator:
         )
         assert 'fidelity' in result
         assert 'privacy_risk' in result
+    
+    def test_reference_profile_matches_direct_validation(self):
+        config = {
+            'validators': ['fidelity', 'bias_check', 'causal_consistency'],
+            'target_column': 'target',
+            'protected_attributes': ['gender'],
+            'treatment_column': 'target',
+            'outcome_column': 'income'
+        }
+        numeric_real = self.real_data.drop(columns=['gender'])
+        numeric_synthetic = self.synthetic_data.drop(columns=['gender'])
+        direct = self.orchestrator.run_validation_pipeline(self.real_data, self.synthetic_data, config)
+        reference = self.orchestrator.get_reference_profile(self.real_data)
+        profiled = self.orchestrator.run_validation_pipeline(
+            self.real_data, self.synthetic_data, config, reference=reference
+        )
+        
+        assert self.orchestrator.get_reference_profile(self.real_data.copy()) is reference
+        assert profiled['bias_check']['overall_bias_score'] == pytest.approx(
+            direct['bias_check']['overall_bias_score'])
+        assert profiled['causal_consistency']['delta_ate'] == pytest.approx(
+            direct['causal_consistency']['delta_ate'])
+        
+        direct = self.orchestrator.run_validation_pipeline(numeric_real, numeric_synthetic, config)
+        profiled = self.orchestrator.run_validation_pipeline(
+            numeric_real, numeric_synthetic, config,
+            reference=self.orchestrator.get_reference_profile(numeric_real)
+        )
+        assert profiled['fidelity']['fidelity_score'] == pytest.approx(
+            direct['fidelity']['fidelity_score'])
+
+class TestValidatorRegistry:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({'x': np.random.normal(0, 1, 200)})
+        self.synthetic_data = pd.DataFrame({'x': np.random.normal(0.5, 1, 200)})
+        
+        @register_validator('row_count_ratio', inputs=('reference_profile',))
+        class RowCountRatio:
+            def validate_context(self, context):
+                reference = context.inputs['reference_profile']
+                return {'ratio': len(context.synthetic_data) / reference.n_rows}
+        
+        @register_validator('fidelity_echo', depends_on=('fidelity',))
+        class FidelityEcho:
+            def validate_context(self, context):
+                return {'echo': context.results['fidelity']['fidelity_score']}
+    
+    def teardown_method(self):
+        unregister_validator('row_count_ratio')
+        unregister_validator('fidelity_echo')
+    
+    def test_schedule_shares_preparation_stages(self):
+        orchestrator = ValidationOrchestrator()
+        graph = orchestrator.build_schedule({
+            'validators': ['fidelity', 'bias_check', 'privacy_risk', 'task_utility']
+        })
+        assert graph['fidelity'] == {'reference_profile'}
+        assert graph['bias_check'] == {'reference_profile'}
+        assert graph['privacy_risk'] == {'encoded_matrices'}
+        assert 'task_utility' not in graph  # needs target_column
+    
+    def test_validators_are_loaded_lazily(self):
+        orchestrator = ValidationOrchestrator()
+        assert orchestrator.validators == {}
+        orchestrator.run_validation_pipeline(self.real_data, self.synthetic_data,
+                                             {'validators': ['fidelity']})
+        assert list(orchestrator.validators) == ['fidelity']
+    
+    def test_custom_validators_and_dependencies(self):
+        orchestrator = ValidationOrchestrator()
+        result = orchestrator.run_validation_pipeline(
+            self.real_data, self.synthetic_data,
+            {'validators': ['fidelity', 'row_count_ratio', 'fidelity_echo']}
+        )
+        assert result['row_count_ratio']['ratio'] == 1.0
+        assert result['fidelity_echo']['echo'] == result['fidelity']['fidelity_score']
+    
+    def test_unconfigured_dependency_skips_dependent(self):
+        @register_validator('utility_echo', depends_on=('task_utility',))
+        class UtilityEcho:
+            def validate_context(self, context):
+                return {'echo': context.results['task_utility']}
+        
+        try:
+            orchestrator = ValidationOrchestrator()
+            config = {'validators': ['fidelity', 'task_utility', 'utility_echo']}
+            graph = orchestrator.build_schedule(config)
+            assert 'task_utility' not in graph
+            
+            result = orchestrator.run_validation_pipeline(self.real_data, self.synthetic_data, config)
+            assert result['utility_echo']['skipped'] is True
+            assert result['utility_echo']['skip_reason'] == 'dependency task_utility not configured'
+            assert 'fidelity_score' in result['fidelity']
+        finally:
+            unregister_validator('utility_echo')
+
+class TestResultCache:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 200),
+            'income': np.random.normal(50000, 15000, 200)
+        })
+        self.synthetic_data = pd.DataFrame({
+            'age': np.random.normal(42, 12, 200),
+            'income': np.random.normal(52000, 16000, 200)
+        })
+    
+    def test_repeated_validation_hits_cache(self):
+        orchestrator = ValidationOrchestrator(cache=ResultCache(max_entries=4))
+        config = {'validators': ['fidelity']}
+        
+        first = orchestrator.run_validation_pipeline(self.real_data, self.synthetic_data, config)
+        assert first['pipeline_metadata']['cache']['hit'] is False
+        
+        second = orchestrator.run_validation_pipeline(
+            self.real_data.copy(), self.synthetic_data.copy(), {'validators': ['fidelity']}
+        )
+        assert second['pipeline_metadata']['cache']['hit'] is True
+        assert second['fidelity']['fidelity_score'] == first['fidelity']['fidelity_score']
+    
+    def test_key_changes_with_data_and_config(self):
+        cache = ResultCache()
+        base_key = cache.make_key(self.real_data, self.synthetic_data, {'validators': ['fidelity']})
+        
+        changed = self.synthetic_data.copy()
+        changed.iloc[0, 0] += 1.0
+        assert cache.make_key(self.real_data, changed, {'validators': ['fidelity']}) != base_key
+        assert cache.make_key(self.real_data, self.synthetic_data,
+                              {'validators': ['privacy_risk']}) != base_key
+        assert cache.make_key(self.real_data, self.synthetic_data,
+                              {'validators': ['fidelity'], 'dataset_id': 'x'}) == base_key
+    
+    def test_ttl_and_size_eviction(self):
+        cache = ResultCache(max_entries=2, ttl_seconds=0)
+        cache.put('a', {'fidelity': {'fidelity_score': 0.5}})
+        assert cache.get('a') is None
+        
+        cache = ResultCache(max_entries=2)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, {})
+        assert cache.get('a') is None
+        assert cache.get('c') is not None
+    
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        ResultCache(disk_dir=str(tmp_path)).put('k', {'fidelity': {'fidelity_score': 0.9}})
+        results, info = ResultCache(disk_dir=str(tmp_path)).get('k')
+        assert info['tier'] == 'disk'
+        assert results['fidelity']['fidelity_score'] == 0.9
+    
+    def test_disk_tier_is_bounded(self, tmp_path):
+        cache = ResultCache(max_entries=3, ttl_seconds=60, disk_dir=str(tmp_path))
+        cache.put('expired', {})
+        os.utime(tmp_path / 'expired.pkl', (time.time() - 120, time.time() - 120))
+        for i in range(6):
+            cache.put(f'k{i}', {})
+        
+        files = sorted(p.name for p in tmp_path.glob('*.pkl'))
+        assert files == ['k3.pkl', 'k4.pkl', 'k5.pkl']
+
+class TestIncrementalValidation:
+    def setup_method(self):
+        self.orchestrator = ValidationOrchestrator()
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 2000),
+            'income': np.random.normal(50000, 15000, 2000),
+            'group': np.random.choice([0, 1], 2000),
+            'target': np.random.binomial(1, 0.3, 2000)
+        })
+        self.synthetic_data = pd.DataFrame({
+            'age': np.random.normal(42, 12, 2000),
+            'income': np.random.normal(52000, 16000, 2000),
+            'group': np.random.choice([0, 1], 2000),
+            'target': np.random.binomial(1, 0.35, 2000)
+        })
+        self.config = {
+            'validators': ['fidelity', 'bias_check', 'causal_consistency'],
+            'target_column': 'target',
+            'protected_attributes': ['group'],
+            'treatment_column': 'group',
+            'outcome_column': 'target',
+            'causal_variables': ['age', 'income']
+        }
+    
+    def test_appended_batches_match_full_validation(self):
+        full = self.orchestrator.run_validation_pipeline(
+            self.real_data, self.synthetic_data, self.config
+        )
+        
+        self.orchestrator.start_incremental_session('stream', self.real_data, self.config)
+        for rows in np.array_split(np.arange(len(self.synthetic_data)), 4):
+            result = self.orchestrator.append_and_validate('stream', self.synthetic_data.iloc[rows])
+        
+        assert result['pipeline_metadata']['incremental']['synthetic_rows'] == 2000
+        assert result['bias_check']['overall_bias_score'] == pytest.approx(
+            full['bias_check']['overall_bias_score'])
+        assert result['causal_consistency']['causal_consistency_score'] == pytest.approx(
+            full['causal_consistency']['causal_consistency_score'])
+        assert result['fidelity']['fidelity_score'] == pytest.approx(
+            full['fidelity']['fidelity_score'], abs=0.02)
+    
+    def test_categorical_shift_lowers_incremental_fidelity(self):
+        # A 90/10 category split flipped to 10/90 must cost the sketch score what it costs the exact one
+        real = self.real_data.assign(segment=np.where(np.random.rand(2000) < 0.9, 'a', 'b'))
+        flipped = self.synthetic_data.assign(segment=np.where(np.random.rand(2000) < 0.1, 'a', 'b'))
+        exact = FidelityValidator().validate(real, flipped)
+        
+        self.orchestrator.start_incremental_session('flip', real, {'validators': ['fidelity']})
+        result = self.orchestrator.append_and_validate('flip', flipped)['fidelity']
+        assert result['categorical_results']['segment']['total_variation'] == pytest.approx(
+            exact['categorical_results']['segment']['total_variation'])
+        assert result['fidelity_score'] == pytest.approx(exact['fidelity_score'], abs=0.02)
+    
+    def test_category_counts_grow_with_new_values_only(self):
+        batches = [pd.DataFrame({'c': np.random.randint(0, 50, 300).astype(str)}) for _ in range(4)]
+        left, right = CategoryCountSketch(['c']), CategoryCountSketch(['c'])
+        for k, batch in enumerate(batches):
+            (left if k % 2 else right).update(batch)
+        left.merge(right)
+        
+        expected = pd.concat(batches)['c'].value_counts()
+        counts = left.counts['c'][[left.codes['c'][c] for c in expected.index]]
+        np.testing.assert_array_equal(counts, expected.to_numpy())
+        assert left.counts['c'].sum() == 1200
+        
+        real_categories = pd.Index(['0', '1', 'unseen'])
+        real_counts = np.array([5, 5, 10])
+        synthetic = pd.Series(0.0, index=real_categories.union(expected.index))
+        synthetic[expected.index] = expected / expected.sum()
+        real = pd.Series(real_counts / 20, index=real_categories).reindex(synthetic.index, fill_value=0)
+        assert left.total_variation('c', real_categories, real_counts) == pytest.approx(
+            0.5 * np.abs(real - synthetic).sum())
+    
+    def test_unknown_session_raises(self):
+        with pytest.raises(KeyError):
+            self.orchestrator.append_and_validate('missing', self.synthetic_data)
+
+class TestStreamingMonitor:
+    def setup_method(self):
+        self.orchestrator = ValidationOrchestrator()
+        self.real_data = self._make(4000, seed=0)
+        self.config = {
+            'validators': ['fidelity', 'bias_check'],
+            'target_column': 'target',
+            'protected_attributes': ['group']
+        }
+    
+    @staticmethod
+    def _make(n, shift=0.0, seed=1):
+        rng = np.random.default_rng(seed)
+        age = rng.normal(40, 10, n) + shift * 10
+        return pd.DataFrame({
+            'age': age,
+            'income': age * 1000 + rng.normal(0, 5000, n),
+            'group': rng.choice([0, 1], n),
+            'target': rng.binomial(1, 0.3, n)
+        })
+    
+    def test_tumbling_and_sliding_window_counts(self):
+        tumbling = self.orchestrator.start_stream_monitor('t', self.real_data, self.config, window_rows=500)
+        sliding = self.orchestrator.start_stream_monitor('s', self.real_data, self.config,
+                                                         window_rows=500, slide_rows=100)
+        synthetic = self._make(1250)
+        assert len(self.orchestrator.append_to_stream('t', synthetic)) == 2
+        reports = self.orchestrator.append_to_stream('s', synthetic)
+        assert [(r['start_row'], r['end_row']) for r in reports][:2] == [(0, 500), (100, 600)]
+        assert len(reports) == 8
+        assert tumbling.status()['pending_rows'] == 250
+        with pytest.raises(ValueError):
+            self.orchestrator.start_stream_monitor('x', self.real_data, self.config,
+                                                   window_rows=500, slide_rows=300)
+    
+    def test_single_records_match_batches(self):
+        batched = self.orchestrator.start_stream_monitor('b', self.real_data, self.config, window_rows=400)
+        single = self.orchestrator.start_stream_monitor('r', self.real_data, self.config, window_rows=400)
+        mixed = self.orchestrator.start_stream_monitor('m', self.real_data, self.config, window_rows=400)
+        synthetic = self._make(400)
+        batched.append(synthetic)
+        for record in synthetic.to_dict('records'):
+            single.append(record)
+        mixed.append(synthetic.iloc[:150].to_dict('records'))
+        mixed.append(synthetic.iloc[150:300])
+        mixed.append(synthetic.iloc[300:].to_dict('records'))
+        
+        expected = batched.windows[-1]['validation_results']
+        for monitor in (single, mixed):
+            actual = monitor.windows[-1]['validation_results']
+            assert actual['fidelity']['fidelity_score'] == pytest.approx(
+                expected['fidelity']['fidelity_score'])
+            assert actual['bias_check']['overall_bias_score'] == pytest.approx(
+                expected['bias_check']['overall_bias_score'])
+    
+    def test_drift_and_copy_alerts(self):
+        alerts = []
+        monitor = self.orchestrator.start_stream_monitor('d', self.real_data, self.config,
+                                                         window_rows=500, on_alert=alerts.append)
+        assert monitor.append(self._make(500))[0]['alerts'] == []
+        drifted = monitor.append(self._make(500, shift=2.0))[0]
+        assert 'quality_drop' in [a['type'] for a in drifted['alerts']]
+        copied = monitor.append(self.real_data.iloc[:500])[0]
+        assert copied['validation_results']['exact_copy']['exact_copy_rate'] == 1.0
+        assert 'exact_copies' in [a['type'] for a in copied['alerts']]
+        assert [a['window_index'] for a in alerts if a['type'] == 'exact_copies'] == [2]
+
+class TestSharedReferenceStore:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 500),
+            'income': np.random.normal(50000, 15000, 500),
+            'region': np.random.choice(['north', 'south'], 500),
+            'target': np.random.binomial(1, 0.3, 500)
+        })
+        self.synthetic_data = pd.DataFrame({
+            'age': np.random.normal(42, 12, 500),
+            'income': np.random.normal(52000, 16000, 500),
+            'region': np.random.choice(['north', 'south'], 500),
+            'target': np.random.binomial(1, 0.35, 500)
+        })
+        self.config = {'validators': ['fidelity', 'privacy_risk']}
+    
+    def test_attached_reference_is_memory_mapped(self, tmp_path):
+        key = hash_dataframe(self.real_data)
+        SharedReferenceStore(str(tmp_path)).publish(key, self.real_data)
+        
+        # A second store instance stands in for another worker process
+        profile = SharedReferenceStore(str(tmp_path)).attach(key)
+        assert isinstance(profile.sorted_values['age'], np.memmap)
+        assert isinstance(profile.encoding().real, np.memmap)
+        np.testing.assert_array_equal(profile.real_data['income'].to_numpy(),
+                                      self.real_data['income'].to_numpy())
+        assert list(profile.real_data['region'].astype(str)) == list(self.real_data['region'])
+    
+    def test_attached_frame_hashes_like_original(self, tmp_path):
+        # Result-cache keys must not depend on whether the shared store is used
+        for real in (self.real_data, self.real_data.astype({'region': object})):
+            key = hash_dataframe(real)
+            store = SharedReferenceStore(str(tmp_path / str(real['region'].dtype)))
+            store.publish(key, real)
+            assert hash_dataframe(store.attach(key).real_data) == key
+    
+    def test_shared_mode_matches_local_results(self, tmp_path):
+        shared = ValidationOrchestrator(shared_store=SharedReferenceStore(str(tmp_path)))
+        profile = shared.get_reference_profile(self.real_data)
+        shared_results = shared.run_validation_pipeline(
+            profile.real_data, self.synthetic_data, self.config, reference=profile
+        )
+        local_results = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, self.synthetic_data, self.config
+        )
+        
+        assert shared_results['fidelity']['ks_test_results'] == local_results['fidelity']['ks_test_results']
+        assert shared_results['privacy_risk']['membership_inference_auc'] == pytest.approx(
+            local_results['privacy_risk']['membership_inference_auc'])
+        assert shared.get_shared_reference(hash_dataframe(self.real_data)) is profile
+        assert ValidationOrchestrator(shared_store=SharedReferenceStore(str(tmp_path))) \
+            .get_shared_reference('unknown') is None
+        assert shared.get_shared_reference('../' + hash_dataframe(self.real_data)) is None
+        with pytest.raises(ValueError):
+            SharedReferenceStore(str(tmp_path)).publish('../escaped', self.real_data)
+
+class TestProcessPoolTransport:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 300),
+            'income': np.random.normal(50000, 15000, 300),
+            'target': np.random.binomial(1, 0.3, 300)
+        })
+        self.synthetic_data = pd.DataFrame({
+            'age': np.random.normal(42, 12, 300),
+            'income': np.random.normal(52000, 16000, 300),
+            'target': np.random.binomial(1, 0.35, 300)
+        })
+        self.config = {'validators': ['privacy_risk', 'task_utility'], 'target_column': 'target'}
+    
+    def test_segments_are_unlinked_on_exit(self):
+        from multiprocessing import shared_memory
+        encoded = encode_datasets(self.real_data, self.synthetic_data)
+        
+        with SharedArrayTransport() as transport:
+            handle = transport.put_encoded(encoded)
+            result = run_in_worker('src.validator_modules.privacy_risk:run_encoded', handle, {})
+            assert 0.0 <= result['privacy_risk_score'] <= 1.0
+        
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=handle.real.shm_name)
+    
+    def test_process_pool_matches_threaded_run(self):
+        threaded = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, self.synthetic_data, self.config
+        )
+        orchestrator = ValidationOrchestrator(process_workers=2)
+        try:
+            pooled = orchestrator.run_validation_pipeline(self.real_data, self.synthetic_data, self.config)
+        finally:
+            orchestrator.shutdown()
+        
+        assert pooled['privacy_risk']['membership_inference_auc'] == pytest.approx(
+            threaded['privacy_risk']['membership_inference_auc'])
+        assert pooled['task_utility']['utility_score'] == pytest.approx(
+            threaded['task_utility']['utility_score'])
+    
+    def test_task_utility_paths_match_on_mixed_types(self):
+        def _mixed(data, seed):
+            rng = np.random.default_rng(seed)
+            data = data.assign(region=rng.choice(['north', 'south', 'east'], len(data)))
+            data['target'] = data['target'].astype(float)
+            data.loc[data.index[::25], 'target'] = np.nan
+            return data
+        
+        real, synthetic = _mixed(self.real_data, 0), _mixed(self.synthetic_data, 1)
+        config = {'validators': ['task_utility'], 'target_column': 'target'}
+        threaded = ValidationOrchestrator().run_validation_pipeline(real, synthetic, config)
+        orchestrator = ValidationOrchestrator(process_workers=2)
+        try:
+            pooled = orchestrator.run_validation_pipeline(real, synthetic, config)
+        finally:
+            orchestrator.shutdown()
+        
+        assert 'error' not in threaded['task_utility']
+        assert threaded['task_utility']['task_type'] == pooled['task_utility']['task_type'] == 'classification'
+        assert pooled['task_utility']['utility_score'] == pytest.approx(
+            threaded['task_utility']['utility_score'])
+
+class TestValidationPlanner:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 3000),
+            'income': np.random.normal(50000, 15000, 3000),
+            'target': np.random.binomial(1, 0.3, 3000)
+        })
+        self.synthetic_data = pd.DataFrame({
+            'age': np.random.normal(42, 12, 3000),
+            'income': np.random.normal(52000, 16000, 3000),
+            'target': np.random.binomial(1, 0.35, 3000)
+        })
+        self.config = {'validators': ['fidelity', 'privacy_risk'], 'target_column': 'target'}
+    
+    def test_without_budget_everything_is_exact(self):
+        plan = ValidationPlanner().plan(self.real_data, self.synthetic_data, self.config)
+        assert {step['variant'] for step in plan['validators'].values()} == {'exact'}
+        assert plan['predicted_seconds'] > 0
+        
+        results = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, self.synthetic_data, self.config)
+        assert 'pipeline_metadata' not in results
+    
+    def test_tight_budget_selects_approximate_variants(self):
+        # Inflated coefficients make every exact variant look too slow
+        planner = ValidationPlanner(coefficients={'sort': 1e-3, 'random_forest': 1e-3})
+        orchestrator = ValidationOrchestrator(planner=planner)
+        results = orchestrator.run_validation_pipeline(
+            self.real_data, self.synthetic_data, dict(self.config, latency_budget_seconds=5))
+        
+        plan = results['pipeline_metadata']['plan']
+        assert plan['validators']['fidelity']['variant'] == 'sketch'
+        assert plan['validators']['privacy_risk']['variant'] == 'sampled'
+        assert plan['validators']['privacy_risk']['sample_rows'] < 3000
+        assert 'actual_seconds' in plan['validators']['privacy_risk']
+        assert results['privacy_risk']['approximation']['variant'] == 'sampled'
+        assert 0 <= results['fidelity']['fidelity_score'] <= 1
+
+class TestGatedPipeline:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = pd.DataFrame({
+            'age': np.random.normal(40, 10, 500),
+            'income': np.random.normal(50000, 15000, 500),
+            'target': np.random.binomial(1, 0.3, 500)
+        })
+        self.config = {'validators': ['privacy_risk', 'task_utility'], 'target_column': 'target',
+                       'gated': True}
+        self.aggregator = ScoreAggregator()
+    
+    def test_copied_candidate_skips_expensive_validators(self):
+        # Copies are detected even when the generator changed a column's dtype
+        leaked = self.real_data.sample(400, random_state=0).astype({'target': float})
+        results = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, leaked, self.config)
+        
+        assert results['exact_copy']['exact_copy_rate'] == 1.0
+        assert results['privacy_risk']['skipped'] is True
+        assert 'exact_copy_rate' in results['task_utility']['skip_reason']
+        assert results['pipeline_metadata']['gate']['passed'] is False
+        
+        scores = self.aggregator.calculate_synthetic_data_quality_score(
+            {k: v for k, v in results.items() if k != 'pipeline_metadata'})
+        assert sorted(scores['skipped_validators']) == ['privacy_risk', 'task_utility']
+        assert 'privacy_risk' not in scores['individual_scores']
+    
+    def test_exact_copy_does_not_grade_well(self):
+        results = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, self.real_data.copy(), self.config)
+        metadata = results.pop('pipeline_metadata')
+        
+        for gate in (metadata['gate'], None):
+            scores = self.aggregator.calculate_synthetic_data_quality_score(results, gate=gate)
+            assert scores['overall_synthetic_data_quality_score'] == 0.0
+            assert scores['quality_grade'] == 'Failed'
+            assert scores['failed_checks'] == ['exact_copy_rate']
+    
+    def test_good_candidate_runs_everything(self):
+        synthetic = pd.DataFrame({
+            'age': np.random.normal(40, 10, 500),
+            'income': np.random.normal(50000, 15000, 500),
+            'target': np.random.binomial(1, 0.3, 500)
+        })
+        results = ValidationOrchestrator().run_validation_pipeline(
+            self.real_data, synthetic, self.config)
+        
+        assert results['pipeline_metadata']['gate']['passed'] is True
+        assert 'privacy_risk_score' in results['privacy_risk']
+        assert 'utility_score' in results['task_utility']
+        assert results['exact_copy']['exact_copies'] == 0
+    
+    def test_exact_copy_on_filtered_text_frames(self):
+        real = self.real_data.assign(region=np.random.choice(['north', 'south'], 500))
+        tail = real.iloc[300:]
+        
+        assert np.array_equal(row_hashes(tail, list(real.columns)),
+                              row_hashes(tail.reset_index(drop=True), list(real.columns)))
+        
+        changed = tail.assign(region='west')
+        results = ExactCopyValidator().validate(real, changed)
+        assert results['exact_copies'] == 0
+        results = ExactCopyValidator().validate(real, tail)
+        assert results['exact_copy_rate'] == 1.0
+
+class TestJointFidelityValidator:
+    def setup_method(self):
+        self.validator = JointFidelityValidator()
+        np.random.seed(42)
+        age = np.random.normal(40, 10, 2000)
+        self.real_data = pd.DataFrame({
+            'age': age,
+            'income': age * 1000 + np.random.normal(0, 2000, 2000),
+            'region': np.random.choice(['north', 'south', 'east'], 2000)
+        })
+    
+    def test_broken_dependence_is_the_worst_pair(self):
+        synthetic = self.real_data.copy()
+        synthetic['income'] = np.random.permutation(synthetic['income'].values)
+        results = self.validator.validate(self.real_data, synthetic,
+                                          reference=ReferenceProfile(self.real_data))
+        
+        assert results['n_pairs_evaluated'] == 3
+        assert results['worst_pairs'][0]['columns'] == ['age', 'income']
+        assert results['worst_pairs'][0]['mutual_information_real'] > \
+            results['worst_pairs'][0]['mutual_information_synthetic']
+        assert results['joint_fidelity_score'] < 1.0
+    
+    def test_identical_data_and_pair_selection(self):
+        results = self.validator.validate(self.real_data, self.real_data)
+        assert results['max_pair_total_variation'] == 0.0
+        assert results['joint_fidelity_score'] == 1.0
+        
+        self.validator.max_pairs = 1
+        results = self.validator.validate(self.real_data, self.real_data)
+        assert results['n_pairs_evaluated'] == 1
+        assert results['n_pairs_total'] == 3
+        assert results['worst_pairs'][0]['columns'] == ['age', 'income']
+    
+    def test_bool_columns_are_binned_with_a_profile(self):
+        real = self.real_data.assign(insured=self.real_data['age'] > 40)
+        columns = ['age', 'insured']
+        with_profile = self.validator.fit_binning(real, columns, ReferenceProfile(real))
+        without = self.validator.fit_binning(real, columns)
+        np.testing.assert_array_equal(with_profile[1][1], without[1][1])
+        assert len(np.unique(self.validator.apply_binning(real, columns, with_profile)[:, 1])) == 2
+    
+    def test_pair_ranking_ignores_shared_missingness(self):
+        n = 2000
+        gaps = np.random.rand(n) < 0.5
+        base = np.random.normal(0, 1, n)
+        real = pd.DataFrame({
+            'sparse_a': np.where(gaps, np.nan, np.random.normal(0, 1, n)),
+            'sparse_b': np.where(gaps, np.nan, np.random.normal(0, 1, n)),
+            'dense_a': base,
+            'dense_b': base + np.random.normal(0, 1.5, n)
+        })
+        self.validator.max_pairs = 1
+        results = self.validator.validate(real, real)
+        assert results['worst_pairs'][0]['columns'] == ['dense_a', 'dense_b']
+    
+    def test_failure_is_reported_not_raised(self):
+        broken = pd.DataFrame(np.random.rand(20, 3), columns=['a', 'a', 'b'])
+        results = self.validator.validate(broken, broken)
+        assert results['joint_fidelity_score'] == 0.0
+        assert 'error' in results
+
+class TestAnonymityValidator:
+    def setup_method(self):
+        self.validator = AnonymityValidator()
+        self.synthetic_data = pd.DataFrame({
+            'zip': ['100', '100', '100', '200', '200', '300'],
+            'sex': ['f', 'f', 'f', 'm', 'm', 'f'],
+            'diagnosis': ['flu', 'cold', 'flu', 'flu', 'flu', 'cold']
+        })
+    
+    def test_equivalence_classes_and_diversity(self):
+        results = self.validator.validate(None, self.synthetic_data, ['zip', 'sex'], ['diagnosis'],
+                                          k_threshold=3)
+        
+        assert results['k_anonymity'] == 1
+        assert results['n_equivalence_classes'] == 3
+        assert results['records_below_k'] == pytest.approx(3 / 6)
+        assert results['unique_record_rate'] == pytest.approx(1 / 6)
+        assert results['l_diversity']['diagnosis']['l'] == 1
+        assert results['l_diversity']['diagnosis']['classes_below_l'] == pytest.approx(2 / 3)
+    
+    def test_chunked_matches_single_pass(self):
+        single = self.validator.validate(None, self.synthetic_data, ['zip', 'sex'], ['diagnosis'])
+        # Chunks keep their original index labels, as from pd.read_csv(chunksize=...)
+        chunks = [self.synthetic_data.iloc[i:i + 2] for i in range(0, 6, 2)]
+        chunked = self.validator.validate_chunks(chunks, ['zip', 'sex'], ['diagnosis'])
+        assert chunked == single
+
+class TestAttributeInferenceValidator:
+    def setup_method(self):
+        self.validator = AttributeInferenceValidator()
+        np.random.seed(42)
+        self.real_data = self._make(2000)
+    
+    def _make(self, n):
+        age = np.random.randint(18, 90, n)
+        return pd.DataFrame({
+            'age': age,
+            'height': np.random.normal(170, 10, n),
+            'zip': np.random.choice(['100', '200', '300'], n),
+            'diagnosis': np.where(age > 50, 'chronic', 'none'),
+            'income': age * 100.0 + np.random.normal(0, 50, n)
+        })
+    
+    def test_leaky_synthetic_data_is_high_risk(self):
+        self.validator.batch_rows = 500
+        results = self.validator.validate(self.real_data, self._make(2000),
+                                          ['age', 'height', 'zip'], ['diagnosis', 'income'])
+        
+        assert results['matched_rate'] == 1.0
+        assert results['column_risks']['diagnosis']['inference_accuracy'] > 0.95
+        assert results['column_risks']['income']['risk'] > 0.8
+        assert results['attribute_inference_risk'] > 0.8
+    
+    def test_unrelated_sensitive_values_are_low_risk(self):
+        synthetic = self._make(2000)
+        synthetic['diagnosis'] = np.random.permutation(synthetic['diagnosis'].values)
+        synthetic['income'] = np.random.permutation(synthetic['income'].values)
+        results = self.validator.validate(self.real_data, synthetic,
+                                          ['age', 'height', 'zip'], ['diagnosis', 'income'])
+        assert results['attribute_inference_risk'] < 0.1
+    
+    def test_exact_quasi_identifier_matches(self):
+        matches = self.validator.nearest_synthetic(self.real_data, self.real_data.iloc[::-1],
+                                                   ['age', 'height', 'zip'])
+        # Positions in the reversed frame point back at the same real rows
+        np.testing.assert_array_equal(matches, np.arange(len(self.real_data))[::-1])
+
+class TestSegmentedValidation:
+    def setup_method(self):
+        np.random.seed(42)
+        self.real_data = self._make(600, shift=0.0)
+        self.config = {'validators': ['fidelity', 'bias_check', 'causal_consistency'],
+                       'segment_by': 'region', 'target_column': 'target',
+                       'protected_attributes': ['group'], 'treatment_column': 'treated',
+                       'outcome_column': 'outcome', 'causal_variables': ['x']}
+    
+    def _make(self, n, shift):
+        region = np.random.choice(['north', 'south'], n)
+        x = np.random.normal(0, 1, n) + np.where(region == 'south', shift, 0.0)
+        return pd.DataFrame({
+            'region': region,
+            'x': x,
+            'group': np.random.choice(['a', 'b'], n),
+            'target': np.random.binomial(1, 0.4, n),
+            'treated': np.random.binomial(1, 0.5, n),
+            'outcome': x + np.random.normal(0, 1, n)
+        })
+    
+    def test_grouped_ks_matches_scipy(self):
+        from scipy.stats import ks_2samp
+        from src.segmentation import grouped_ks
+        real, synthetic = np.random.normal(0, 1, 300), np.random.normal(0.2, 1, 200)
+        real_groups, synthetic_groups = np.random.randint(0, 3, 300), np.random.randint(0, 2, 200)
+        ks = grouped_ks(real, real_groups, synthetic, synthetic_groups, 3)
+        
+        for g in range(2):
+            expected = ks_2samp(real[real_groups == g], synthetic[synthetic_groups == g]).statistic
+            assert ks[g] == pytest.approx(expected)
+        assert np.isnan(ks[2])
+    
+    def test_grouped_covariances_match_pandas(self):
+        from src.segmentation import SegmentedValidator
+        data = self.real_data[['x', 'outcome', 'target']].copy()
+        data.loc[np.random.rand(len(data)) < 0.2, 'x'] = np.nan
+        groups = np.random.randint(0, 4, len(data))
+        groups[groups == 3] = 2
+        covariances = SegmentedValidator()._covariances(data, groups, list(data.columns), 4)
+        
+        for g in range(3):
+            np.testing.assert_allclose(covariances[g], data[groups == g].cov().to_numpy())
+        assert np.isnan(covariances[3]).all()
+    
+    def test_pipeline_reports_per_segment_metrics(self):
+        synthetic = self._make(600, shift=1.5)
+        results = ValidationOrchestrator().run_validation_pipeline(self.real_data, synthetic, self.config)
+        
+        report = results['segments']
+        assert report['n_segments'] == 2
+        segments = {s['segment']['region']: s for s in report['segments']}
+        assert set(segments['north']) >= {'fidelity', 'bias_check', 'causal_consistency'}
+        # Only the shifted segment loses fidelity
+        assert segments['south']['fidelity']['ks_statistics']['x'] > 0.4
+        assert segments['north']['fidelity']['fidelity_score'] > segments['south']['fidelity']['fidelity_score']
+        assert 'fidelity_score' in results['fidelity']  # whole-dataset results are unchanged
+        
+        scores = ScoreAggregator().calculate_synthetic_data_quality_score(results)
+        assert 'segments' not in scores['individual_scores']
 
 class TestScoreAggregator:
     def setup_method(self):